@@ -4,6 +4,7 @@ This test uses MockUrl to test BaseUrl, because some of BaseUrl functions need t
 @note some tests do not check memory as it is not reliable
 """
 
+import asyncio
 import gc
 import json
 from webtoolkit import (
@@ -18,6 +19,9 @@ from webtoolkit import (
     BaseUrl,
     RemoteServer,
     RemoteUrl,
+    FeedStopCondition,
+    RequestsCrawler,
+    AsyncCrawler,
 )
 from webtoolkit.utils.memorychecker import MemoryChecker
 
@@ -733,6 +737,65 @@ class BaseUrlTest(FakeInternetTestCase):
 
         self.assertEqual(MockRequestCounter.request_history[0]["url"], "https://page-with-http-status-500.com")
 
+    def test_get_response_async(self):
+        MockRequestCounter.reset()
+
+        test_link = "https://multiple-favicons.com/page.html"
+        url = MockUrl(request=self.get_request(test_link))
+
+        # call tested function
+        response = asyncio.run(url.get_response_async())
+
+        self.assertTrue(response)
+        self.assertTrue(response.is_valid())
+        self.assertTrue(url.get_contents() != None)
+        self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+
+    def test_get_response_async__gather(self):
+        MockRequestCounter.reset()
+
+        test_links = [
+            "https://multiple-favicons.com/page.html",
+            "https://www.codeproject.com/WebServices/NewsRSS.aspx",
+        ]
+        urls = [MockUrl(request=self.get_request(link)) for link in test_links]
+
+        async def get_responses():
+            return await asyncio.gather(*[url.get_response_async() for url in urls])
+
+        # call tested function
+        responses = asyncio.run(get_responses())
+
+        self.assertEqual(len(responses), 2)
+        self.assertTrue(responses[0].is_valid())
+        self.assertTrue(responses[1].is_valid())
+        self.assertEqual(MockRequestCounter.mock_page_requests, 2)
+
+    def test_get_request_for_async__default_crawler(self):
+        url = BaseUrl("https://multiple-favicons.com/page.html")
+        self.assertTrue(url.default_crawler)
+
+        request = PageRequestObject("https://multiple-favicons.com/page.html")
+        request.crawler_name = "RequestsCrawler"
+        request.crawler_type = RequestsCrawler(request.url)
+
+        # call tested function
+        request = url.get_request_for_async(request)
+
+        self.assertEqual(request.crawler_name, "AsyncCrawler")
+        self.assertEqual(type(request.crawler_type), AsyncCrawler)
+
+    def test_get_request_for_async__selected_crawler(self):
+        request = PageRequestObject("https://multiple-favicons.com/page.html")
+        request.crawler_name = "RequestsCrawler"
+        request.crawler_type = RequestsCrawler(request.url)
+
+        # call tested function
+        url = BaseUrl(request=request)
+
+        # crawler selected by caller is not replaced
+        self.assertFalse(url.default_crawler)
+
     def test_is_valid__html(self):
         MockRequestCounter.mock_page_requests = 0
 
@@ -917,6 +980,26 @@ class BaseUrlTest(FakeInternetTestCase):
         self.assertEqual(result, url)
         self.assertEqual(MockRequestCounter.mock_page_requests, 1)
 
+    def test_get_entries__stop_condition(self):
+        self.ignore_memory = True
+        MockRequestCounter.mock_page_requests = 0
+
+        test_link = "https://www.codeproject.com/WebServices/NewsRSS.aspx"
+        url = MockUrl(request=self.get_request(test_link))
+        url.get_response()
+
+        all_entries = url.get_entries()
+        self.assertTrue(len(all_entries) > 1)
+
+        condition = FeedStopCondition(links=[all_entries[1]["link"]])
+
+        # call tested function
+        entries = url.get_entries(condition)
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["link"], all_entries[0]["link"])
+        self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+
     def test_get_hash__html(self):
         MockRequestCounter.mock_page_requests = 0
 
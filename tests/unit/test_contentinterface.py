@@ -1,5 +1,6 @@
 import os
 from webtoolkit import ContentInterface
+from webtoolkit.contentinterface import memoized
 from webtoolkit.utils.memorychecker import MemoryChecker
 
 from webtoolkit.tests.fakeinternet import FakeInternetTestCase
@@ -56,6 +57,17 @@ wall_street_journal_date_human_date_ue_format = """
 """
 
 
+class CountingContentPage(ContentInterface):
+    def __init__(self, url, contents):
+        self.calls = 0
+        super().__init__(url=url, contents=contents)
+
+    @memoized
+    def get_title(self):
+        self.calls += 1
+        return self.contents
+
+
 class ContentInterfacePageTest(FakeInternetTestCase):
     def setUp(self):
         self.ignore_memory = False
@@ -139,3 +151,23 @@ class ContentInterfacePageTest(FakeInternetTestCase):
 
         rating = p.get_link_rating()
         self.assertTrue(rating)
+
+    def test_memoized(self):
+        p = CountingContentPage("https://linkedin.com/test", "title")
+
+        # call tested function
+        self.assertEqual(p.get_title(), "title")
+        self.assertEqual(p.get_title(), "title")
+
+        self.assertEqual(p.calls, 1)
+
+    def test_memoized__contents_change(self):
+        p = CountingContentPage("https://linkedin.com/test", "title")
+        p.get_title()
+
+        p.contents = "new title"
+
+        # call tested function
+        self.assertEqual(p.get_title(), "new title")
+
+        self.assertEqual(p.calls, 2)
@@ -315,6 +315,22 @@ class ContentLinkParserTest(FakeInternetTestCase):
         # test_get_links was not passed as an argument
         self.assertFalse("https://test_get_links.com/test/location" in links)
 
+    def test_get_links__nested(self):
+        p = ContentLinkParser(
+            "https://test_get_links.com/test",
+            '<a href="/redirect?u=https://nested.com/page">Redirect</a>'
+            '<img src="https://outer.com/?u=http://inner.com/location">',
+        )
+
+        # call tested function
+        links = p.get_links()
+
+        self.assertTrue("https://test_get_links.com/redirect?u=https://nested.com/page" in links)
+        self.assertTrue("https://nested.com/page" in links)
+        self.assertTrue("https://outer.com/?u=http://inner.com/location" in links)
+        self.assertTrue("http://inner.com/location" in links)
+        self.assertEqual(len(links), 4)
+
     def test_filter_link_html(self):
 
         links = set()
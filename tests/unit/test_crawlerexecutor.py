@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+from webtoolkit import CrawlerExecutor
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class CrawlerExecutorTest(FakeInternetTestCase):
+    def test_run(self):
+        executor = CrawlerExecutor(max_workers=2)
+
+        # call tested function
+        result = executor.run(lambda: 5, timeout_s=5)
+
+        self.assertEqual(result, 5)
+        statistics = executor.get_statistics()
+        self.assertEqual(statistics["completed"], 1)
+        self.assertEqual(statistics["running"], 0)
+        self.assertEqual(statistics["queued"], 0)
+
+    def test_run__exception(self):
+        executor = CrawlerExecutor(max_workers=2)
+
+        def function():
+            raise ValueError("error")
+
+        # call tested function
+        with self.assertRaises(ValueError):
+            executor.run(function, timeout_s=5)
+
+    def test_run__reuses_workers(self):
+        executor = CrawlerExecutor(max_workers=2)
+
+        # call tested function
+        for index in range(10):
+            executor.run(lambda: index, timeout_s=5)
+
+        self.assertEqual(executor.get_statistics()["workers"], 1)
+
+    def test_run__timeout(self):
+        executor = CrawlerExecutor(max_workers=1)
+        release = threading.Event()
+        aborted = []
+
+        def on_timeout():
+            aborted.append(1)
+            release.set()
+
+        # call tested function
+        with self.assertRaises(TimeoutError):
+            executor.run(lambda: release.wait(5), timeout_s=0.05, on_timeout=on_timeout)
+
+        self.assertEqual(aborted, [1])
+        self.assertEqual(executor.get_statistics()["timeouts"], 1)
+
+    def test_run__abandoned(self):
+        executor = CrawlerExecutor(max_workers=1)
+        release = threading.Event()
+
+        # call tested function
+        with self.assertRaises(TimeoutError):
+            executor.run(lambda: release.wait(5), timeout_s=0.05)
+
+        statistics = executor.get_statistics()
+        self.assertEqual(statistics["abandoned"], 1)
+        self.assertEqual(statistics["running"], 1)
+
+        release.set()
+        executor.run(lambda: None, timeout_s=5)
+
+        # worker of abandoned call exits, when the call finishes
+        for index in range(100):
+            statistics = executor.get_statistics()
+            if statistics["abandoned"] == 0:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(statistics["abandoned"], 0)
+        self.assertEqual(statistics["running"], 0)
+        self.assertEqual(statistics["workers"], 1)
+
+    def test_run__abandoned_calls_do_not_block(self):
+        executor = CrawlerExecutor(max_workers=2)
+        release = threading.Event()
+
+        for index in range(2):
+            with self.assertRaises(TimeoutError):
+                executor.run(lambda: release.wait(5), timeout_s=0.05)
+
+        # call tested function
+        result = executor.run(lambda: 5, timeout_s=1)
+
+        self.assertEqual(result, 5)
+        statistics = executor.get_statistics()
+        self.assertEqual(statistics["abandoned"], 2)
+        self.assertEqual(statistics["queued"], 0)
+
+        release.set()
+
+    def test_run__queued_call_is_cancelled(self):
+        executor = CrawlerExecutor(max_workers=1)
+        release = threading.Event()
+        calls = []
+
+        executor.submit(lambda: release.wait(5))
+
+        # call tested function
+        with self.assertRaises(TimeoutError):
+            executor.run(lambda: calls.append(1), timeout_s=0.05)
+
+        self.assertEqual(executor.get_statistics()["abandoned"], 0)
+
+        release.set()
+        executor.run(lambda: None, timeout_s=5)
+
+        self.assertEqual(calls, [])
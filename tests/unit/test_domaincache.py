@@ -1,4 +1,5 @@
 from webtoolkit import BaseUrl, DomainCache, DomainCacheInfo
+from webtoolkit.robotsstore import RobotsStore
 
 from webtoolkit.tests.fakeinternet import FakeInternetTestCase
 from webtoolkit.tests.mocks import MockUrl, MockRequestCounter
@@ -92,3 +93,174 @@ class DomainCacheInfoTest(FakeInternetTestCase):
         cache_info.is_allowed("https://page-with-http-status-500.com/test.html")
 
         self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+
+    def test_cache_info__least_recently_used(self):
+        MockRequestCounter.mock_page_requests = 0
+
+        cache = DomainCache(url_builder=MockUrl, cache_size=2, respect_robots_txt=True)
+        cache.get_domain_info("https://robots-txt1.com")
+        cache.get_domain_info("https://robots-txt2.com")
+        cache.get_domain_info("https://robots-txt1.com")
+
+        # call tested function
+        cache.get_domain_info("https://robots-txt3.com")
+
+        self.assertIn("https://robots-txt1.com", cache.cache)
+        self.assertNotIn("https://robots-txt2.com", cache.cache)
+        self.assertIn("https://robots-txt3.com", cache.cache)
+
+    def test_cache_info__ttl(self):
+        MockRequestCounter.mock_page_requests = 0
+
+        cache = DomainCache(
+            url_builder=MockUrl, cache_size=5, respect_robots_txt=True, ttl=0
+        )
+        first_info = cache.get_domain_info("https://robots-txt.com")
+
+        # call tested function
+        second_info = cache.get_domain_info("https://robots-txt.com")
+
+        self.assertIsNot(first_info, second_info)
+        self.assertEqual(cache.get_statistics()["expirations"], 1)
+
+    def test_get_statistics(self):
+        MockRequestCounter.mock_page_requests = 0
+
+        cache = DomainCache(url_builder=MockUrl, cache_size=1, respect_robots_txt=True)
+        cache.get_domain_info("https://robots-txt1.com")
+        cache.get_domain_info("https://robots-txt1.com")
+        cache.get_domain_info("https://robots-txt2.com")
+
+        # call tested function
+        statistics = cache.get_statistics()
+
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 2)
+        self.assertEqual(statistics["evictions"], 1)
+        self.assertEqual(statistics["size"], 1)
+
+    def test_cache_info__store(self):
+        MockRequestCounter.mock_page_requests = 0
+        store = RobotsStore(":memory:")
+
+        # call tested function
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, store=store)
+        cache_info = cache.get_domain_info("https://robots-txt.com/page.html")
+
+        self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+        entry = store.get("https://robots-txt.com")
+        self.assertIn("Disallow: /admin/", entry["contents"])
+        self.assertEqual(entry["etag"], '"robots-txt-1"')
+        self.assertEqual(entry["sitemaps"], [])
+
+        # new process, robots.txt is read from store
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, store=store)
+        cache_info = cache.get_domain_info("https://robots-txt.com/page.html")
+
+        self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+        self.assertEqual(cache_info.revalidation, None)
+        self.assertFalse(cache_info.is_allowed("https://robots-txt.com/admin/"))
+
+    def test_cache_info__store__invalid_page(self):
+        MockRequestCounter.mock_page_requests = 0
+        store = RobotsStore(":memory:")
+        cache_info = DomainCacheInfo(
+            "https://page-with-http-status-500.com", url_builder=MockUrl, store=store
+        )
+
+        # call tested function
+        stored_info = DomainCacheInfo(
+            "https://page-with-http-status-500.com", url_builder=MockUrl, store=store
+        )
+
+        self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+        self.assertEqual(cache_info.get_robots_txt_contents(), None)
+        self.assertEqual(stored_info.get_robots_txt_contents(), None)
+        self.assertEqual(store.get(cache_info.url)["status_code"], 500)
+        store.close()
+
+    def test_cache_info__store_revalidation(self):
+        MockRequestCounter.mock_page_requests = 0
+        store = RobotsStore(":memory:", ttl=0)
+        store.set(
+            "https://robots-txt.com",
+            "User-agent: *\nDisallow: /private/",
+            etag='"robots-txt-1"',
+        )
+        fetch_time = store.get("https://robots-txt.com")["fetch_time"]
+
+        # call tested function
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, store=store)
+        cache_info = cache.get_domain_info("https://robots-txt.com/page.html")
+
+        # stored robots.txt is used, while it is revalidated
+        self.assertFalse(cache_info.is_allowed("https://robots-txt.com/private/"))
+
+        cache_info.revalidation.join(5)
+
+        self.assertEqual(MockRequestCounter.mock_page_requests, 1)
+        request = MockRequestCounter.request_history[-1]["crawler_data"]
+        self.assertEqual(request.request_headers["If-None-Match"], '"robots-txt-1"')
+
+        # not modified
+        entry = store.get("https://robots-txt.com")
+        self.assertEqual(entry["contents"], "User-agent: *\nDisallow: /private/")
+        self.assertTrue(entry["fetch_time"] >= fetch_time)
+
+    def test_cache_info__store_revalidation__modified(self):
+        MockRequestCounter.mock_page_requests = 0
+        store = RobotsStore(":memory:", ttl=0)
+        store.set(
+            "https://robots-txt.com",
+            "User-agent: *\nDisallow: /private/",
+            etag='"robots-txt-0"',
+        )
+
+        # call tested function
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, store=store)
+        cache_info = cache.get_domain_info("https://robots-txt.com/page.html")
+
+        cache_info.revalidation.join(5)
+
+        entry = store.get("https://robots-txt.com")
+        self.assertIn("Disallow: /admin/", entry["contents"])
+        self.assertEqual(entry["etag"], '"robots-txt-1"')
+        self.assertFalse(cache_info.is_allowed("https://robots-txt.com/admin/"))
+
+    def test_cache_info__crawl_delay(self):
+        MockRequestCounter.mock_page_requests = 0
+
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, respect_robots_txt=True)
+        cache_info = cache.get_domain_info("https://robots-txt.com/page.html")
+
+        # call tested function
+        self.assertEqual(cache_info.get_crawl_delay(), None)
+        self.assertEqual(cache_info.get_request_rate(), None)
+
+    def test_cache_info__get_all_site_maps_urls(self):
+        MockRequestCounter.mock_page_requests = 0
+
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, respect_robots_txt=True)
+        cache_info = cache.get_domain_info("https://www.youtube.com")
+
+        # call tested function
+        sitemaps = cache_info.get_all_site_maps_urls()
+
+        self.assertIn("https://www.youtube.com/sitemaps/sitemap.xml", sitemaps)
+        self.assertIn("https://www.youtube.com/product/sitemap.xml", sitemaps)
+        self.assertIn("https://www.youtube.com/ads/sitemap.xml", sitemaps)
+        self.assertIn(
+            "https://www.youtube.com/product/sitemap-files/sitemap-001.xml.gz",
+            sitemaps,
+        )
+
+    def test_cache_info__get_site_map_entries(self):
+        MockRequestCounter.mock_page_requests = 0
+
+        cache = DomainCache(url_builder=MockUrl, cache_size=5, respect_robots_txt=True)
+        cache_info = cache.get_domain_info("https://www.youtube.com")
+
+        # call tested function
+        entries = list(cache_info.get_site_map_entries())
+
+        self.assertIn(("https://www.youtube.com/product/page-1", "2024-04-03"), entries)
@@ -0,0 +1,216 @@
+from datetime import datetime
+
+from webtoolkit import FeedStream, FeedStopCondition, RssPage
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+webpage_rss = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel>
+  <title>Channel title</title>
+  <language>pl</language>
+  <item>
+    <title>First</title>
+    <link>https://example.com/1</link>
+  </item>
+  <item>
+    <title>Second</title>
+    <link/>https://example.com/2
+  </item>
+  <item>
+    <title><![CDATA[Third]]></title>
+    <link>https://example.com/3</link>
+  </item>
+</channel>
+</rss>
+"""
+
+webpage_atom = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom title</title>
+  <entry>
+    <title>First</title>
+    <link href="https://example.com/1"/>
+  </entry>
+  <entry>
+    <title>Second</title>
+    <link href="https://example.com/2"/>
+  </entry>
+</feed>
+"""
+
+webpage_rss_dates = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+<channel>
+  <title>Channel title</title>
+  <item>
+    <title>First</title>
+    <link>https://example.com/1</link>
+    <guid>guid-1</guid>
+    <pubDate>Wed, 03 Jan 2024 10:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>Second</title>
+    <link>https://example.com/2</link>
+    <guid>guid-2</guid>
+    <pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate>
+  </item>
+</channel>
+</rss>
+"""
+
+
+class FeedStreamTest(FakeInternetTestCase):
+    def test_get_entries__rss(self):
+        stream = FeedStream(webpage_rss)
+
+        # call tested function
+        entries = list(stream.get_entries())
+
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[0].title, "First")
+        self.assertEqual(entries[0].link, "https://example.com/1")
+        self.assertEqual(entries[2].link, "https://example.com/3")
+        self.assertEqual(stream.entries_count, 3)
+
+        self.assertEqual(stream.feed.title, "Channel title")
+        self.assertEqual(stream.feed.language, "pl")
+
+    def test_get_entries__atom(self):
+        stream = FeedStream(webpage_atom)
+
+        # call tested function
+        entries = list(stream.get_entries())
+
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0].title, "First")
+        self.assertEqual(entries[1].link, "https://example.com/2")
+        self.assertEqual(stream.feed.title, "Atom title")
+
+    def test_get_entries__incremental(self):
+        stream = FeedStream(webpage_rss)
+        entries = stream.get_entries()
+
+        # call tested function
+        entry = next(entries)
+
+        self.assertEqual(entry.title, "First")
+        self.assertEqual(stream.entries_count, 1)
+        self.assertEqual(stream.feed.title, "Channel title")
+
+    def test_get_entries__releases_elements(self):
+        stream = FeedStream(webpage_rss)
+
+        elements = []
+        # call tested function
+        for entry in stream.get_entries():
+            elements.append(entry.root)
+
+        for element in elements:
+            self.assertEqual(len(element), 0)
+
+    def test_get_entries__empty(self):
+        stream = FeedStream("")
+
+        # call tested function
+        entries = list(stream.get_entries())
+
+        self.assertEqual(entries, [])
+        self.assertIsNone(stream.feed)
+
+    def test_get_link__tail(self):
+        stream = FeedStream(webpage_rss)
+        entries = stream.get_entries()
+        next(entries)
+        entry = next(entries)
+
+        # call tested function
+        link = FeedStream.get_link(entry.root)
+
+        self.assertEqual(link.strip(), "https://example.com/2")
+
+    def test_rsspage__get_entries(self):
+        reader = RssPage("https://example.com/feed", webpage_rss)
+
+        # call tested function
+        entries = list(reader.get_entries())
+
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0]["link"], "https://example.com/1")
+        self.assertEqual(entries[0]["language"], "pl")
+        self.assertEqual(entries[1]["link"], "https://example.com/3")
+        # entries were streamed, feed was not parsed
+        self.assertFalse(reader.feed_parsed)
+
+    def test_get_entries__stop_condition_link(self):
+        stream = FeedStream(webpage_rss)
+        condition = FeedStopCondition(links=["https://example.com/2"])
+
+        # call tested function
+        entries = list(stream.get_entries(condition))
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].title, "First")
+        self.assertTrue(stream.stopped)
+
+    def test_get_entries__stop_condition_guid(self):
+        stream = FeedStream(webpage_rss_dates)
+        condition = FeedStopCondition(guid="guid-2")
+
+        # call tested function
+        entries = list(stream.get_entries(condition))
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].title, "First")
+
+    def test_get_entries__stop_condition_date(self):
+        stream = FeedStream(webpage_rss_dates)
+        condition = FeedStopCondition(date_published=datetime(2024, 1, 2))
+
+        # call tested function
+        entries = list(stream.get_entries(condition))
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].title, "First")
+
+    def test_rsspage__get_entries__stop_condition(self):
+        reader = RssPage("https://example.com/feed", webpage_rss_dates)
+        condition = FeedStopCondition(links=["https://example.com/1"])
+
+        # call tested function
+        entries = list(reader.get_entries(condition))
+
+        self.assertEqual(entries, [])
+        # seen entry was reached, full parse is not a fallback
+        self.assertFalse(reader.feed_parsed)
+
+    def test_rsspage__get_entries__stop_condition_parsed(self):
+        reader = RssPage("https://example.com/feed", webpage_rss_dates)
+        self.assertTrue(reader.feed)
+        condition = FeedStopCondition(guid="guid-2")
+
+        # call tested function
+        entries = list(reader.get_entries(condition))
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["link"], "https://example.com/1")
+
+    def test_is_seen_properties(self):
+        condition = FeedStopCondition(
+            links=["https://example.com/1"], date_published=datetime(2024, 1, 2)
+        )
+
+        # call tested function
+        self.assertTrue(condition.is_seen_properties({"link": "https://example.com/1"}))
+        self.assertTrue(
+            condition.is_seen_properties({"date_published": datetime(2024, 1, 1)})
+        )
+        self.assertFalse(
+            condition.is_seen_properties(
+                {
+                    "link": "https://example.com/3",
+                    "date_published": datetime(2024, 1, 3),
+                }
+            )
+        )
@@ -0,0 +1,63 @@
+from webtoolkit import HostClassifier
+from webtoolkit.hostclassifier import (
+    HOST_CATEGORY_ANALYTICS,
+    HOST_CATEGORY_LINK_SERVICE,
+    HOST_CATEGORY_MAINSTREAM,
+    HOST_CATEGORY_YOUTUBE,
+)
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class HostClassifierTest(FakeInternetTestCase):
+    def test_get_categories__youtube(self):
+        classifier = HostClassifier()
+
+        # call tested function
+        categories = classifier.get_categories("www.youtube.com")
+
+        self.assertEqual(
+            categories, frozenset([HOST_CATEGORY_MAINSTREAM, HOST_CATEGORY_YOUTUBE])
+        )
+
+    def test_get_categories__analytics(self):
+        classifier = HostClassifier()
+
+        # call tested function
+        categories = classifier.get_categories("www.googletagmanager.com")
+
+        self.assertEqual(categories, frozenset([HOST_CATEGORY_ANALYTICS]))
+
+    def test_get_categories__suffix(self):
+        classifier = HostClassifier()
+
+        # call tested function
+        self.assertIn(HOST_CATEGORY_LINK_SERVICE, classifier.get_categories("my.link.to"))
+        self.assertNotIn(
+            HOST_CATEGORY_LINK_SERVICE, classifier.get_categories("link.to.example.com")
+        )
+
+    def test_get_categories__none(self):
+        classifier = HostClassifier()
+
+        # call tested function
+        self.assertEqual(classifier.get_categories("example.com"), frozenset())
+        self.assertEqual(classifier.get_categories(None), frozenset())
+
+    def test_add_rules(self):
+        classifier = HostClassifier()
+        self.assertFalse(classifier.is_category("tracker.example.com", HOST_CATEGORY_ANALYTICS))
+
+        # call tested function
+        classifier.add_rules(HOST_CATEGORY_ANALYTICS, contains=["tracker.example"])
+
+        self.assertTrue(classifier.is_category("tracker.example.com", HOST_CATEGORY_ANALYTICS))
+
+    def test_add_rules__new_category(self):
+        classifier = HostClassifier()
+
+        # call tested function
+        classifier.add_rules("news", hosts=["news.example.com"])
+
+        self.assertTrue(classifier.is_category("news.example.com", "news"))
+        self.assertFalse(classifier.is_category("www.news.example.com", "news"))
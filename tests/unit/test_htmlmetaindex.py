@@ -0,0 +1,141 @@
+from webtoolkit import HtmlMetaIndex
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+webpage_meta = """<!DOCTYPE html>
+<html lang="pl">
+ <head>
+ <title>selected &amp; title</title>
+ <meta charSet="UTF-8">
+ <meta name="description" content="meta description" />
+ <meta property="og:title" content="og title" />
+ <meta property="og:video:tag" content="tag1">
+ <meta property="og:video:tag" content="tag2">
+ <link rel="shortcut icon" href="/favicon.ico">
+ <link rel="icon" href="/favicon_32x32.png" sizes="32x32">
+ <link rel="canonical" href="https://example.com/">
+ </head>
+ <body>
+   <div itemscope itemtype="http://schema.org/VideoObject">
+     <link itemprop="url" href="https://example.com/video">
+     <span itemprop="author" itemscope itemtype="http://schema.org/Person">
+       <link itemprop="url" href="https://example.com/author">
+     </span>
+     <span itemprop="genre">Science <b>and</b> Technology</span>
+   </div>
+ </body>
+</html>
+"""
+
+
+class HtmlMetaIndexTest(FakeInternetTestCase):
+    def test_parse__title(self):
+        # call tested function
+        index = HtmlMetaIndex.parse(webpage_meta)
+
+        self.assertEqual(index.get_string("title"), "selected & title")
+        self.assertEqual(index.language, "pl")
+        self.assertEqual(index.charset, "UTF-8")
+
+    def test_parse__meta(self):
+        # call tested function
+        index = HtmlMetaIndex.parse(webpage_meta)
+
+        self.assertEqual(
+            index.get_meta("name", "description")["content"], "meta description"
+        )
+        self.assertEqual(index.get_meta("property", "og:title")["content"], "og title")
+        self.assertEqual(len(index.get_metas("property", "og:video:tag")), 2)
+        self.assertIsNone(index.get_meta("name", "keywords"))
+
+    def test_parse__links(self):
+        # call tested function
+        index = HtmlMetaIndex.parse(webpage_meta)
+
+        icons = index.get_links("icon")
+        self.assertEqual(len(icons), 2)
+        self.assertEqual(icons[0]["href"], "/favicon.ico")
+        self.assertEqual(icons[1]["sizes"], "32x32")
+
+        self.assertEqual(len(index.get_links("shortcut icon")), 1)
+        self.assertEqual(
+            index.get_links("canonical")[0]["href"], "https://example.com/"
+        )
+
+    def test_parse__schema(self):
+        # call tested function
+        index = HtmlMetaIndex.parse(webpage_meta)
+
+        self.assertEqual(index.get_schema("url"), "https://example.com/video")
+        self.assertEqual(index.get_schema("genre"), "Science and Technology")
+        self.assertEqual(
+            index.get_schema_scoped("http://schema.org/Person", "url")["href"],
+            "https://example.com/author",
+        )
+        self.assertEqual(
+            index.get_schema_scoped("http://schema.org/VideoObject", "url")["href"],
+            "https://example.com/video",
+        )
+
+    def test_parse__empty(self):
+        # call tested function
+        index = HtmlMetaIndex.parse("")
+
+        self.assertIsNone(index.get_string("title"))
+        self.assertEqual(index.get_links("icon"), [])
+
+    def test_get_head(self):
+        # call tested function
+        head = HtmlMetaIndex.get_head(webpage_meta)
+
+        self.assertTrue(head.endswith("</head>"))
+        self.assertEqual(head.find("<body"), -1)
+
+    def test_get_head__no_head_end(self):
+        contents = "<html><title>title</title><BODY>body</BODY></html>"
+
+        # call tested function
+        head = HtmlMetaIndex.get_head(contents)
+
+        self.assertEqual(head, "<html><title>title</title>")
+
+    def test_parse__head_only(self):
+        # call tested function
+        index = HtmlMetaIndex.parse(webpage_meta, head_only=True)
+
+        self.assertEqual(index.get_string("title"), "selected & title")
+        self.assertEqual(index.language, "pl")
+        self.assertEqual(len(index.get_links("icon")), 2)
+        self.assertIsNone(index.get_schema("url"))
+
+    def test_parse__cdata(self):
+        contents = (
+            "<html><head><title><![CDATA[cdata <b> & title]]></title>"
+            "<script>//<![CDATA[\nif (a < b) {}\n//]]></script>"
+            '<meta name="description" content="description"></head></html>'
+        )
+
+        # call tested function
+        index = HtmlMetaIndex.parse(contents)
+
+        self.assertEqual(index.get_string("title"), "cdata <b> & title")
+        self.assertEqual(
+            index.get_string("script"), "//<![CDATA[\nif (a < b) {}\n//]]>"
+        )
+        self.assertEqual(
+            index.get_meta("name", "description")["content"], "description"
+        )
+
+    def test_parse__cdata_rss(self):
+        contents = (
+            "<html><body><rss><channel><title><![CDATA[feed title]]></title>"
+            "<description><![CDATA[feed description]]></description>"
+            "</channel></rss></body></html>"
+        )
+
+        # call tested function
+        index = HtmlMetaIndex.parse(contents)
+
+        self.assertEqual(index.get_string("title"), "feed title")
+        self.assertEqual(index.get_string("description"), "feed description")
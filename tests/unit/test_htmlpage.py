@@ -490,6 +490,15 @@ class HtmlPageTest(FakeInternetTestCase):
         )
         self.assertEqual(MockRequestCounter.mock_page_requests, 0)
 
+    def test_get_favicons__modified_result(self):
+        p = HtmlPage("https://linkedin.com/test", webpage_html_favicon)
+        p.get_favicons().clear()
+
+        # call tested function
+        all_favicons = p.get_favicons()
+
+        self.assertEqual(len(all_favicons), 5)
+
     def test_get_date_published_article_date(self):
         MockRequestCounter.mock_page_requests = 0
 
@@ -588,6 +597,27 @@ class HtmlPageTest(FakeInternetTestCase):
             reader.get_schema_field("thumbnailUrl"), "https://thumbnailurl.com"
         )
 
+    def test_head_only(self):
+        reader = HtmlPage(
+            "https://linkedin.com/test", webpage_html_favicon, head_only=True
+        )
+
+        self.assertEqual(reader.get_title(), "YouTube")
+        self.assertEqual(len(reader.get_favicons()), 5)
+        self.assertEqual(reader.get_body_text().strip(), "page body")
+
+    def test_contents_change(self):
+        # first parse of meta title allocates once, depending on previous tests
+        self.ignore_memory = True
+
+        reader = HtmlPage("https://linkedin.com/test", webpage_title_head)
+        self.assertEqual(reader.get_title(), "selected title")
+
+        reader.contents = webpage_title_meta
+
+        # call tested function
+        self.assertEqual(reader.get_title(), "selected meta title")
+
     def test_get_schema_field_ex(self):
         reader = HtmlPage(
             "https://linkedin.com/test", webpage_html_schema_fields_nested
@@ -0,0 +1,94 @@
+from webtoolkit import LinkTable, UrlLocation
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+links = [
+    "https://www.youtube.com",
+    "https://www.youtube.com:443/location",
+    "https://www.youtube.com/location?v=12323&test=q#whatever",
+    "https://linkedin.com/location/",
+    "https://linkedin.com/page.html",
+    "https://linkedin.com/image.jpg",
+    "https://linkedin.com/style.css",
+    "https://www.googletagmanager.com/gtm.js",
+    "https://user@test.com/location",
+    "//test.com/location",
+    "https://a.io/x",
+    "https://bit.ly/short",
+    "https://linkedin.com/song.mp3",
+    "https://linkedin.com/setup.exe",
+    "mailto",
+]
+
+
+class LinkTableTest(FakeInternetTestCase):
+    def test_constructor(self):
+        # call tested function
+        table = LinkTable(links)
+
+        self.assertEqual(table.schemes[1], "https")
+        self.assertEqual(table.host_keys[1], "https://www.youtube.com:443")
+        self.assertEqual(table.exts[4], "html")
+        self.assertEqual(table.schemes[9], "")
+        self.assertEqual(table.host_keys[14], None)
+
+    def test_filter_html(self):
+        table = LinkTable(links)
+
+        # call tested function
+        result = table.filter_html()
+
+        expected = {link for link in links if UrlLocation(link).is_webpage_link()}
+        self.assertEqual(result, expected)
+        self.assertIn("https://linkedin.com/page.html", result)
+        self.assertNotIn("https://linkedin.com/image.jpg", result)
+
+    def test_get_domains(self):
+        table = LinkTable(links)
+
+        # call tested function
+        result = table.get_domains()
+
+        self.assertIn("https://www.youtube.com", result)
+        self.assertIn("https://linkedin.com", result)
+        self.assertIn("https://test.com", result)
+        self.assertIn("https://www.googletagmanager.com", result)
+        self.assertNotIn("mailto", result)
+
+    def test_get_type(self):
+        table = LinkTable(links)
+
+        for index, link in enumerate(links):
+            # call tested function
+            result = table.get_type(index)
+
+            self.assertEqual(result, UrlLocation(link).get_type())
+
+    def test_classify_many(self):
+        # call tested function
+        result = UrlLocation.classify_many(links)
+
+        self.assertEqual(len(result), len(links))
+
+        for index, link in enumerate(links):
+            location = UrlLocation(link)
+
+            self.assertEqual(result[index]["link"], link)
+            self.assertEqual(result[index]["domain"], location.get_domain().url)
+            self.assertEqual(result[index]["scheme"], location.get_scheme())
+            self.assertEqual(result[index]["type"], location.get_type())
+            self.assertEqual(result[index]["is_web_link"], location.is_web_link())
+            self.assertEqual(
+                result[index]["is_webpage_link"], location.is_webpage_link()
+            )
+            self.assertEqual(result[index]["is_analytics"], location.is_analytics())
+            self.assertEqual(
+                result[index]["is_link_service"], location.is_link_service()
+            )
+
+        self.assertEqual(result[5]["media"], "image")
+        self.assertEqual(result[12]["media"], "audio")
+        self.assertEqual(result[4]["media"], None)
+        self.assertTrue(result[11]["is_link_service"])
+        self.assertTrue(result[7]["is_analytics"])
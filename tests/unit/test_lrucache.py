@@ -0,0 +1,144 @@
+import threading
+
+from webtoolkit.utils.lrucache import LruCache
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class LruCacheTest(FakeInternetTestCase):
+    def test_get(self):
+        cache = LruCache(2)
+        cache.set("a", 1)
+
+        # call tested function
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("b", "default"), "default")
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_set__evicts_least_recently_used(self):
+        cache = LruCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # call tested function
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_set_size(self):
+        cache = LruCache(3)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        # call tested function
+        cache.set_size(1)
+
+        self.assertEqual(len(cache), 1)
+        self.assertIn("c", cache)
+
+    def test_get_statistics(self):
+        cache = LruCache(2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        # call tested function
+        statistics = cache.get_statistics()
+
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 1)
+        self.assertEqual(statistics["hit_rate"], 0.5)
+        self.assertEqual(statistics["size"], 1)
+        self.assertEqual(statistics["max_size"], 2)
+
+    def test_set__evictions(self):
+        cache = LruCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # call tested function
+        cache.set("c", 3)
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.get_statistics()["evictions"], 1)
+
+    def test_get__ttl(self):
+        cache = LruCache(2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=0)
+
+        # call tested function
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.expirations, 1)
+
+    def test_get_or_load(self):
+        cache = LruCache(2)
+        loaded = []
+
+        def load(key):
+            loaded.append(key)
+            return key + "!"
+
+        # call tested function
+        self.assertEqual(cache.get_or_load("a", load), "a!")
+        self.assertEqual(cache.get_or_load("a", load), "a!")
+
+        self.assertEqual(loaded, ["a"])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.loading, {})
+
+    def test_get_or_load__single_flight(self):
+        cache = LruCache(2)
+        loaded = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def load(key):
+            loaded.append(key)
+            started.set()
+            release.wait(5)
+            return key + "!"
+
+        results = []
+
+        def read():
+            results.append(cache.get_or_load("a", load))
+
+        threads = [threading.Thread(target=read) for index in range(4)]
+        for thread in threads:
+            thread.start()
+
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(loaded, ["a"])
+        self.assertEqual(results, ["a!"] * 4)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 3)
+
+    def test_get_or_load__exception(self):
+        cache = LruCache(2)
+
+        def load(key):
+            raise ValueError(key)
+
+        # call tested function
+        with self.assertRaises(ValueError):
+            cache.get_or_load("a", load)
+
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.loading, {})
@@ -0,0 +1,158 @@
+from webtoolkit import (
+    PageFactory,
+    PageResponseObject,
+    HtmlPage,
+    RssPage,
+    OpmlPage,
+    DefaultContentPage,
+)
+from webtoolkit.pages import (
+    PAGE_TYPE_HTML,
+    PAGE_TYPE_RSS,
+    PAGE_TYPE_OPML,
+    PAGE_TYPE_JSON,
+    PAGE_TYPE_TEXT,
+)
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+webpage_html = """<!DOCTYPE html>
+<html lang="en">
+ <head><title>title</title></head>
+ <body>body</body>
+</html>
+"""
+
+webpage_rss = """<?xml version="1.0" encoding="UTF-8"?>
+<!-- generator -->
+<rss version="2.0"><channel><title>title</title>
+<item><title>entry</title><link>https://example.com/entry</link></item>
+</channel></rss>
+"""
+
+webpage_atom = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>title</title>
+<entry><title>entry</title><link href="https://example.com/entry"/></entry>
+</feed>
+"""
+
+webpage_rdf = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"><channel></channel></rdf:RDF>
+"""
+
+webpage_opml = """<?xml version="1.0"?>
+<opml version="1.0"><body><outline title="feed" xmlUrl="https://example.com/feed"/></body></opml>
+"""
+
+webpage_html_wrapped_rss = """<?xml version="1.0"?><html><body><rss version="2.0"><channel>
+<item><title>entry</title><link>https://example.com/entry</link></item>
+</channel></rss></body></html>
+"""
+
+
+class PageFactoryTest(FakeInternetTestCase):
+    def test_sniff__html(self):
+        self.assertEqual(PageFactory.sniff(webpage_html), PAGE_TYPE_HTML)
+
+    def test_sniff__rss(self):
+        self.assertEqual(PageFactory.sniff(webpage_rss), PAGE_TYPE_RSS)
+        self.assertEqual(PageFactory.sniff(webpage_atom), PAGE_TYPE_RSS)
+        self.assertEqual(PageFactory.sniff(webpage_rdf), PAGE_TYPE_RSS)
+
+    def test_sniff__bom(self):
+        self.assertEqual(PageFactory.sniff("\ufeff" + webpage_rss), PAGE_TYPE_RSS)
+
+    def test_sniff__opml(self):
+        self.assertEqual(PageFactory.sniff(webpage_opml), PAGE_TYPE_OPML)
+
+    def test_sniff__json(self):
+        self.assertEqual(PageFactory.sniff(' {"title" : "x"}'), PAGE_TYPE_JSON)
+        self.assertEqual(PageFactory.sniff("[1, 2]"), PAGE_TYPE_JSON)
+
+    def test_sniff__text(self):
+        self.assertEqual(PageFactory.sniff("just some text"), PAGE_TYPE_TEXT)
+
+    def test_sniff__ambiguous(self):
+        self.assertIsNone(PageFactory.sniff(webpage_html_wrapped_rss))
+        self.assertIsNone(PageFactory.sniff("<div>fragment</div>"))
+        self.assertIsNone(PageFactory.sniff(""))
+
+    def test_get__mislabelled_rss(self):
+        response = PageResponseObject(
+            "https://example.com/feed",
+            text=webpage_rss,
+            headers={"Content-Type": "text/html"},
+            request_url="https://example.com/feed",
+        )
+
+        # call tested function
+        page = PageFactory.get(response, webpage_rss)
+
+        self.assertEqual(type(page), RssPage)
+
+    def test_get__html(self):
+        response = PageResponseObject(
+            "https://example.com",
+            text=webpage_html,
+            headers={"Content-Type": "text/html"},
+            request_url="https://example.com",
+        )
+
+        # call tested function
+        page = PageFactory.get(response, webpage_html)
+
+        self.assertEqual(type(page), HtmlPage)
+
+    def test_get__wrapped_rss(self):
+        response = PageResponseObject(
+            "https://example.com/feed",
+            text=webpage_html_wrapped_rss,
+            headers={"Content-Type": "application/rss+xml"},
+            request_url="https://example.com/feed",
+        )
+
+        # call tested function
+        page = PageFactory.get(response, webpage_html_wrapped_rss)
+
+        self.assertEqual(type(page), RssPage)
+
+    def test_get__opml(self):
+        response = PageResponseObject(
+            "https://example.com/feeds.opml",
+            text=webpage_opml,
+            request_url="https://example.com/feeds.opml",
+        )
+
+        # call tested function
+        page = PageFactory.get(response, webpage_opml)
+
+        self.assertEqual(type(page), OpmlPage)
+
+    def test_get__text(self):
+        response = PageResponseObject(
+            "https://example.com/file.txt",
+            text="just some text",
+            headers={"Content-Type": "text/plain"},
+            request_url="https://example.com/file.txt",
+        )
+
+        # call tested function
+        page = PageFactory.get(response, "just some text")
+
+        self.assertEqual(type(page), DefaultContentPage)
+
+    def test_get__html_starting_with_brace(self):
+        contents = "{% load static %}\n" + webpage_html
+        response = PageResponseObject(
+            "https://example.com",
+            text=contents,
+            headers={"Content-Type": "text/html"},
+            request_url="https://example.com",
+        )
+
+        # call tested function
+        page = PageFactory.get(response, contents)
+
+        self.assertEqual(type(page), HtmlPage)
+        self.assertEqual(page.get_title(), "title")
@@ -12,6 +12,13 @@ from webtoolkit import (
     json_to_response,
     response_to_file,
     file_to_response,
+    sniff_encoding,
+    response_to_binary,
+    binary_to_response,
+    is_binary_response,
+    COMPRESSION_NONE,
+    RESPONSE_FORMAT_JSON,
+    RESPONSE_FORMAT_BINARY,
 
     HTTP_STATUS_CODE_SERVER_ERROR,
     HTTP_STATUS_CODE_SERVER_TOO_MANY_REQUESTS,
@@ -318,6 +325,32 @@ class PageResponseObjectTest(FakeInternetTestCase):
 
         self.assertTrue(response.get_hash())
 
+    def test_set_body_loader__text(self):
+        headers = {"Content-Type": "text/html; charset=UTF-8"}
+        response = PageResponseObject("https://test.com", status_code=200, headers=headers)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return memoryview("<html>ż</html>".encode("utf-8"))
+
+        # call tested function
+        response.set_body_loader(loader, "text")
+
+        self.assertEqual(calls, [])
+        self.assertEqual(response.get_text(), "<html>ż</html>")
+        self.assertEqual(response.get_binary(), "<html>ż</html>".encode("utf-8"))
+        self.assertEqual(calls, [1])
+
+    def test_set_body_loader__binary(self):
+        headers = {"Content-Type": "image/png"}
+        response = PageResponseObject("https://test.com", status_code=200, headers=headers)
+
+        # call tested function
+        response.set_body_loader(lambda: memoryview(b"\x89PNG"), "binary")
+
+        self.assertEqual(response.get_binary(), b"\x89PNG")
+
     def test_get_body_hash__text(self):
         headers = {"Content-Type": "text/html; charset=UTF-8"}
         response = PageResponseObject(
@@ -410,6 +443,110 @@ class PageResponseObjectTest(FakeInternetTestCase):
         self.assertTrue(headers["Last-Modified"])
 
 
+    def test_get_text__lazy(self):
+        headers = {"Content-Type": "text/html; charset=iso-8859-2"}
+        binary = "<html>zażółć</html>".encode("iso-8859-2")
+        response = PageResponseObject(
+            "https://test.com", binary=binary, status_code=200, headers=headers
+        )
+
+        self.assertTrue(response.decode_pending)
+
+        # call tested function
+        text = response.get_text()
+
+        self.assertEqual(text, "<html>zażółć</html>")
+        self.assertFalse(response.decode_pending)
+        self.assertIs(response.get_text(), text)
+        self.assertIs(response.get_binary(), binary)
+
+    def test_get_binary__lazy(self):
+        response = PageResponseObject("https://test.com", text="zażółć", status_code=200)
+
+        self.assertTrue(response.encode_pending)
+
+        # call tested function
+        binary = response.get_binary()
+
+        self.assertEqual(binary, "zażółć".encode("utf-8"))
+        self.assertFalse(response.encode_pending)
+
+    def test_get_text__binary_set_later(self):
+        response = PageResponseObject("https://test.com", status_code=200)
+        response.binary = b"\x89PNG"
+
+        # call tested function
+        self.assertEqual(response.get_text(), None)
+
+    def test_get_text__decode_error(self):
+        response = PageResponseObject(
+            "https://test.com", binary=b"abc\xff", status_code=200
+        )
+
+        # call tested function
+        self.assertEqual(response.get_text(), "abc\ufffd")
+        self.assertEqual(response.errors, [])
+
+    def test_get_text__undeclared_latin1(self):
+        response = PageResponseObject(
+            "https://test.com", binary="café".encode("latin-1"), status_code=200
+        )
+
+        # call tested function
+        self.assertEqual(response.get_text(), "caf\ufffd")
+
+    def test_get_text__unknown_encoding(self):
+        response = PageResponseObject(
+            "https://test.com",
+            binary=b"abc",
+            status_code=200,
+            encoding="no-such-encoding",
+        )
+
+        # call tested function
+        self.assertEqual(response.get_text(), "abc")
+
+
+class SniffEncodingTest(FakeInternetTestCase):
+    def test_xml_prolog(self):
+        contents = b'<?xml version="1.0" encoding="ISO-8859-2"?><rss></rss>'
+
+        # call tested function
+        self.assertEqual(sniff_encoding(contents), "iso-8859-2")
+
+    def test_meta_charset(self):
+        contents = b'<html><head><meta charset="windows-1250"></head></html>'
+
+        # call tested function
+        self.assertEqual(sniff_encoding(contents), "windows-1250")
+
+    def test_meta_http_equiv(self):
+        contents = (
+            b'<html><head><META HTTP-EQUIV="Content-Type" '
+            b'CONTENT="text/html; charset=UTF-8"></head></html>'
+        )
+
+        # call tested function
+        self.assertEqual(sniff_encoding(contents), "utf-8")
+
+    def test_byte_order_mark(self):
+        contents = b"\xef\xbb\xbf<html></html>"
+
+        # call tested function
+        self.assertEqual(sniff_encoding(contents), "utf-8")
+
+    def test_not_declared(self):
+        # call tested function
+        self.assertEqual(sniff_encoding(b"<html><body>charset</body></html>"), None)
+        self.assertEqual(sniff_encoding(b""), None)
+
+    def test_declared_late(self):
+        contents = b"<html>" + b" " * 5000 + b'<meta charset="utf-8"></html>'
+
+        # call tested function
+        self.assertEqual(sniff_encoding(contents), None)
+
+
 class PageResponseToJsonTest(FakeInternetTestCase):
     def setUp(self):
         self.disable_web_pages()
@@ -611,6 +748,19 @@ class PageResponseToJsonTest(FakeInternetTestCase):
         self.assertTrue(string)
 
 
+    def test_response_to_json__bytes_transferred(self):
+        test_link = "https://test.com"
+
+        response = PageResponseObject(url=test_link, status_code=200, text="test")
+        response.bytes_transferred = 120
+
+        # call tested function
+        json_map = response_to_json(response)
+
+        self.assertEqual(json_map["bytes_transferred"], 120)
+        self.assertEqual(json_to_response(json_map).get_bytes_transferred(), 120)
+
+
 class JsonToPageResponseTest(FakeInternetTestCase):
     def setUp(self):
         self.disable_web_pages()
@@ -747,3 +897,89 @@ class JsonToPageResponseTest(FakeInternetTestCase):
         self.assertTrue(response.errors)
         self.assertTrue(len(response.errors) > 0)
 
+
+
+class BinaryResponseTest(FakeInternetTestCase):
+    def setUp(self):
+        self.disable_web_pages()
+
+    def get_response(self):
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        response = PageResponseObject(
+            "https://test.com",
+            binary="<html><body>zażółć</body></html>".encode("utf-8") * 100,
+            status_code=200,
+            headers=headers,
+            request_url="https://test.com/redirect",
+        )
+        response.set_request(PageRequestObject("https://test.com/redirect"))
+        response.bytes_transferred = 100
+        response.add_error("error")
+        return response
+
+    def test_response_to_binary(self):
+        response = self.get_response()
+
+        # call tested function
+        data = response_to_binary(response)
+
+        self.assertTrue(is_binary_response(data))
+        self.assertTrue(len(data) < len(json.dumps(response_to_json(response))))
+
+        restored = binary_to_response(data)
+
+        self.assertEqual(restored.get_text(), response.get_text())
+        self.assertEqual(restored.get_binary(), response.get_binary())
+        self.assertEqual(restored.url, "https://test.com")
+        self.assertEqual(restored.request_url, "https://test.com/redirect")
+        self.assertEqual(restored.get_status_code(), 200)
+        self.assertEqual(restored.get_content_type(), "text/html; charset=utf-8")
+        self.assertEqual(restored.get_bytes_transferred(), 100)
+        self.assertEqual(restored.errors, ["error"])
+        self.assertEqual(restored.request.url, "https://test.com/redirect")
+
+    def test_response_to_binary__text(self):
+        response = PageResponseObject("https://test.com", status_code=200)
+        response.text = "<html></html>"
+
+        # call tested function
+        data = response_to_binary(response, compression=COMPRESSION_NONE)
+
+        restored = binary_to_response(data)
+        self.assertEqual(restored.get_text(), "<html></html>")
+
+    def test_binary_to_response__without_body(self):
+        data = response_to_binary(self.get_response())
+
+        # call tested function
+        restored = binary_to_response(data, with_body=False)
+
+        self.assertEqual(restored.get_status_code(), 200)
+        self.assertEqual(restored.get_text(), None)
+        self.assertEqual(restored.get_binary(), None)
+
+    def test_binary_to_response__not_binary(self):
+        # call tested function
+        with self.assertRaises(ValueError):
+            binary_to_response(b"{}")
+
+    def test_file_to_response__formats(self):
+        response = self.get_response()
+        path = Path("test_response.bin")
+
+        for file_format in [RESPONSE_FORMAT_JSON, RESPONSE_FORMAT_BINARY]:
+            response_to_file(response, path, file_format=file_format)
+
+            # call tested function
+            restored = file_to_response(path)
+
+            self.assertEqual(restored.get_text(), response.get_text())
+            self.assertEqual(restored.get_status_code(), 200)
+
+        # call tested function
+        restored = file_to_response(path, with_body=False)
+
+        self.assertEqual(restored.get_status_code(), 200)
+        self.assertEqual(restored.get_text(), None)
+
+        path.unlink()
@@ -0,0 +1,114 @@
+import http.server
+import threading
+
+from webtoolkit import RequestsCrawler, PageRequestObject, PageResponseObject
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class FakeRaw(object):
+    def __init__(self, transferred):
+        self.transferred = transferred
+
+    def tell(self):
+        return self.transferred
+
+
+class FakeRequestResult(object):
+    def __init__(self, chunks, transferred=0):
+        self.chunks = chunks
+        self.raw = FakeRaw(transferred)
+        self.read_chunks = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.read_chunks += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class PageRequestHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<html>page</html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RequestsCrawlerTest(FakeInternetTestCase):
+    def setUp(self):
+        self.disable_web_pages()
+
+    def get_crawler(self, bytes_limit=None):
+        request = PageRequestObject("https://example.com", bytes_limit=bytes_limit)
+        crawler = RequestsCrawler(request=request)
+        crawler.response = PageResponseObject("https://example.com")
+        return crawler
+
+    def test_read_content(self):
+        crawler = self.get_crawler(bytes_limit=100)
+        request_result = FakeRequestResult([b"abc", b"def"], transferred=6)
+
+        # call tested function
+        content = crawler.read_content(request_result, crawler.response)
+
+        self.assertEqual(content, b"abcdef")
+        self.assertEqual(crawler.response.get_bytes_transferred(), 6)
+        self.assertFalse(request_result.closed)
+
+    def test_read_content__bytes_limit(self):
+        crawler = self.get_crawler(bytes_limit=5)
+        request_result = FakeRequestResult([b"abc", b"def", b"ghi", b"jkl"])
+
+        # call tested function
+        content = crawler.read_content(request_result, crawler.response)
+
+        self.assertIsNone(content)
+        # transfer is stopped at first chunk exceeding limit
+        self.assertEqual(request_result.read_chunks, 2)
+        self.assertTrue(request_result.closed)
+        self.assertEqual(crawler.response.get_bytes_transferred(), 6)
+        self.assertTrue(len(crawler.errors) > 0)
+
+    def test_read_content__no_limit(self):
+        crawler = self.get_crawler()
+        request_result = FakeRequestResult([b"a" * 1000] * 10)
+
+        # call tested function
+        content = crawler.read_content(request_result, crawler.response)
+
+        self.assertEqual(len(content), 10000)
+        self.assertEqual(crawler.response.get_bytes_transferred(), 10000)
+
+    def test_crawl_with_thread_implementation(self):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PageRequestHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        url = "http://127.0.0.1:{}/".format(server.server_address[1])
+        request = PageRequestObject(url, timeout_s=10)
+        crawler = RequestsCrawler(request=request)
+        crawler.response = PageResponseObject(url, status_code=500)
+
+        try:
+            # call tested function
+            request_result, response, content = (
+                crawler.crawl_with_thread_implementation(request)
+            )
+            request_result.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # worker does not change crawler state
+        self.assertEqual(crawler.response.status_code, 500)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, b"<html>page</html>")
@@ -0,0 +1,173 @@
+import os
+import shutil
+import tempfile
+
+from webtoolkit import ResponseStore, ResponseReplay, PageResponseObject
+from webtoolkit.response import COMPRESSION_NONE, COMPRESSION_GZIP
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+def get_status_code(response):
+    return response.get_status_code()
+
+
+class ResponseReplayTest(FakeInternetTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.directory = self.root
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def get_response(self, url, text="<html><body>Page</body></html>"):
+        headers = {"Content-Type": "text/html"}
+        return PageResponseObject(
+            url, text=text, status_code=200, headers=headers, request_url=url
+        )
+
+    def fill_store(self, compression=COMPRESSION_NONE, count=5):
+        store = ResponseStore(self.directory, compression=compression)
+        for index in range(count):
+            url = "https://example.com/{}".format(index)
+            text = "<html><body>Page {} ż</body></html>".format(index)
+            store.add(self.get_response(url, text), fetch_time=index)
+
+        image = PageResponseObject(
+            "https://example.com/image.png",
+            status_code=200,
+            headers={"Content-Type": "image/png"},
+            request_url="https://example.com/image.png",
+        )
+        image.binary = b"\x89PNG\x00\x01"
+        store.add(image, fetch_time=count)
+        store.close()
+
+    def test_get_responses(self):
+        self.fill_store()
+        replay = ResponseReplay(self.directory)
+
+        # call tested function
+        responses = list(replay.get_responses())
+
+        self.assertEqual(len(responses), 6)
+        self.assertEqual(replay.get_length(), 6)
+
+        texts = {response.url: response.get_text() for response in responses}
+        self.assertEqual(
+            texts["https://example.com/0"], "<html><body>Page 0 ż</body></html>"
+        )
+        self.assertEqual(
+            texts["https://example.com/4"], "<html><body>Page 4 ż</body></html>"
+        )
+
+        image = [r for r in responses if r.url.endswith("image.png")][0]
+        self.assertEqual(image.get_binary(), b"\x89PNG\x00\x01")
+        self.assertEqual(image.get_content_type(), "image/png")
+        replay.close()
+
+    def test_get_responses__lazy(self):
+        self.fill_store()
+        replay = ResponseReplay(self.directory)
+
+        # call tested function
+        responses = list(replay.get_responses())
+
+        # bodies are not read, until they are used
+        self.assertEqual(replay.maps, {})
+        for response in responses:
+            self.assertTrue(response.body_loader)
+
+        responses[0].get_text()
+        self.assertEqual(len(replay.maps), 1)
+        self.assertFalse(responses[0].body_loader)
+        replay.close()
+
+    def test_get_responses__segment_appended(self):
+        store = ResponseStore(self.directory, compression=COMPRESSION_NONE)
+        store.add(self.get_response("https://example.com/1", "first"), fetch_time=1)
+
+        replay = ResponseReplay(self.directory)
+        self.assertEqual(list(replay.get_responses())[0].get_text(), "first")
+
+        # body is appended to mapped segment
+        store.add(self.get_response("https://example.com/2", "second"), fetch_time=2)
+
+        # call tested function
+        texts = [response.get_text() for response in replay.get_responses()]
+
+        self.assertEqual(texts, ["first", "second"])
+        replay.close()
+        store.close()
+
+    def test_get_view__short_segment(self):
+        self.fill_store()
+        replay = ResponseReplay(self.directory)
+
+        # call tested function
+        with self.assertRaises(ValueError):
+            replay.get_view(1, 0, 10**9)
+
+        replay.close()
+
+    def test_get_responses__closed(self):
+        self.fill_store()
+        replay = ResponseReplay(self.directory)
+        responses = list(replay.get_responses())
+
+        # call tested function
+        replay.close()
+
+        with self.assertRaises(ValueError):
+            responses[0].get_text()
+        self.assertEqual(replay.maps, {})
+
+    def test_get_responses__special_directory(self):
+        self.directory = os.path.join(self.root, "a?b#c%20d")
+        self.fill_store()
+
+        # call tested function
+        replay = ResponseReplay(self.directory)
+
+        responses = list(replay.get_responses())
+        self.assertEqual(len(responses), 6)
+        self.assertTrue(responses[0].get_binary())
+        replay.close()
+
+    def test_get_responses__gzip(self):
+        self.fill_store(compression=COMPRESSION_GZIP)
+        replay = ResponseReplay(self.directory)
+
+        # call tested function
+        responses = list(replay.get_responses())
+
+        texts = {response.url: response.get_text() for response in responses}
+        self.assertEqual(
+            texts["https://example.com/2"], "<html><body>Page 2 ż</body></html>"
+        )
+        replay.close()
+
+    def test_get_responses__shards(self):
+        self.fill_store(count=20)
+        replay = ResponseReplay(self.directory)
+
+        urls = []
+        # call tested function
+        for shard in range(3):
+            shard_urls = [r.url for r in replay.get_responses(shard, 3)]
+            self.assertTrue(shard_urls)
+            urls.extend(shard_urls)
+
+        self.assertEqual(len(urls), 21)
+        self.assertEqual(len(set(urls)), 21)
+        replay.close()
+
+    def test_map(self):
+        self.fill_store(count=10)
+        replay = ResponseReplay(self.directory)
+
+        # call tested function
+        results = replay.map(get_status_code, processes=2)
+
+        self.assertEqual(results, [200] * 11)
+        replay.close()
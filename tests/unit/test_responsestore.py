@@ -0,0 +1,193 @@
+import shutil
+import tempfile
+
+from webtoolkit import ResponseStore, ResponseReplay, PageResponseObject
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class ResponseStoreTest(FakeInternetTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_response(self, url, text="<html><body>Page</body></html>"):
+        headers = {"Content-Type": "text/html"}
+        return PageResponseObject(
+            url, text=text, status_code=200, headers=headers, request_url=url
+        )
+
+    def test_add(self):
+        store = ResponseStore(self.directory)
+        response = self.get_response("https://example.com")
+
+        # call tested function
+        body_hash = store.add(response, fetch_time=1)
+
+        self.assertEqual(body_hash, response.get_hash())
+
+        restored = store.get("https://example.com")
+        self.assertEqual(restored.get_text(), "<html><body>Page</body></html>")
+        self.assertEqual(restored.get_status_code(), 200)
+        self.assertEqual(restored.get_content_type(), "text/html")
+        store.close()
+
+    def test_add__deduplicates(self):
+        store = ResponseStore(self.directory)
+
+        # call tested function
+        store.add(self.get_response("https://example.com"), fetch_time=1)
+        store.add(self.get_response("https://example.com"), fetch_time=2)
+        store.add(self.get_response("https://mirror.example.com"), fetch_time=3)
+
+        statistics = store.get_statistics()
+        self.assertEqual(statistics["responses"], 3)
+        self.assertEqual(statistics["bodies"], 1)
+        self.assertEqual(statistics["live_bytes"], statistics["total_bytes"])
+        store.close()
+
+    def test_add__binary(self):
+        store = ResponseStore(self.directory)
+        response = PageResponseObject(
+            "https://example.com/image.png",
+            status_code=200,
+            headers={"Content-Type": "image/png"},
+            request_url="https://example.com/image.png",
+        )
+        response.binary = b"\x89PNG\x00\x01"
+
+        # call tested function
+        store.add(response)
+
+        restored = store.get("https://example.com/image.png")
+        self.assertEqual(restored.get_binary(), b"\x89PNG\x00\x01")
+        store.close()
+
+    def test_add__binary_constructor(self):
+        store = ResponseStore(self.directory)
+        # not valid UTF-8
+        binary = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+        response = PageResponseObject(
+            "https://example.com/image.png",
+            status_code=200,
+            binary=binary,
+            headers={"Content-Type": "image/png"},
+            request_url="https://example.com/image.png",
+        )
+
+        # call tested function
+        store.add(response)
+
+        restored = store.get("https://example.com/image.png")
+        self.assertEqual(restored.get_binary(), binary)
+        store.close()
+
+    def test_add__text_from_binary(self):
+        store = ResponseStore(self.directory)
+        binary = "<html><body>Zażółć</body></html>".encode("iso-8859-2")
+        response = PageResponseObject(
+            "https://example.com",
+            status_code=200,
+            binary=binary,
+            headers={"Content-Type": "text/html; charset=iso-8859-2"},
+            request_url="https://example.com",
+        )
+
+        # call tested function
+        store.add(response)
+
+        restored = store.get("https://example.com")
+        self.assertEqual(restored.get_binary(), binary)
+        self.assertEqual(restored.get_text(), "<html><body>Zażółć</body></html>")
+        store.close()
+
+    def test_add__visible_to_other_store(self):
+        store = ResponseStore(self.directory)
+
+        # call tested function
+        store.add(self.get_response("https://example.com"), fetch_time=1)
+
+        # store is not closed, other instance reads it
+        other = ResponseStore(self.directory)
+        restored = other.get("https://example.com")
+        self.assertEqual(restored.get_text(), "<html><body>Page</body></html>")
+
+        replay = ResponseReplay(self.directory)
+        responses = list(replay.get_responses())
+        self.assertEqual(responses[0].get_text(), "<html><body>Page</body></html>")
+
+        replay.close()
+        other.close()
+        store.close()
+
+    def test_get__latest(self):
+        store = ResponseStore(self.directory)
+        store.add(self.get_response("https://example.com", "first"), fetch_time=1)
+        store.add(self.get_response("https://example.com", "second"), fetch_time=2)
+
+        # call tested function
+        self.assertEqual(store.get("https://example.com").get_text(), "second")
+        self.assertEqual(
+            store.get("https://example.com", fetch_time=1).get_text(), "first"
+        )
+        self.assertEqual(store.get("https://other.com"), None)
+        self.assertEqual(len(store.get_history("https://example.com")), 2)
+        store.close()
+
+    def test_get__without_body(self):
+        store = ResponseStore(self.directory)
+        store.add(self.get_response("https://example.com"))
+
+        # call tested function
+        response = store.get("https://example.com", with_body=False)
+
+        self.assertEqual(response.get_status_code(), 200)
+        self.assertEqual(response.get_text(), None)
+        store.close()
+
+    def test_get__reopened(self):
+        store = ResponseStore(self.directory)
+        store.add(self.get_response("https://example.com"))
+        store.close()
+
+        # call tested function
+        store = ResponseStore(self.directory)
+
+        response = store.get("https://example.com")
+        self.assertEqual(response.get_text(), "<html><body>Page</body></html>")
+        store.close()
+
+    def test_segments(self):
+        store = ResponseStore(self.directory, segment_size=10)
+
+        # call tested function
+        for index in range(5):
+            store.add(self.get_response("https://example.com", "page {}".format(index)))
+
+        self.assertEqual(len(store.get_segments()), 5)
+        self.assertEqual(store.get("https://example.com").get_text(), "page 4")
+        store.close()
+
+    def test_remove__compacts(self):
+        store = ResponseStore(self.directory, segment_size=10)
+        for index in range(4):
+            store.add(
+                self.get_response("https://example.com", "page {}".format(index)),
+                fetch_time=index,
+            )
+
+        # call tested function
+        store.remove("https://example.com", before=3)
+
+        statistics = store.get_statistics()
+        self.assertEqual(statistics["responses"], 1)
+        self.assertEqual(statistics["bodies"], 1)
+        self.assertEqual(statistics["live_bytes"], statistics["total_bytes"])
+        self.assertEqual(len(store.get_segments()), 1)
+        self.assertEqual(store.get("https://example.com").get_text(), "page 3")
+
+        store.add(self.get_response("https://example.com", "page 0"), fetch_time=5)
+        self.assertEqual(store.get("https://example.com").get_text(), "page 0")
+        store.close()
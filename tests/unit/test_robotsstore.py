@@ -0,0 +1,80 @@
+import threading
+
+from webtoolkit.robotsstore import RobotsStore
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class RobotsStoreTest(FakeInternetTestCase):
+    def test_set(self):
+        store = RobotsStore(":memory:")
+
+        # call tested function
+        store.set(
+            "https://example.com",
+            "User-agent: *",
+            status_code=200,
+            etag='"1"',
+            last_modified="Wed, 03 Apr 2024 09:39:30 GMT",
+            sitemaps=["https://example.com/sitemap.xml"],
+        )
+
+        entry = store.get("https://example.com")
+
+        self.assertEqual(entry["contents"], "User-agent: *")
+        self.assertEqual(entry["status_code"], 200)
+        self.assertEqual(entry["etag"], '"1"')
+        self.assertEqual(entry["last_modified"], "Wed, 03 Apr 2024 09:39:30 GMT")
+        self.assertEqual(entry["sitemaps"], ["https://example.com/sitemap.xml"])
+        self.assertTrue(entry["fetch_time"])
+        self.assertEqual(store.get_length(), 1)
+
+    def test_get__missing(self):
+        store = RobotsStore(":memory:")
+
+        # call tested function
+        entry = store.get("https://example.com")
+
+        self.assertEqual(entry, None)
+
+    def test_is_expired(self):
+        store = RobotsStore(":memory:", ttl=0)
+        store.set("https://example.com", "User-agent: *")
+
+        # call tested function
+        self.assertTrue(store.is_expired(store.get("https://example.com")))
+
+        store.ttl = 60
+        self.assertFalse(store.is_expired(store.get("https://example.com")))
+
+    def test_touch(self):
+        store = RobotsStore(":memory:")
+        store.set("https://example.com", "User-agent: *")
+        fetch_time = store.get("https://example.com")["fetch_time"]
+
+        # call tested function
+        store.touch("https://example.com")
+
+        entry = store.get("https://example.com")
+        self.assertTrue(entry["fetch_time"] >= fetch_time)
+        self.assertEqual(entry["contents"], "User-agent: *")
+
+    def test_revalidate(self):
+        store = RobotsStore(":memory:")
+        release = threading.Event()
+        calls = []
+
+        def revalidate():
+            calls.append(1)
+            release.wait(5)
+
+        # call tested function
+        thread = store.revalidate("https://example.com", revalidate)
+        second_thread = store.revalidate("https://example.com", revalidate)
+
+        release.set()
+        thread.join(5)
+
+        self.assertEqual(second_thread, None)
+        self.assertEqual(calls, [1])
+        self.assertEqual(store.revalidations, {})
@@ -0,0 +1,105 @@
+from webtoolkit.robotstxt import RobotsTxt, RequestRate
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+robots_contents = """
+# comment
+User-agent: *
+Disallow: /admin/
+Disallow: /*.pdf$
+Disallow: /search*q=
+Allow: /admin/public
+Disallow: /private
+Allow: /private
+Crawl-delay: 2.5
+Request-rate: 1/5
+
+User-agent: BadBot
+User-agent: OtherBot
+Disallow: /
+
+User-agent: badbot
+Crawl-delay: 10
+
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+class RobotsTxtTest(FakeInternetTestCase):
+    def test_can_fetch(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertTrue(robots.can_fetch("*", "https://example.com"))
+        self.assertTrue(robots.can_fetch("*", "https://example.com/"))
+        self.assertTrue(robots.can_fetch("*", "https://example.com/admin"))
+        self.assertFalse(robots.can_fetch("*", "https://example.com/admin/"))
+        self.assertFalse(robots.can_fetch("*", "https://example.com/admin/x"))
+
+    def test_can_fetch__longest_match(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertTrue(robots.can_fetch("*", "https://example.com/admin/public"))
+        self.assertTrue(robots.can_fetch("*", "https://example.com/admin/public/x"))
+
+    def test_can_fetch__allow_wins_tie(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertTrue(robots.can_fetch("*", "https://example.com/private"))
+
+    def test_can_fetch__wildcards(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertFalse(robots.can_fetch("*", "https://example.com/file.pdf"))
+        self.assertFalse(robots.can_fetch("*", "https://example.com/a/b/file.pdf"))
+        self.assertTrue(robots.can_fetch("*", "https://example.com/file.pdf?x=1"))
+        self.assertFalse(robots.can_fetch("*", "https://example.com/search?a=1&q=x"))
+        self.assertTrue(robots.can_fetch("*", "https://example.com/search?a=1"))
+
+    def test_can_fetch__user_agent(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertFalse(robots.can_fetch("BadBot/1.0", "https://example.com/page"))
+        self.assertFalse(robots.can_fetch("otherbot", "https://example.com/page"))
+        self.assertTrue(robots.can_fetch("GoodBot", "https://example.com/page"))
+        self.assertTrue(robots.can_fetch("BadBot", "https://example.com/robots.txt"))
+
+    def test_can_fetch__encoding(self):
+        robots = RobotsTxt("User-agent: *\nDisallow: /a b\nDisallow: /%C4%85")
+
+        # call tested function
+        self.assertFalse(robots.can_fetch("*", "https://example.com/a%20b"))
+        self.assertFalse(robots.can_fetch("*", "https://example.com/a b"))
+        self.assertFalse(robots.can_fetch("*", "https://example.com/ą"))
+
+    def test_can_fetch__empty(self):
+        robots = RobotsTxt("")
+
+        # call tested function
+        self.assertTrue(robots.can_fetch("*", "https://example.com/admin/"))
+
+    def test_crawl_delay(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertEqual(robots.crawl_delay("*"), 2.5)
+        self.assertEqual(robots.crawl_delay("BadBot"), 10)
+        self.assertEqual(robots.crawl_delay("OtherBot"), None)
+
+    def test_request_rate(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertEqual(robots.request_rate("*"), RequestRate(1, 5))
+        self.assertEqual(robots.request_rate("BadBot"), None)
+
+    def test_site_maps(self):
+        robots = RobotsTxt(robots_contents)
+
+        # call tested function
+        self.assertEqual(robots.site_maps(), ["https://example.com/sitemap.xml"])
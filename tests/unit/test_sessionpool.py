@@ -0,0 +1,93 @@
+import gc
+from email.message import Message
+import requests
+from requests.cookies import MockRequest, MockResponse
+
+from webtoolkit import SessionPool
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+class SessionPoolTest(FakeInternetTestCase):
+    def test_get_session(self):
+        pool = SessionPool()
+
+        # call tested function
+        session = pool.get_session()
+
+        self.assertIs(pool.get_session(), session)
+        self.assertEqual(pool.get_length(), 1)
+
+    def test_get_session__proxies(self):
+        pool = SessionPool()
+        proxies = {"https": "https://proxy.com:8080"}
+
+        # call tested function
+        session = pool.get_session(proxies=proxies)
+
+        self.assertIsNot(pool.get_session(), session)
+        self.assertIsNot(pool.get_session(proxies=proxies, verify=False), session)
+        self.assertIs(pool.get_session(proxies=dict(proxies)), session)
+        self.assertEqual(session.proxies["https"], "https://proxy.com:8080")
+
+    def test_get_session__pool_size(self):
+        pool = SessionPool(pool_connections=3, pool_maxsize=7)
+
+        # call tested function
+        session = pool.get_session()
+
+        adapter = session.get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    def test_get_session__cookies_not_stored(self):
+        pool = SessionPool()
+        session = pool.get_session()
+
+        request = requests.Request("GET", "https://example.com").prepare()
+        headers = Message()
+        headers["Set-Cookie"] = "token=secret"
+
+        # call tested function
+        session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_set_pool_size(self):
+        pool = SessionPool()
+        session = pool.get_session()
+
+        # call tested function
+        pool.set_pool_size(pool_maxsize=3)
+
+        self.assertEqual(pool.get_length(), 0)
+        self.assertIsNot(pool.get_session(), session)
+        self.assertEqual(pool.pool_maxsize, 3)
+
+    def test_set_pool_size__session_in_use(self):
+        pool = SessionPool()
+        session = pool.get_session()
+        adapter = session.get_adapter("https://example.com")
+        closed = []
+        adapter.close = lambda: closed.append(1)
+
+        # call tested function
+        pool.set_pool_size(pool_maxsize=3)
+
+        # session is used by running request
+        self.assertEqual(closed, [])
+
+        del session
+        gc.collect()
+
+        self.assertEqual(closed, [1])
+
+    def test_close(self):
+        pool = SessionPool()
+        pool.get_session()
+        pool.get_session(verify=False)
+
+        # call tested function
+        pool.close()
+
+        self.assertEqual(pool.get_length(), 0)
@@ -0,0 +1,136 @@
+import gzip
+
+from webtoolkit import PageRequestObject
+from webtoolkit.sitemapcrawler import SitemapCrawler
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+from webtoolkit.tests.mocks import MockUrl, MockRequestCounter
+
+
+sitemap_index = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap>
+        <loc>https://example.com/sitemap-1.xml</loc>
+        <lastmod>2024-04-03</lastmod>
+    </sitemap>
+    <sitemap>
+        <loc> https://example.com/sitemap-2.xml.gz </loc>
+    </sitemap>
+</sitemapindex>
+"""
+
+sitemap_urlset = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url>
+        <loc>https://example.com/page-1</loc>
+        <lastmod>2024-04-03</lastmod>
+    </url>
+    <url>
+        <loc>https://example.com/page-2</loc>
+    </url>
+</urlset>
+"""
+
+
+class SitemapCrawlerTest(FakeInternetTestCase):
+    def setUp(self):
+        self.disable_web_pages()
+
+    def test_parse__sitemap_index(self):
+        # call tested function
+        urls, children = SitemapCrawler.parse(sitemap_index.encode("utf-8"))
+
+        self.assertEqual(urls, [])
+        self.assertEqual(
+            children,
+            [
+                "https://example.com/sitemap-1.xml",
+                "https://example.com/sitemap-2.xml.gz",
+            ],
+        )
+
+    def test_parse__urlset(self):
+        # call tested function
+        urls, children = SitemapCrawler.parse(sitemap_urlset.encode("utf-8"))
+
+        self.assertEqual(
+            urls,
+            [
+                ("https://example.com/page-1", "2024-04-03"),
+                ("https://example.com/page-2", None),
+            ],
+        )
+        self.assertEqual(children, [])
+
+    def test_parse__invalid(self):
+        # call tested function
+        urls, children = SitemapCrawler.parse(b"<html><body>Not found</body></html>")
+
+        self.assertEqual(urls, [])
+        self.assertEqual(children, [])
+
+    def test_decompress(self):
+        contents = sitemap_urlset.encode("utf-8")
+
+        # call tested function
+        self.assertEqual(SitemapCrawler.decompress(gzip.compress(contents)), contents)
+        self.assertEqual(SitemapCrawler.decompress(contents), contents)
+
+    def test_get_urls(self):
+        MockRequestCounter.reset()
+
+        crawler = SitemapCrawler(
+            [
+                "https://www.youtube.com/product/sitemap.xml",
+                "https://www.youtube.com/product/sitemap.xml",
+            ],
+            url_builder=MockUrl,
+        )
+
+        # call tested function
+        urls = list(crawler.get_urls())
+
+        # 5 compressed child sitemaps, 2 pages each
+        self.assertEqual(len(urls), 10)
+        self.assertIn(("https://www.youtube.com/product/page-1", "2024-04-03"), urls)
+        self.assertIn(("https://www.youtube.com/product/page-2", None), urls)
+
+        self.assertEqual(len(crawler.visited), 6)
+        self.assertEqual(MockRequestCounter.mock_page_requests, 6)
+
+    def test_get_urls__max_sitemaps(self):
+        MockRequestCounter.reset()
+
+        crawler = SitemapCrawler(
+            ["https://www.youtube.com/product/sitemap.xml"],
+            url_builder=MockUrl,
+            max_sitemaps=3,
+        )
+
+        # call tested function
+        urls = list(crawler.get_urls())
+
+        self.assertEqual(len(urls), 4)
+        self.assertEqual(MockRequestCounter.mock_page_requests, 3)
+
+    def test_get_urls__request(self):
+        MockRequestCounter.reset()
+
+        request = PageRequestObject("https://www.youtube.com/product/sitemap.xml")
+        request.timeout_s = 10
+        crawler = SitemapCrawler(
+            ["https://www.youtube.com/product/sitemap.xml"],
+            url_builder=MockUrl,
+            request=request,
+        )
+
+        # call tested function
+        urls = list(crawler.get_urls())
+
+        self.assertEqual(len(urls), 10)
+
+        # each child sitemap is requested by its own request
+        requested = [item["url"] for item in MockRequestCounter.request_history]
+        self.assertEqual(len(requested), 6)
+        self.assertEqual(len(set(requested)), 6)
+        self.assertEqual(request.url, "https://www.youtube.com/product/sitemap.xml")
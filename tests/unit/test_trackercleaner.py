@@ -0,0 +1,66 @@
+from url_cleaner import UrlCleaner
+
+from webtoolkit import TrackerCleaner
+
+from webtoolkit.tests.fakeinternet import FakeInternetTestCase
+
+
+urls = [
+    "https://www.example.com/page?utm_source=x&id=3",
+    "https://www.amazon.de/dp/123?tag=abc&ref=zz&q=1",
+    "https://www.google.com/search?q=test&gs_lcrp=3&sourceid=chrome",
+    "https://github.com/user/repo?tab=readme",
+    "https://example.com/page",
+]
+
+
+class TrackerCleanerTest(FakeInternetTestCase):
+    def test_clean(self):
+        cleaner = TrackerCleaner.get()
+
+        # call tested function
+        cleaned = cleaner.clean("https://www.example.com/page?utm_source=x&id=3")
+
+        self.assertEqual(cleaned, "https://www.example.com/page?id=3")
+
+    def test_clean__same_as_url_cleaner(self):
+        cleaner = TrackerCleaner.get()
+        url_cleaner = UrlCleaner()
+
+        for url in urls:
+            # call tested function
+            self.assertEqual(cleaner.clean(url), url_cleaner.clean(url))
+
+    def test_clean_many(self):
+        cleaner = TrackerCleaner.get()
+
+        # call tested function
+        cleaned = cleaner.clean_many(urls)
+
+        self.assertEqual(cleaned, [cleaner.clean(url) for url in urls])
+
+    def test_get_host_rules(self):
+        cleaner = TrackerCleaner(
+            {
+                "GENERAL": ["utm_source"],
+                "example.com": ["ref"],
+                "shop.*": ["tag"],
+            }
+        )
+
+        # call tested function
+        self.assertEqual(cleaner.get_host_rules("www.example.com"), ["ref"])
+        self.assertEqual(cleaner.get_host_rules("shop.de"), ["tag"])
+        self.assertEqual(cleaner.get_host_rules("other.org"), [])
+
+    def test_get_candidates(self):
+        cleaner = TrackerCleaner(
+            {
+                "example.com": ["ref"],
+                "shop.*": ["tag"],
+            }
+        )
+
+        # call tested function
+        self.assertEqual(cleaner.get_candidates("www.example.com"), [0])
+        self.assertEqual(cleaner.get_candidates("other.org"), [])
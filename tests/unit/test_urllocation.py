@@ -1085,3 +1085,63 @@ class UrlLocationTest(FakeInternetTestCase):
         test_link = "http://mytestpage.com#test=something"
         location = UrlLocation(test_link)
         self.assertEqual(location.get_no_arg_link().url, "http://mytestpage.com")
+
+    def test_get_parsed(self):
+        p = UrlLocation("https://www.Example.com:443/path/to/page.html?q=1&v=2#section")
+
+        # call tested function
+        parsed = p.get_parsed()
+
+        self.assertEqual(parsed.scheme, "https")
+        self.assertEqual(parsed.separator, "://")
+        self.assertEqual(parsed.netloc, "www.Example.com:443")
+        self.assertEqual(parsed.host, "www.example.com:443")
+        self.assertEqual(parsed.segments, ("path", "to", "page.html"))
+        self.assertEqual(parsed.query, "q=1&v=2")
+        self.assertEqual(parsed.fragment, "section")
+        self.assertIs(p.get_parsed(), parsed)
+
+    def test_get_parsed__none(self):
+        p = UrlLocation(None)
+
+        # call tested function
+        self.assertIsNone(p.get_parsed())
+
+    def test_get_parsed__url_change(self):
+        p = UrlLocation("https://first.com/path")
+        self.assertEqual(p.get_domain().url, "https://first.com")
+
+        # call tested function
+        p.url = "https://second.com/path"
+
+        self.assertEqual(p.get_domain().url, "https://second.com")
+        self.assertEqual(p.get_domain_only(), "second.com")
+
+    def test_parse_url__copy(self):
+        p = UrlLocation("https://first.com/path")
+
+        parts = p.parse_url()
+        parts[2] = "changed"
+
+        # call tested function
+        self.assertEqual(p.parse_url()[2], "first.com")
+
+    def test_get_cleaned_link__cache(self):
+        UrlLocation.cleaned_link_cache.clear()
+
+        # call tested function
+        first = UrlLocation.get_cleaned_link("https://www.Cached-Link.com/page/")
+        second = UrlLocation.get_cleaned_link("https://www.Cached-Link.com/page/")
+
+        self.assertEqual(first, "https://www.cached-link.com/page")
+        self.assertEqual(second, first)
+
+        statistics = UrlLocation.get_cleaned_link_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 1)
+
+    def test_is_redirect_candidate(self):
+        # call tested function
+        self.assertTrue(UrlLocation.is_redirect_candidate("https://www.google.com/url?q=test"))
+        self.assertTrue(UrlLocation.is_redirect_candidate("https://www.bing.com/ck/a?u=a1aHR0"))
+        self.assertFalse(UrlLocation.is_redirect_candidate("https://example.com/page?v=1"))
@@ -1,3 +1,6 @@
+import shutil
+import tempfile
+
 from webtoolkit import (
     WebConfig,
 )
@@ -10,3 +13,25 @@ class WebConfigTest(FakeInternetTestCase):
         limit = WebConfig.get_bytes_limit()
 
         self.assertTrue(limit)
+
+    def test_use_robots_store(self):
+        # call tested function
+        WebConfig.use_robots_store(":memory:", ttl=60)
+
+        self.assertTrue(WebConfig.robots_store)
+        self.assertEqual(WebConfig.robots_store.ttl, 60)
+
+        WebConfig.robots_store.close()
+        WebConfig.robots_store = None
+
+    def test_use_response_store(self):
+        directory = tempfile.mkdtemp()
+
+        # call tested function
+        WebConfig.use_response_store(directory)
+
+        self.assertTrue(WebConfig.response_store)
+
+        WebConfig.response_store.close()
+        WebConfig.response_store = None
+        shutil.rmtree(directory)
@@ -10,7 +10,17 @@ from .request import *
 
 from .contentinterface import ContentInterface
 from .contentlinkparser import ContentLinkParser
+from .linktable import LinkTable
+from .trackercleaner import TrackerCleaner
+from .hostclassifier import HostClassifier
+from .robotstxt import RobotsTxt
+from .robotsstore import RobotsStore
+from .responsestore import ResponseStore
+from .responsereplay import ResponseReplay
+from .sitemapcrawler import SitemapCrawler
 from .contenttext import ContentText
+from .htmlmetaindex import HtmlMetaIndex
+from .feedstream import FeedStream, FeedStopCondition
 from .urllocation import UrlLocation
 from .remoteserver import RemoteServer
 from .remoteurl import RemoteUrl
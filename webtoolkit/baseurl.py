@@ -6,6 +6,7 @@ url = BaseUrl(link = "https://google.com")
 response = url.get_response()
 """
 
+import asyncio
 import base64
 from typing import Any, Callable, Optional, Type
 
@@ -52,6 +53,7 @@ from .handlers import (
 
 from .crawlers import (
     RequestsCrawler,
+    AsyncCrawler,
 )
 from .domaincache import DomainCache
 
@@ -65,6 +67,9 @@ class BaseUrl(ContentInterface):
         """
         Constructor
         """
+        # crawler is selected by us, not by caller
+        self.default_crawler = not request or not request.crawler_type
+
         if not request and url:
             self.request_url = url
             self.request = self.get_request_for_url(url)
@@ -108,6 +113,16 @@ class BaseUrl(ContentInterface):
 
         return request
 
+    def get_request_for_async(self, request):
+        """
+        Default crawler is replaced by AsyncCrawler, which does not block event loop
+        """
+        if type(request.crawler_type) is RequestsCrawler:
+            request.crawler_name = "AsyncCrawler"
+            request.crawler_type = AsyncCrawler(request.url)
+
+        return request
+
     def get_handlers(self):
         """
         Returns available handlers.
@@ -223,17 +238,55 @@ class BaseUrl(ContentInterface):
                     return
 
             self.response = self.handler.get_response()
-            if self.response:
-                if not self.response.is_valid():
-                    WebLogger.error(
-                        "Url:{} Response is invalid:{}".format(
-                            self.request.url, self.response
-                        ),
-                        detail_text=str(response_to_json(self.response)),
-                    )
+            self.check_response()
+
+            return self.response
 
+        return self.get_onion_response()
+
+    async def get_response_async(self):
+        """
+        Returns full response, with page handling object. Can be awaited, many
+        responses can be obtained concurrently, by one event loop.
+
+        If crawler was not specified by caller, AsyncCrawler is used.
+
+        @example
+        responses = await asyncio.gather(*[BaseUrl(url=url).get_response_async() for url in urls])
+        """
+        if self.response:
             return self.response
 
+        if self.default_crawler:
+            self.request = self.get_request_for_async(self.request)
+
+        if not self.handler:
+            self.handler = self.get_handler_implementation()
+
+        if self.handler:
+            if self.request.respect_robots:
+                # robots.txt may need to be fetched
+                if not await asyncio.to_thread(self.is_allowed):
+                    return
+
+            self.response = await self.handler.get_response_async()
+            self.check_response()
+
+            return self.response
+
+        return self.get_onion_response()
+
+    def check_response(self):
+        if self.response:
+            if not self.response.is_valid():
+                WebLogger.error(
+                    "Url:{} Response is invalid:{}".format(
+                        self.request.url, self.response
+                    ),
+                    detail_text=str(response_to_json(self.response)),
+                )
+
+    def get_onion_response(self):
         location = UrlLocation(self.request.url)
         if location.is_onion():
             self.response = PageResponseObject(url=self.request.url, status_code=0)
@@ -443,12 +496,16 @@ class BaseUrl(ContentInterface):
 
         return 0
 
-    def get_entries(self):
-        """Returns entries list"""
+    def get_entries(self, stop_condition=None):
+        """
+        Returns entries list
+        @param stop_condition FeedStopCondition. Only entries before the first
+               already seen entry are returned
+        """
 
         handler = self.get_handler()
         if handler:
-            return handler.get_entries()
+            return handler.get_entries(stop_condition)
         else:
             return []
 
@@ -3,6 +3,7 @@ Provides interface and page types Html, RSS, JSON etc.
 """
 
 from time import strptime
+import functools
 import re
 from datetime import datetime
 from dateutil import parser
@@ -16,6 +17,35 @@ from .webtools import (
 from .urllocation import UrlLocation
 
 
+def memoized(getter):
+    """
+    Getter decorator. Result is computed once per content object.
+    Cache is cleared when contents change.
+
+    Lists, dicts and sets are returned as shallow copies, so callers
+    can modify results without changing the cache.
+    """
+    name = getter.__name__
+
+    @functools.wraps(getter)
+    def wrapper(self, *args, **kwargs):
+        cache = self.get_properties_cache()
+
+        key = name
+        if args or kwargs:
+            key = (name, args, tuple(sorted(kwargs.items())))
+
+        if key not in cache:
+            cache[key] = getter(self, *args, **kwargs)
+
+        value = cache[key]
+        if isinstance(value, (list, dict, set)):
+            return value.copy()
+        return value
+
+    return wrapper
+
+
 class ContentInterface(object):
     """
     Content interface
@@ -25,9 +55,32 @@ class ContentInterface(object):
         self.url = url
         self.contents = contents
 
+    @property
+    def contents(self):
+        return self._contents
+
+    @contents.setter
+    def contents(self, contents):
+        self._contents = contents
+        self.clear_cache()
+
     def get_contents(self):
         return self.contents
 
+    def get_properties_cache(self):
+        """
+        Returns cache of memoized getters
+        """
+        if "properties_cache" not in self.__dict__:
+            self.properties_cache = {}
+        return self.properties_cache
+
+    def clear_cache(self):
+        """
+        Called when contents change. Memoized values are dropped.
+        """
+        self.properties_cache = {}
+
     def get_title(self):
         """
         Returns title
@@ -11,7 +11,30 @@ from .webtools import (
     WebLogger,
 )
 from .urllocation import UrlLocation
-from .contentinterface import ContentInterface
+from .contentinterface import ContentInterface, memoized
+from .linktable import LinkTable
+
+
+LINK_CHARS = r"[a-zA-Z0-9./\-_?&=#;:]"
+HREF_CHARS = r"[a-zA-Z0-9./\-_?&=@#;:]"
+
+# links, encoded links, and href values, in one scan.
+# Common leading "h" lets the regex engine skip quickly to candidates
+LINKS_PATTERN = re.compile(
+    r"h(?:(ttps?:(?://|&#x2F;&#x2F;)" + LINK_CHARS + r"+)"
+    r'|ref="(' + HREF_CHARS + r"+))"
+)
+URLS_PATTERN = re.compile(r"https?:(?://|&#x2F;&#x2F;)" + LINK_CHARS + r"+")
+HREF_PATTERN = re.compile(r'href="(' + HREF_CHARS + r"+)")
+
+SCHEME_PATTERN = re.compile(r"^[a-zA-Z0-9]+:")
+USER_PATTERN = re.compile(r"^[a-zA-Z0-9]+@")
+LOCATION_END_PATTERN = re.compile(r"[/\\?#]")
+
+ABSOLUTE_PREFIXES = ("http", "ftp", "smb")
+ENCODED_PREFIXES = ("https:&#x2F;&#x2F", "http:&#x2F;&#x2F")
+
+PROTOCOL_PATTERNS = {}
 
 
 class ContentLinkParser(ContentInterface):
@@ -26,26 +49,65 @@ class ContentLinkParser(ContentInterface):
         """
         super().__init__(url=url, contents=contents)
         self.url = UrlLocation(url).get_no_arg_link().url
+        self.domain = None
 
     def get_links(self):
+        """
+        Returns links found in contents.
+
+        Contents are scanned once. Links, encoded links and href values
+        are found by the same pattern.
+        """
         links = set()
 
-        links.update(self.get_links_https("https"))
-        links.update(self.get_links_https_encoded("https"))
-        links.update(self.get_links_https("http"))
-        links.update(self.get_links_https_encoded("http"))
-        links.update(self.get_links_href())
+        url = self.url
+        domain = self.get_domain_url()
+
+        cont = str(self.get_contents())
+
+        for match in LINKS_PATTERN.finditer(cont):
+            if match.group(1) is not None:
+                ContentLinkParser.add_text_links(links, match.group(0))
+                continue
+
+            item = match.group(2)
+            # href values can contain links, too
+            if item.find("http") >= 0:
+                ContentLinkParser.add_text_links(links, item)
+
+            item = self.process_ahref_item(url, domain, item)
+            if item:
+                links.add(item)
 
         links = ContentLinkParser.filter_suspicious_links(links)
         links = ContentLinkParser.filter_invalid_links(links)
 
-        result = set()
-        for link in links:
-            if UrlLocation(link).is_web_link():
-                result.add(link)
-
         return links
 
+    def add_text_links(links, text):
+        """
+        Adds links found in text. Links can contain other links in arguments.
+        """
+        for match in URLS_PATTERN.finditer(text):
+            link = match.group(0)
+            # links cannot end with "."
+            link = link.rstrip(".")
+            if link.find("&#x2F;") >= 0:
+                link = ContentLinkParser.decode_url(link)
+            links.add(link)
+
+            link_text = match.group(0)
+            if link_text.find("http", 1) >= 0:
+                ContentLinkParser.add_text_links(links, link_text[1:])
+
+    def get_domain_url(self):
+        """
+        Returns domain of the page, used to resolve relative links
+        """
+        if self.domain is None:
+            self.domain = UrlLocation(self.url).get_domain().url
+        return self.domain
+
     def filter_suspicious_links(links):
         result = set()
         for item in links:
@@ -87,12 +149,20 @@ class ContentLinkParser(ContentInterface):
 
         return links
 
+    def get_protocol_pattern(protocol, separator):
+        key = (protocol, separator)
+        if key not in PROTOCOL_PATTERNS:
+            PROTOCOL_PATTERNS[key] = re.compile(
+                "(" + protocol + "?:" + separator + LINK_CHARS + "+)"
+            )
+        return PROTOCOL_PATTERNS[key]
+
     def get_links_https(self, protocol="https"):
         cont = str(self.get_contents())
 
-        pattern = "(" + protocol + "?://[a-zA-Z0-9./\-_?&=#;:]+)"
+        pattern = ContentLinkParser.get_protocol_pattern(protocol, "//")
 
-        all_matches = re.findall(pattern, cont)
+        all_matches = pattern.findall(cont)
         # links cannot end with "."
         all_matches = [link.rstrip(".") for link in all_matches]
         return set(all_matches)
@@ -100,9 +170,9 @@ class ContentLinkParser(ContentInterface):
     def get_links_https_encoded(self, protocol="https"):
         cont = str(self.get_contents())
 
-        pattern = "(" + protocol + "?:&#x2F;&#x2F;[a-zA-Z0-9./\-_?&=#;:]+)"
+        pattern = ContentLinkParser.get_protocol_pattern(protocol, "&#x2F;&#x2F;")
 
-        all_matches = re.findall(pattern, cont)
+        all_matches = pattern.findall(cont)
         # links cannot end with "."
         all_matches = [link.rstrip(".") for link in all_matches]
         all_matches = [ContentLinkParser.decode_url(link) for link in all_matches]
@@ -124,7 +194,7 @@ class ContentLinkParser(ContentInterface):
         links = set()
 
         url = self.url
-        domain = UrlLocation(self.url).get_domain().url
+        domain = self.get_domain_url()
 
         cont = str(self.get_contents())
 
@@ -138,19 +208,14 @@ class ContentLinkParser(ContentInterface):
         return links
 
     def find_all_href_items(self, contents):
-        return re.findall('href="([a-zA-Z0-9./\-_?&=@#;:]+)', contents)
+        return HREF_PATTERN.findall(contents)
 
     def process_ahref_item(self, url, domain, item):
         item = item.strip()
 
         # exclude mailto: tel: sms:
-        pattern = "^[a-zA-Z0-9]+:"
-        if re.match(pattern, item):
-            if (
-                not item.startswith("http")
-                and not item.startswith("ftp")
-                and not item.startswith("smb")
-            ):
+        if SCHEME_PATTERN.match(item):
+            if not item.startswith(ABSOLUTE_PREFIXES):
                 wh = item.find(":")
                 item = item[wh + 1 :]
 
@@ -165,61 +230,49 @@ class ContentLinkParser(ContentInterface):
             item = self.join_url_parts(domain, item)
 
         # for urls like user@domain.com/location
-        pattern = "^[a-zA-Z0-9]+@"
-        if re.match(pattern, item):
+        if USER_PATTERN.match(item):
             wh = item.find("@")
             item = item[wh + 1 :]
 
         # not absolute path
-        if (
-            not item.startswith("http")
-            and not item.startswith("https")
-            and not item.startswith("ftp")
-            and not item.startswith("smb")
-        ):
-
-            location = UrlLocation("https://" + item)
-            domain = location.get_domain_only()
-            if not ContentLinkParser.is_link_valid(domain):
+        if not item.startswith(ABSOLUTE_PREFIXES):
+            # the same as UrlLocation("https://" + item).get_domain_only()
+            location_end = LOCATION_END_PATTERN.search(item)
+            if location_end:
+                item_domain = item[: location_end.start()].lower()
+            else:
+                item_domain = item.lower()
+
+            if not ContentLinkParser.is_link_valid(item_domain):
                 return
 
-            if domain.count(".") <= 0:
+            if item_domain.count(".") <= 0:
                 if not ContentLinkParser.is_link_valid(url):
                     return
                 item = self.join_url_parts(url, item)
 
-        if (
-            not item.startswith("http")
-            and not item.startswith("https")
-            and not item.startswith("ftp")
-            and not item.startswith("smb")
-        ):
+        if not item.startswith(ABSOLUTE_PREFIXES):
             item = "https://" + item
 
-        if item.startswith("https:&#x2F;&#x2F") or item.startswith("http:&#x2F;&#x2F"):
+        if item.startswith(ENCODED_PREFIXES):
             item = ContentLinkParser.decode_url(item)
         return item
 
-    def filter_link_html(links):
-        result = set()
-        for link in links:
-            p = UrlLocation(link)
-            if p.is_webpage_link():
-                result.add(link)
+    @memoized
+    def get_link_table(self):
+        """
+        Returns links, parsed into LinkTable
+        """
+        return LinkTable(self.get_links())
 
-        return result
+    def filter_link_html(links):
+        return LinkTable(links).filter_html()
 
     def filter_link_in_domain(links, domain):
-        result = set()
-
         if not ContentLinkParser.is_link_valid(domain):
-            return result
+            return set()
 
-        for link in links:
-            if link.find(domain) >= 0:
-                result.add(link)
-
-        return result
+        return {link for link in links if link.find(domain) >= 0}
 
     def filter_link_in_url(links, url):
         result = set()
@@ -231,16 +284,10 @@ class ContentLinkParser(ContentInterface):
         return result
 
     def filter_link_out_domain(links, domain):
-        result = set()
-
         if not ContentLinkParser.is_link_valid(domain):
-            return result
-
-        for link in links:
-            if link.find(domain) < 0:
-                result.add(link)
+            return set()
 
-        return result
+        return {link for link in links if link.find(domain) < 0}
 
     def filter_link_out_url(links, url):
         result = set()
@@ -252,30 +299,10 @@ class ContentLinkParser(ContentInterface):
         return result
 
     def filter_domains(links):
-        result = set()
-        for link in links:
-            p = UrlLocation(link)
-            new_link = p.get_domain().url
-            if not ContentLinkParser.is_link_valid(new_link):
-                continue
-
-            if new_link == "https://" or new_link == "http://":
-                WebLogger.debug(
-                    "Incorrect link to add: {}".format(new_link), stack=True
-                )
-                continue
-
-            if not p.is_web_link():
-                continue
-
-            if new_link:
-                result.add(new_link)
-
-        return result
+        return LinkTable(links).get_domains()
 
     def get_domains(self):
-        links = self.get_links()
-        links = ContentLinkParser.filter_domains(links)
+        links = self.get_link_table().get_domains()
         links = ContentLinkParser.filter_invalid_links(links)
 
         return links
@@ -296,18 +323,20 @@ class ContentLinkParser(ContentInterface):
 
         return True
 
+    def get_links_html(self):
+        """
+        Returns links, that are potentially webpages
+        """
+        return self.get_link_table().filter_html()
+
     def get_links_inner(self):
-        links = self.get_links()
-        links = ContentLinkParser.filter_link_html(links)
-        return ContentLinkParser.filter_link_in_domain(
-            links, UrlLocation(self.url).get_domain().url
-        )
+        links = self.get_links_html()
+        return ContentLinkParser.filter_link_in_domain(links, self.get_domain_url())
 
     def get_links_outer(self):
-        links = self.get_links()
-        links = ContentLinkParser.filter_link_html(links)
+        links = self.get_links_html()
 
         in_domain = ContentLinkParser.filter_link_in_domain(
-            links, UrlLocation(self.url).get_domain().url
+            links, self.get_domain_url()
         )
         return links - in_domain
@@ -5,3 +5,6 @@ from .crawlerinterface import (
     get_default_user_agent,
 )
 from .requestscrawler import *
+from .asynccrawler import AsyncCrawler
+from .sessionpool import SessionPool
+from .crawlerexecutor import CrawlerExecutor
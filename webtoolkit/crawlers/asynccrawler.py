@@ -0,0 +1,510 @@
+"""
+asyncio based crawler.
+
+Uses only standard library: HTTP/1.1 over asyncio streams. One event loop can keep
+thousands of requests in flight, they are not limited by number of threads.
+
+@example
+crawler = AsyncCrawler(url="https://example.com")
+response = await crawler.run_async()
+"""
+
+import asyncio
+import base64
+import ssl
+import zlib
+from urllib.parse import urlsplit, urljoin, unquote
+
+from ..request import copy_request
+from ..response import PageResponseObject
+from ..webconfig import WebLogger
+from ..statuses import *
+from .crawlerinterface import CrawlerInterface
+
+
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# headers with these in name are not sent to other hosts, after redirect
+CREDENTIAL_HEADER_MARKERS = ("auth", "cookie", "token", "api-key")
+# statuses which have no body
+NO_BODY_STATUSES = (204, 304)
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncCrawlerBytesLimitError(Exception):
+    """Response body is bigger than bytes limit"""
+
+
+class AsyncHttpResult(object):
+    """
+    Response of asyncio HTTP request. Headers are read, body is read by read_body.
+    """
+
+    def __init__(self, url, status_code, headers, reader, writer):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.reader = reader
+        self.writer = writer
+        self.content = b""
+        # body bytes received, before decompression
+        self.bytes_transferred = 0
+
+    def get_header(self, name):
+        name = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+
+    async def read_body(self, bytes_limit=None):
+        """
+        Reads, and decompresses body.
+        @raises AsyncCrawlerBytesLimitError if body is bigger than bytes_limit
+        """
+        if self.status_code in NO_BODY_STATUSES or self.status_code < 200:
+            return self.content
+
+        transfer_encoding = self.get_header("Transfer-Encoding") or ""
+        content_length = self.get_header("Content-Length")
+
+        if transfer_encoding.lower().find("chunked") >= 0:
+            chunks = self.read_chunked()
+        elif content_length is not None and content_length.strip().isdigit():
+            chunks = self.read_length(int(content_length))
+        else:
+            chunks = self.read_until_eof()
+
+        decompressor = AsyncHttpResult.get_decompressor(
+            self.get_header("Content-Encoding")
+        )
+
+        parts = []
+        size = 0
+        async for chunk in chunks:
+            self.bytes_transferred += len(chunk)
+            if decompressor:
+                chunk = decompressor.decompress(chunk)
+
+            size += len(chunk)
+            if bytes_limit is not None and size > bytes_limit:
+                raise AsyncCrawlerBytesLimitError(size)
+            parts.append(chunk)
+
+        if decompressor:
+            parts.append(decompressor.flush())
+
+        self.content = b"".join(parts)
+        return self.content
+
+    async def read_chunked(self):
+        while True:
+            line = await self.reader.readline()
+            size = int(line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # trailers
+                while True:
+                    line = await self.reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        return
+
+            yield await self.reader.readexactly(size)
+            await self.reader.readline()
+
+    async def read_length(self, length):
+        while length > 0:
+            chunk = await self.reader.read(min(length, READ_CHUNK_SIZE))
+            if not chunk:
+                raise asyncio.IncompleteReadError(chunk, length)
+            length -= len(chunk)
+            yield chunk
+
+    async def read_until_eof(self):
+        while True:
+            chunk = await self.reader.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def get_decompressor(content_encoding):
+        if not content_encoding:
+            return
+
+        content_encoding = content_encoding.strip().lower()
+        if content_encoding in ("gzip", "x-gzip"):
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if content_encoding == "deflate":
+            return zlib.decompressobj()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class AsyncCrawler(CrawlerInterface):
+    """
+    asyncio crawler. Uses the same request fields as RequestsCrawler: timeout_s,
+    bytes_limit, accept_types, proxies, cookies, ssl_verify.
+
+    Timeout covers whole request, it is enforced by cancelling the request.
+    """
+
+    def run(self):
+        """
+        Runs request in a new event loop. Cannot be called from running event loop,
+        use run_async there.
+        """
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        """
+        Prepares for request, runs request, prepares response.
+        @return response (always, but may be invalid)
+        """
+        self.response = PageResponseObject(
+            self.request.url,
+            text=None,
+            status_code=HTTP_STATUS_CODE_SERVER_ERROR,
+            request_url=self.request.url,
+        )
+
+        try:
+            self.response = await self.run_internal_async()
+        except Exception as E:
+            self.add_exc(E)
+
+        return self.get_response()
+
+    async def run_internal_async(self):
+        if self.verbose:
+            WebLogger.debug("AsyncCrawler:{}".format(self.request.url))
+
+        self.update_request()
+
+        try:
+            await asyncio.wait_for(
+                self.crawl_implementation(self.request),
+                timeout=self.request.timeout_s,
+            )
+
+        except asyncio.TimeoutError:
+            self.set_timeout_response()
+
+        except AsyncCrawlerBytesLimitError as E:
+            self.response.binary = None
+            self.add_error("Page is too big: {}".format(E))
+
+        except (OSError, asyncio.IncompleteReadError, ssl.SSLError):
+            self.set_connection_error_response()
+
+        except Exception as E:
+            self.set_exception_response(E)
+
+        return self.response
+
+    async def crawl_implementation(self, request):
+        """
+        Performs request, sets self.response
+        """
+        request_result = await self.fetch(request)
+
+        try:
+            self.response = PageResponseObject(
+                url=request_result.url,
+                text=None,
+                status_code=request_result.status_code,
+                headers=dict(request_result.headers),
+                request_url=request.url,
+            )
+            if not self.is_response_valid():
+                return
+
+            if request.request_type == "ping":
+                return
+
+            try:
+                await request_result.read_body(self.get_bytes_limit())
+            finally:
+                self.response.bytes_transferred = request_result.bytes_transferred
+
+            content_type = self.response.get_content_type()
+
+            if content_type and not self.response.is_content_type_text():
+                self.response.binary = request_result.content
+                return
+
+            encoding = self.get_encoding(self.response, request_result.content)
+
+            # body is kept once, text is decoded when needed
+            self.response = PageResponseObject(
+                url=request_result.url,
+                status_code=request_result.status_code,
+                encoding=encoding,
+                headers=dict(request_result.headers),
+                binary=request_result.content,
+                request_url=request.url,
+            )
+            self.response.bytes_transferred = request_result.bytes_transferred
+        finally:
+            request_result.close()
+
+    async def fetch(self, request):
+        """
+        Sends request, reads headers. Follows redirects.
+        @returns AsyncHttpResult
+        """
+        url = request.url
+        method = "GET"
+        origin = AsyncCrawler.get_origin(url)
+
+        for redirect in range(MAX_REDIRECTS + 1):
+            request_result = await self.send(url, request, method)
+
+            status_code = request_result.status_code
+            location = request_result.get_header("Location")
+            if status_code in REDIRECT_STATUSES and location:
+                request_result.close()
+                url = urljoin(url, location)
+                method = AsyncCrawler.get_redirect_method(status_code, method)
+
+                # credentials are not sent to other hosts
+                if AsyncCrawler.get_origin(url) != origin:
+                    request = AsyncCrawler.get_redirect_request(request)
+                continue
+
+            return request_result
+
+        raise ValueError("Url:{} Too many redirects".format(request.url))
+
+    def get_redirect_method(status_code, method):
+        """
+        Returns method of request which follows redirect. 303 is followed by GET,
+        301, and 302 change POST to GET, as browsers do. 307, and 308 keep method
+        """
+        if status_code == 303 and method != "HEAD":
+            return "GET"
+        if status_code in (301, 302) and method == "POST":
+            return "GET"
+        return method
+
+    def get_origin(url):
+        parts = urlsplit(url)
+        return (parts.scheme, (parts.hostname or "").lower(), parts.port)
+
+    def get_redirect_request(request):
+        """
+        Returns copy of request without cookies, and credential headers
+        """
+        redirect_request = copy_request(request)
+        redirect_request.cookies = {}
+
+        if request.request_headers:
+            redirect_request.request_headers = {
+                name: value
+                for name, value in request.request_headers.items()
+                if not any(
+                    marker in name.lower() for marker in CREDENTIAL_HEADER_MARKERS
+                )
+            }
+
+        return redirect_request
+
+    async def send(self, url, request, method="GET"):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError("Url:{} Protocol is not supported".format(url))
+
+        host = parts.hostname
+        port = parts.port
+        if port is None:
+            port = 443 if parts.scheme == "https" else 80
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        proxy = None
+        proxies = request.get_proxies_map()
+        if proxies:
+            proxy = proxies.get(parts.scheme)
+
+        ssl_context = None
+        if parts.scheme == "https":
+            ssl_context = AsyncCrawler.get_ssl_context(request.ssl_verify)
+
+        proxy_authorization = None
+        if proxy:
+            proxy_parts = urlsplit(proxy)
+            proxy_authorization = AsyncCrawler.get_proxy_authorization(proxy_parts)
+            reader, writer = await asyncio.open_connection(
+                proxy_parts.hostname, proxy_parts.port or 80
+            )
+            if ssl_context:
+                reader, writer = await AsyncCrawler.connect_tunnel(
+                    reader, writer, host, port, ssl_context, proxy_authorization
+                )
+                # authorization is for proxy, not for the tunneled server
+                proxy_authorization = None
+            else:
+                # plain HTTP proxies get absolute URL, without fragment
+                target = parts._replace(
+                    netloc=AsyncCrawler.get_host(parts), fragment=""
+                ).geturl()
+        else:
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=ssl_context, server_hostname=host if ssl_context else None
+            )
+
+        try:
+            writer.write(
+                self.get_request_bytes(
+                    request, parts, target, proxy_authorization, method
+                )
+            )
+            await writer.drain()
+
+            status_code, headers = await AsyncCrawler.read_head(reader)
+        except BaseException:
+            writer.close()
+            raise
+
+        return AsyncHttpResult(url, status_code, headers, reader, writer)
+
+    def get_ssl_context(ssl_verify):
+        context = ssl.create_default_context()
+        if ssl_verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        return context
+
+    def get_proxy_authorization(proxy_parts):
+        """
+        Returns Proxy-Authorization value, if proxy URL contains credentials
+        """
+        if proxy_parts.username is None:
+            return
+
+        credentials = "{}:{}".format(
+            unquote(proxy_parts.username), unquote(proxy_parts.password or "")
+        )
+        return "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+
+    async def connect_tunnel(
+        reader, writer, host, port, ssl_context, proxy_authorization=None
+    ):
+        """
+        Opens HTTPS tunnel through proxy.
+        @returns reader, and writer of TLS connection
+        """
+        address = "{}:{}".format(host, port)
+        lines = ["CONNECT {} HTTP/1.1".format(address), "Host: {}".format(address)]
+        if proxy_authorization:
+            lines.append("Proxy-Authorization: {}".format(proxy_authorization))
+
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_code, headers = await AsyncCrawler.read_head(reader)
+        if status_code != 200:
+            writer.close()
+            raise ConnectionError("Proxy refused tunnel:{}".format(status_code))
+
+        try:
+            if hasattr(writer, "start_tls"):
+                await writer.start_tls(ssl_context, server_hostname=host)
+                return reader, writer
+
+            # python < 3.11, connection is upgraded by loop, with new streams
+            loop = asyncio.get_running_loop()
+            tls_reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(tls_reader)
+            transport = await loop.start_tls(
+                writer.transport, protocol, ssl_context, server_hostname=host
+            )
+        except BaseException:
+            writer.close()
+            raise
+
+        protocol.connection_made(transport)
+        return tls_reader, asyncio.StreamWriter(transport, protocol, tls_reader, loop)
+
+    def get_host(parts):
+        """
+        Returns host, and port of URL, without user info. IPv6 address is kept
+        in brackets
+        """
+        return parts.netloc.rpartition("@")[2]
+
+    def get_request_bytes(
+        self, request, parts, target, proxy_authorization=None, method="GET"
+    ):
+        headers = {}
+        if request.request_headers:
+            headers.update(request.request_headers)
+
+        names = set(name.lower() for name in headers)
+
+        if "host" not in names:
+            headers["Host"] = AsyncCrawler.get_host(parts)
+
+        if "user-agent" not in names:
+            headers["User-Agent"] = self.get_user_agent()
+        if "accept" not in names:
+            headers["Accept"] = "*/*"
+
+        # other encodings are not supported by zlib
+        headers["Accept-Encoding"] = "gzip, deflate"
+        headers["Connection"] = "close"
+
+        if proxy_authorization:
+            headers["Proxy-Authorization"] = proxy_authorization
+
+        if request.cookies and "cookie" not in names:
+            headers["Cookie"] = "; ".join(
+                "{}={}".format(key, value) for key, value in request.cookies.items()
+            )
+
+        lines = ["{} {} HTTP/1.1".format(method, target)]
+        for name, value in headers.items():
+            lines.append("{}: {}".format(name, value))
+
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace")
+
+    async def read_head(reader):
+        """
+        Returns status code, and headers. Repeated headers are joined with comma
+        """
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed without response")
+
+            status_code = int(status_line.split(None, 2)[1])
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+                line = line.decode("latin-1")
+                wh = line.find(":")
+                if wh <= 0:
+                    continue
+
+                name = line[:wh].strip()
+                value = line[wh + 1 :].strip()
+                if name in headers:
+                    headers[name] = headers[name] + ", " + value
+                else:
+                    headers[name] = value
+
+            # informational responses are followed by the real one
+            if status_code >= 200 or status_code == 101:
+                return status_code, headers
+
+    def update_request(self):
+        self.request.timeout_s = self.get_timeout_s()
+
+    def is_valid(self):
+        return True
@@ -0,0 +1,156 @@
+"""
+Shared executor of crawler calls.
+
+Calls are run by a bounded set of worker threads, with a deadline. If a call does
+not finish before its deadline, it is cancelled if it did not start yet, or
+aborted (for example its socket is closed), and then abandoned. Abandoned calls
+do not count towards the limit of workers, a replacement worker is started, and
+the worker of abandoned call exits when the call finishes.
+
+Workers are daemon threads, a stuck call does not prevent program from exiting.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+
+
+CRAWLER_WORKERS = 20
+
+
+class CrawlerExecutor(object):
+    """
+    CrawlerExecutor.get().run(function, timeout_s=20, on_timeout=abort)
+    """
+
+    object = None  # singleton
+    lock = threading.Lock()
+
+    def get():
+        """
+        API - Returns shared executor
+        """
+        if CrawlerExecutor.object is None:
+            with CrawlerExecutor.lock:
+                if CrawlerExecutor.object is None:
+                    CrawlerExecutor.object = CrawlerExecutor()
+
+        return CrawlerExecutor.object
+
+    def __init__(self, max_workers=CRAWLER_WORKERS):
+        self.max_workers = max_workers
+        self.queue = queue.Queue()
+        self.workers = []
+        self.lock = threading.Lock()
+
+        self.idle = 0
+        self.queued = 0
+        self.running = 0
+        # calls that are still running after their deadline
+        self.abandoned = 0
+        self.completed = 0
+        self.timeouts = 0
+
+    def submit(self, function):
+        """
+        Returns Future of function call
+        """
+        future = Future()
+        call = {"future": future, "function": function, "abandoned": False}
+        future.call = call
+
+        with self.lock:
+            self.queued += 1
+            if self.idle == 0 and len(self.workers) < self.max_workers:
+                self.start_worker()
+
+        self.queue.put(call)
+        return future
+
+    def run(self, function, timeout_s, on_timeout=None):
+        """
+        Returns result of function call.
+        @param timeout_s deadline of call, including time spent in queue
+        @param on_timeout called when running call passes its deadline
+        @raises TimeoutError if deadline passed
+        """
+        future = self.submit(function)
+
+        try:
+            return future.result(timeout=timeout_s)
+        except TimeoutError:
+            self.on_deadline(future, on_timeout)
+            raise
+
+    def on_deadline(self, future, on_timeout):
+        with self.lock:
+            self.timeouts += 1
+
+        # not started yet
+        if future.cancel():
+            return
+
+        with self.lock:
+            if future.done():
+                return
+            future.call["abandoned"] = True
+            self.abandoned += 1
+            # worker of abandoned call is not available, until the call finishes
+            self.start_worker()
+
+        if on_timeout is not None:
+            on_timeout()
+
+    def start_worker(self):
+        """
+        Caller holds the lock
+        """
+        worker = threading.Thread(target=self.work, daemon=True)
+        self.workers.append(worker)
+        self.idle += 1
+        worker.start()
+
+    def work(self):
+        while True:
+            call = self.queue.get()
+            future = call["future"]
+
+            with self.lock:
+                self.idle -= 1
+                self.queued -= 1
+                if not future.set_running_or_notify_cancel():
+                    self.idle += 1
+                    continue
+                self.running += 1
+
+            try:
+                result = call["function"]()
+            except BaseException as E:
+                future.set_exception(E)
+            else:
+                future.set_result(result)
+
+            with self.lock:
+                self.running -= 1
+                self.completed += 1
+                if call["abandoned"]:
+                    # replacement worker was started, this one exits
+                    self.abandoned -= 1
+                    self.workers.remove(threading.current_thread())
+                    return
+                self.idle += 1
+
+    def get_statistics(self):
+        """
+        Returns numbers of queued, running, abandoned calls, and totals
+        """
+        with self.lock:
+            return {
+                "queued": self.queued,
+                "running": self.running,
+                "abandoned": self.abandoned,
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+                "workers": len(self.workers),
+                "max_workers": self.max_workers,
+            }
@@ -2,9 +2,11 @@
 Crawler interface can be implemented to provide new mechanisms of crawling
 """
 
+import asyncio
 import threading
 import traceback
 import ua_generator
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 from webtoolkit import (
     PageRequestObject,
@@ -14,6 +16,8 @@ from webtoolkit import (
     HTTP_STATUS_CODE_CONNECTION_ERROR,
     HTTP_STATUS_CODE_EXCEPTION
 )
+from ..response import sniff_encoding
+from .crawlerexecutor import CrawlerExecutor
 
 
 def get_default_headers(device=None, browser=None):
@@ -101,6 +105,15 @@ class CrawlerInterface(object):
 
         return self.get_response()
 
+    async def run_async(self):
+        """
+        Runs request from event loop. Blocking crawlers are run in a thread,
+        asyncio crawlers override it.
+
+        @return response (always, but may be invalid)
+        """
+        return await asyncio.to_thread(self.run)
+
     def set_timeout_response(self):
         self.response.status_code = HTTP_STATUS_CODE_TIMEOUT
         self.add_error(f"Url:{self.request.url} Timout")
@@ -137,6 +150,20 @@ class CrawlerInterface(object):
         """
         return self.response
 
+    def get_encoding(self, response, content):
+        """
+        Returns encoding from headers, or declared by contents: XML prolog, or HTML meta
+        charset. Contents are not parsed, only beginning of bytes is checked.
+
+        chardet does not work on youtube RSS feeds.
+        apparent encoding does not work on youtube RSS feeds.
+        """
+        encoding = response.headers.get_encoding()
+        if encoding:
+            return encoding
+
+        return sniff_encoding(content)
+
     def get_default_user_agent(self):
         return get_default_user_agent()
 
@@ -161,26 +188,31 @@ class CrawlerInterface(object):
 
         self.errors.append(text)
 
-    def is_response_valid(self):
-        if not self.response:
+    def is_response_valid(self, response=None):
+        """
+        @param response response to check, by default crawler response
+        """
+        if response is None:
+            response = self.response
+        if not response:
             return False
 
-        if not self.response.is_valid():
+        if not response.is_valid():
             self.add_error(
-                f"Response not valid. Status:{self.response.status_code}"
+                f"Response not valid. Status:{response.status_code}"
             )
             return False
 
-        content_length = self.response.get_content_length()
+        content_length = response.get_content_length()
         bytes_limit = self.get_bytes_limit()
 
         if content_length is not None and bytes_limit is not None:
             if content_length > bytes_limit:
-                self.add_error("Page is too big: ".format(content_length))
+                self.add_error("Page is too big: {}".format(content_length))
                 return False
 
-        content_type = self.response.get_content_type_keys()
-        content_type_keys = self.response.get_content_type_keys()
+        content_type = response.get_content_type_keys()
+        content_type_keys = response.get_content_type_keys()
         if content_type_keys:
             if "all" in self.get_accept_types():
                 return True
@@ -271,47 +303,34 @@ class CrawlerInterface(object):
 
     def build_requests(self):
         """
-        Perform an HTTP GET request with total timeout control using threading.
+        Perform an HTTP GET request with total timeout control.
 
         Notes:
-        - stream=True defers the content download until accessed.
         - Overcomes the limitation of requests.get's timeout (which doesn't cover total duration).
+        - Call is run by shared CrawlerExecutor. When it does not finish in time,
+          it is aborted, see abort.
         """
+        self.update_request()
 
-        def crawl_with_thread_wrapper(request, result):
-            try:
-                result["response"] = self.crawl_with_thread_implementation(request)
-            except Exception as e:
-                result["exception"] = e
-
-        def crawl_with_thread(request):
-            result = {"response": None, "exception": None}
-
-            thread = threading.Thread(
-                target=crawl_with_thread_wrapper,
-                args=(request, result),
-                daemon=True,
+        # give additional wait time
+        # requests (or other mechanisms) sohuld timeout first
+        # give it some 'time space' to timeout gracefully
+        request = self.request
+        try:
+            return CrawlerExecutor.get().run(
+                lambda: self.crawl_with_thread_implementation(request),
+                timeout_s=request.timeout_s + 5,
+                on_timeout=self.abort,
             )
+        except FutureTimeoutError:
+            raise WebToolsTimeoutException("Request timed out")
 
-            thread.start()
-
-            # give additional wait time
-            # requests (or other mechanisms) sohuld timeout first
-            # give it some 'time space' to timeout gracefully
-            thread.join(request.timeout_s + 5)
-
-            if thread.is_alive():
-                raise WebToolsTimeoutException("Request timed out")
-            if result["exception"]:
-                raise result["exception"]
-            return result["response"]
-
-        self.update_request()
-
-        response = crawl_with_thread(
-            request=self.request,
-        )
-        return response
+    def abort(self):
+        """
+        Called when request did not finish in time. Should release resources
+        of the request, for example close its connection
+        """
+        pass
 
     def crawl_with_thread_implementation(self, request):
         """
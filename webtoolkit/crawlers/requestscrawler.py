@@ -5,14 +5,18 @@ Some crawlers / scrapers cannot be easily called from a thread, etc, because of
 """
 
 import time
+import socket
 import threading
 
-from ..pages import RssPage, HtmlPage
 from ..response import PageResponseObject, file_to_response
 from ..webconfig import WebLogger
 from ..statuses import *
 from .crawlerinterface import CrawlerInterface
 from .crawlerinterface import WebToolsTimeoutException
+from .sessionpool import SessionPool
+
+
+READ_CHUNK_SIZE = 64 * 1024
 
 
 class RequestsCrawler(CrawlerInterface):
@@ -39,49 +43,42 @@ class RequestsCrawler(CrawlerInterface):
         SSL verification makes everything to work slower.
         """
 
+        request_result = None
         try:
-            request_result = self.build_requests()
-
-            if request_result is None:
+            result = self.build_requests()
+            if result is None:
                 self.add_error("Could not build response")
                 return self.response
 
-            self.response = PageResponseObject(
-                url=request_result.url,
-                text=None,
-                status_code=request_result.status_code,
-                headers=dict(request_result.headers),
-                request_url=self.request.url,
-            )
-            if not self.is_response_valid():
-                request_result.close()
-
-                return self.response
+            # worker does not write crawler state, late worker cannot overwrite it
+            request_result, response, content = result
+            self.response = response
 
-            if self.request.request_type == "ping":
+            # body was not read: response was rejected, it is a ping, or too big
+            if content is None:
                 request_result.close()
                 return self.response
 
             content_type = self.response.get_content_type()
 
             if content_type and not self.response.is_content_type_text():
-                self.response.binary = request_result.content
+                self.response.binary = content
                 request_result.close()
                 return self.response
             else:
-                encoding = self.get_encoding(self.response, request_result)
-                if encoding:
-                    request_result.encoding = encoding
+                encoding = self.get_encoding(self.response, content)
 
+                # body is kept once, text is decoded when needed
+                bytes_transferred = self.response.bytes_transferred
                 self.response = PageResponseObject(
                     url=request_result.url,
-                    text=request_result.text,
                     status_code=request_result.status_code,
-                    encoding=request_result.encoding,
+                    encoding=encoding,
                     headers=dict(request_result.headers),
-                    binary=request_result.content,
+                    binary=content,
                     request_url=self.request.url,
                 )
+                self.response.bytes_transferred = bytes_transferred
 
                 request_result.close()
 
@@ -105,59 +102,118 @@ class RequestsCrawler(CrawlerInterface):
 
         return self.response
 
-    def get_encoding(self, response, request_result):
-        """
-        The default assumed content encoding for text/html is ISO-8859-1 aka Latin-1 :( See RFC-2854. UTF-8 was too young to become the default, it was born in 1993, about the same time as HTML and HTTP.
-        Use .content to access the byte stream, or .text to access the decoded Unicode stream.
-
-        chardet does not work on youtube RSS feeds.
-        apparent encoding does not work on youtube RSS feeds.
-        """
-
-        url = self.request.url
-
-        encoding = response.get_encoding()
-        if encoding:
-            return encoding
-
-        else:
-            text = request_result.text
-            # There might be several encoding texts, if so we do not know which one to use
-            if response.is_content_html():
-                p = HtmlPage(url, text)
-                if p.is_valid():
-                    if p.get_charset():
-                        return p.get_charset()
-            if response.is_content_rss():
-                p = RssPage(url, text)
-                if p.is_valid():
-                    if p.get_charset():
-                        return p.get_charset()
-
-            text = text.lower()
-
-            if text.count("encoding") == 1 and text.find('encoding="utf-8"') >= 0:
-                return "utf-8"
-            elif text.count("charset") == 1 and text.find('charset="utf-8"') >= 0:
-                return "utf-8"
-
     def crawl_with_thread_implementation(self, request):
         """
         This method can be overridden in subclasses to change the request behavior.
+
+        Is run by worker thread, which may be abandoned. Results are returned, only
+        socket used by abort is kept in crawler.
+        @returns (request_result, response, content), content is None if body
+                 was not read
         """
-        import requests
+        # until headers are received, there is no connection to abort
+        self.request_socket = None
 
         proxies = request.get_proxies_map()
+        session = SessionPool.get().get_session(proxies, request.ssl_verify)
 
-        return requests.get(
+        # only headers are read, so that abort can close connection
+        request_result = session.get(
             request.url,
             headers=request.request_headers,
             timeout=request.timeout_s,
             verify=request.ssl_verify,
             proxies=proxies,
             cookies=request.cookies,
-            stream=False,
+            stream=True,
+        )
+        self.request_socket = RequestsCrawler.get_socket(request_result)
+
+        # content type, and length are checked before body is downloaded
+        response = PageResponseObject(
+            url=request_result.url,
+            text=None,
+            status_code=request_result.status_code,
+            headers=dict(request_result.headers),
+            request_url=request.url,
         )
+        if not self.is_response_valid(response):
+            return request_result, response, None
+
+        if request.request_type == "ping":
+            return request_result, response, None
+
+        content = self.read_content(request_result, response)
+        return request_result, response, content
+
+    def read_content(self, request_result, response):
+        """
+        Reads body in chunks. Transfer is stopped when body exceeds bytes limit,
+        also when server did not send Content-Length.
+
+        @returns body, or None if body exceeds bytes limit
+        """
+        bytes_limit = self.get_bytes_limit()
+
+        chunks = []
+        size = 0
+        for chunk in request_result.iter_content(chunk_size=READ_CHUNK_SIZE):
+            size += len(chunk)
+            if bytes_limit is not None and size > bytes_limit:
+                response.bytes_transferred = self.get_bytes_transferred(
+                    request_result, size
+                )
+                self.add_error("Page is too big: {}".format(size))
+                request_result.close()
+                return
+
+            chunks.append(chunk)
+
+        response.bytes_transferred = self.get_bytes_transferred(request_result, size)
+        return b"".join(chunks)
+
+    def get_bytes_transferred(self, request_result, size):
+        """
+        Returns number of bytes received. urllib3 does not count chunked
+        transfers, then number of decoded bytes is returned
+        """
+        transferred = request_result.raw.tell()
+        if transferred:
+            return transferred
+        return size
+
+    def abort(self):
+        """
+        Closes connection of request that did not finish in time.
+
+        Abort is best-effort. Connection is known only after headers are received.
+        Before that, while resolving host, connecting, or waiting for headers,
+        nothing is closed. Then stalled connect, and reads are limited by timeout
+        passed to requests, resolving host is not limited. Session is shared by
+        other requests, so it is not closed.
+        """
+        # closing response would wait for the stuck read, socket is shut down instead
+        sock = getattr(self, "request_socket", None)
+        if sock is None:
+            return
+
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError as E:
+            WebLogger.debug("Url:{} cannot abort request".format(self.request.url))
+
+    def get_socket(request_result):
+        """
+        Returns socket of response. Connection which will be closed after response
+        does not keep its socket, then socket is read from response file.
+        """
+        connection = getattr(request_result.raw, "_connection", None)
+        sock = getattr(connection, "sock", None)
+        if sock is not None:
+            return sock
+
+        fp = getattr(getattr(request_result.raw, "_fp", None), "fp", None)
+        return getattr(getattr(fp, "raw", None), "_sock", None)
 
     def is_valid(self):
         try:
@@ -176,9 +232,11 @@ class RequestsCrawler(CrawlerInterface):
         headers["User-Agent"] = user_agent
         url = self.request.url
 
+        session = SessionPool.get().get_session(verify=False)
+
         response = None
         try:
-            with requests.get(
+            with session.get(
                 url=url,
                 headers=headers,
                 timeout=20,
@@ -224,3 +282,11 @@ class RequestsCrawler(CrawlerInterface):
 
     def update_request(self):
         self.request.timeout_s = self.get_timeout_s()
+
+    def close(self):
+        """
+        Connection is released to session pool by run. Shared sessions stay open
+        """
+        self.request_socket = None
+
+        super().close()
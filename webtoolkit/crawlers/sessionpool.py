@@ -0,0 +1,141 @@
+"""
+Shared requests sessions.
+
+Sessions keep connections alive, so requests to the same host reuse TCP and TLS
+connections. One session is kept for each proxy, and TLS verification setting.
+"""
+
+import threading
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+
+
+# number of hosts, for which connections are kept
+POOL_CONNECTIONS = 20
+# number of connections kept for one host
+POOL_MAXSIZE = 10
+
+
+class SessionPool(object):
+    """
+    session = SessionPool.get().get_session(proxies=None, verify=True)
+    """
+
+    object = None  # singleton
+    lock = threading.Lock()
+
+    def get():
+        """
+        API - Returns shared pool
+        """
+        if SessionPool.object is None:
+            with SessionPool.lock:
+                if SessionPool.object is None:
+                    SessionPool.object = SessionPool()
+
+        return SessionPool.object
+
+    def __init__(self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+        """
+        @param pool_connections number of hosts, for which connections are kept
+        @param pool_maxsize number of connections kept for one host
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        # key -> session
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def get_key(proxies=None, verify=True):
+        proxies_key = ()
+        if proxies:
+            proxies_key = tuple(sorted(proxies.items()))
+
+        return (proxies_key, verify)
+
+    def get_session(self, proxies=None, verify=True):
+        """
+        Returns session for proxies, and TLS verification setting
+        """
+        key = SessionPool.get_key(proxies, verify)
+
+        session = self.sessions.get(key)
+        if session is not None:
+            return session
+
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = self.create_session(proxies, verify)
+                self.sessions[key] = session
+
+        return session
+
+    def create_session(self, proxies=None, verify=True):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if proxies:
+            session.proxies.update(proxies)
+        if verify is not None:
+            session.verify = verify
+
+        # session is shared, cookies of one response cannot be sent with other requests
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        return session
+
+    def set_pool_size(self, pool_connections=None, pool_maxsize=None):
+        """
+        Sets pool sizes. New sessions are created. Existing sessions may still be
+        used by running requests, they are closed when they are released
+        """
+        with self.lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+
+        for session in sessions:
+            SessionPool.close_when_released(session)
+
+    def close_when_released(session):
+        """
+        Connections of session are closed, when session is no longer referenced
+        """
+        # one adapter is mounted for http, and https
+        adapters = []
+        for adapter in session.adapters.values():
+            if adapter not in adapters:
+                adapters.append(adapter)
+        weakref.finalize(session, SessionPool.close_adapters, adapters)
+
+    def close_adapters(adapters):
+        for adapter in adapters:
+            adapter.close()
+
+    def get_length(self):
+        return len(self.sessions)
+
+    def close(self):
+        """
+        Closes all sessions, and their connections
+        """
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+
+        for session in sessions:
+            session.close()
@@ -10,12 +10,17 @@ options.mode_mapping
 
 """
 
-import urllib.robotparser
 import asyncio
+import threading
 
 from .urllocation import UrlLocation
+from .robotstxt import RobotsTxt
+from .sitemapcrawler import SitemapCrawler
+from .request import PageRequestObject, copy_request
+from .statuses import HTTP_STATUS_NOT_MODIFIED
+from .webconfig import WebConfig
 
-from webtoolkit.utils.dateutils import DateUtils
+from webtoolkit.utils.lrucache import LruCache
 
 
 class DomainCacheInfo(object):
@@ -23,7 +28,17 @@ class DomainCacheInfo(object):
     is_access_valid
     """
 
-    def __init__(self, url, respect_robots_txt=True, request=None, url_builder=None):
+    def __init__(
+        self,
+        url,
+        respect_robots_txt=True,
+        request=None,
+        url_builder=None,
+        store=None,
+    ):
+        """
+        @param store RobotsStore, robots.txt is read from it, if it is there
+        """
         print("Creating domain cache")
         p = UrlLocation(url)
 
@@ -31,20 +46,38 @@ class DomainCacheInfo(object):
 
         self.url = p.get_domain().url
         self.robots_contents = None
+        self.robots_read = False
+        self.sitemaps = None
         self.request = request
         self.url_builder = url_builder
+        self.store = store
+        # background revalidation of stored robots.txt
+        self.revalidation = None
 
         if self.respect_robots_txt:
             self.robots_contents = self.get_robots_txt_contents()
             self.robots = self.get_robots_txt()
 
-    def is_allowed(self, url):
+    def is_allowed(self, url, user_agent="*"):
         if self.respect_robots_txt and self.robots:
-            user_agent = "*"
             return self.robots.can_fetch(user_agent, url)
         else:
             return True
 
+    def get_crawl_delay(self, user_agent="*"):
+        """
+        Returns Crawl-delay of robots.txt, in seconds, or None
+        """
+        if self.respect_robots_txt and self.robots:
+            return self.robots.crawl_delay(user_agent)
+
+    def get_request_rate(self, user_agent="*"):
+        """
+        Returns Request-rate of robots.txt, RequestRate(requests, seconds), or None
+        """
+        if self.respect_robots_txt and self.robots:
+            return self.robots.request_rate(user_agent)
+
     def get_robots_txt_url(self):
         p = UrlLocation(self.url)
         return p.get_robots_txt_url()
@@ -55,10 +88,7 @@ class DomainCacheInfo(object):
         """
         contents = self.get_robots_txt_contents()
         if contents:
-            rp = urllib.robotparser.RobotFileParser()
-            rp.set_url(self.get_robots_txt_url())
-            rp.parse(contents.split("\n"))
-            return rp
+            return RobotsTxt(contents, url=self.get_robots_txt_url())
 
     def is_robots_txt(self):
         return self.get_robots_txt_contents()
@@ -67,26 +97,132 @@ class DomainCacheInfo(object):
         """
         We can only ask domain for robots
         """
-        if self.robots_contents:
+        if self.robots_contents or self.robots_read:
             return self.robots_contents
 
-        robots_url = self.get_robots_txt_url()
-        u = self.url_builder(robots_url, request=self.request)
+        if self.store:
+            entry = self.store.get(self.url)
+            if entry:
+                self.robots_read = True
+                self.robots_contents = entry["contents"]
+                self.sitemaps = entry["sitemaps"]
+
+                if self.store.is_expired(entry):
+                    self.revalidation = self.store.revalidate(
+                        self.url, lambda: self.revalidate(entry)
+                    )
+
+                return self.robots_contents
 
-        response = u.get_response()
+        response = self.fetch_robots_txt()
         if response:
-            self.robots_contents = response.get_text()
+            self.robots_read = True
+            self.robots_contents = DomainCacheInfo.get_response_contents(response)
+
+            if self.store:
+                self.store_response(response, self.robots_contents)
 
         return self.robots_contents
 
+    def fetch_robots_txt(self, entry=None):
+        """
+        @param entry stored entry. Its validators make the request conditional
+        """
+        robots_url = self.get_robots_txt_url()
+
+        request = self.request
+        if entry:
+            request = self.get_conditional_request(robots_url, entry)
+
+        u = self.url_builder(robots_url, request=request)
+        return u.get_response()
+
+    def get_conditional_request(self, robots_url, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        if not headers:
+            return self.request
+
+        if self.request:
+            request = copy_request(self.request)
+            request.url = robots_url
+        else:
+            request = PageRequestObject(robots_url)
+
+        request_headers = dict(request.request_headers or {})
+        request_headers.update(headers)
+        request.request_headers = request_headers
+        return request
+
+    def revalidate(self, entry):
+        """
+        Fetches robots.txt of stored entry again. Called in background
+        """
+        response = self.fetch_robots_txt(entry)
+        if not response:
+            return
+
+        if response.get_status_code() == HTTP_STATUS_NOT_MODIFIED:
+            self.store.touch(self.url)
+            return
+
+        if not response.is_valid():
+            # last known robots.txt is used, until next revalidation
+            self.store.touch(self.url)
+            return
+
+        self.robots_contents = DomainCacheInfo.get_response_contents(response)
+        self.store_response(response, self.robots_contents)
+
+        self.sitemaps = None
+        if self.respect_robots_txt:
+            self.robots = self.get_robots_txt()
+
+    def get_response_contents(response):
+        """
+        Returns robots.txt contents of response, None for invalid responses.
+        The same contents are kept in memory, and in the store
+        """
+        if response.is_valid():
+            return response.get_text()
+
+    def store_response(self, response, contents):
+        self.store.set(
+            self.url,
+            contents,
+            status_code=response.get_status_code(),
+            etag=DomainCacheInfo.get_header(response, "ETag"),
+            last_modified=DomainCacheInfo.get_header(response, "Last-Modified"),
+            sitemaps=DomainCacheInfo.get_site_maps_from_contents(contents),
+        )
+
+    def get_header(response, name):
+        """
+        Returns response header, header names are case insensitive
+        """
+        name = name.lower()
+        for key, value in response.headers.headers.items():
+            if key.lower() == name:
+                return value
+
     def get_site_maps_urls(self):
         """
         https://stackoverflow.com/questions/2978144/pythons-robotparser-ignoring-sitemaps
         robot parser does not work. We have to do it manually
         """
+        contents = self.get_robots_txt_contents()
+        if self.sitemaps is not None:
+            return list(self.sitemaps)
+
+        return DomainCacheInfo.get_site_maps_from_contents(contents)
+
+    def get_site_maps_from_contents(contents):
         result = set()
 
-        contents = self.get_robots_txt_contents()
         if contents:
             lines = contents.split("\n")
             for line in lines:
@@ -108,20 +244,11 @@ class DomainCacheInfo(object):
             lines = contents.split("\n")
             for line in lines:
                 if line.find("Disallow") >= 0 or line.find("Allow") >= 0:
-                    link = process_allow_link(line)
+                    link = self.process_allow_link(line)
                     result.append(link)
 
-        urls = self.get_site_maps_urls()
-        for url in urls:
-            u = slef.url_builder(url=url, request=self.request)
-            response = u.get_response()
-            contents = response.get_text()
-            if contents:
-                parser = ContentLinkParser(url, contents)
-                parser = ContentLinkParser(self.url, contents)
-                links = parser.get_links()
-
-                result.extend(links)
+        for loc, lastmod in self.get_site_map_entries():
+            result.append(loc)
 
         return result
 
@@ -133,47 +260,58 @@ class DomainCacheInfo(object):
             if part.find("*") == -1:
                 return self.url + part
 
-    def get_all_site_maps_urls(self):
-        sites = set(self.get_site_maps_urls())
-
-        for site in sites:
-            subordinate_sites = self.get_subordinate_sites(site)
-            sites.update(subordinate_sites)
-
-        return list(sites)
-
-    def get_subordinate_sites(self, site):
-        all_subordinates = set()
+    def get_site_maps_crawler(self, sitemaps=None):
+        """
+        Returns SitemapCrawler, by default of sitemaps listed in robots.txt
+        """
+        if sitemaps is None:
+            sitemaps = self.get_site_maps_urls()
 
-        u = self.url_builder(site, request=self.request)
-        response = u.get_response
-        if not response:
-            return all_subordinates
+        return SitemapCrawler(
+            sitemaps, url_builder=self.url_builder, request=self.request
+        )
 
-        contents = response.get_text()
+    def get_site_map_entries(self):
+        """
+        Yields (loc, lastmod) pairs of pages listed in all sitemaps
+        """
+        crawler = self.get_site_maps_crawler()
+        for entry in crawler.get_urls():
+            yield entry
 
-        # check if it is sitemap / sitemap index
-        # https://www.sitemaps.org/protocol.html#index
-        if contents.find("<urlset") == -1 and contents.find("<sitemapindex") == -1:
-            return all_subordinates
+    def get_all_site_maps_urls(self):
+        """
+        Returns sitemaps listed in robots.txt, and all their subordinate sitemaps
+        """
+        crawler = self.get_site_maps_crawler()
+        for entry in crawler.get_urls():
+            pass
 
-        p = ContentLinkParser(self.url, contents)
-        links = p.get_links()
+        return list(crawler.visited)
 
-        for link in links:
-            subordinates = self.get_subordinate_sites(link)
-            all_subordinates.update(subordinates)
+    def get_subordinate_sites(self, site):
+        """
+        Returns sitemaps, which are listed in sitemap index, recursively
+        """
+        crawler = self.get_site_maps_crawler([site])
+        for entry in crawler.get_urls():
+            pass
 
-        return all_subordinates
+        return crawler.visited - {site}
 
 
 class DomainCache(object):
     """
     DomainCache.get_object("https://youtube.com/mysite/something").is_allowed("url")
+
+    Thread safe, least recently used cache. Entries expire after ttl, then robots.txt
+    is read again. Domain information is read by one thread at a time.
     """
 
     object = None  # singleton
+    lock = threading.Lock()
     default_cache_size = 400
+    default_ttl = 24 * 60 * 60
     respect_robots_txt = True
 
     def get_object(url, url_builder):
@@ -190,13 +328,15 @@ class DomainCache(object):
         API - Returns domain cache object
         """
         if DomainCache.object is None:
-            if not cache_size:
-                cache_size = DomainCache.default_cache_size
+            with DomainCache.lock:
+                if DomainCache.object is None:
+                    if not cache_size:
+                        cache_size = DomainCache.default_cache_size
 
-            DomainCache.object = DomainCache(
-                cache_size=cache_size,
-                url_builder=url_builder,
-            )
+                    DomainCache.object = DomainCache(
+                        cache_size=cache_size,
+                        url_builder=url_builder,
+                    )
 
         return DomainCache.object
 
@@ -205,23 +345,33 @@ class DomainCache(object):
         url_builder,
         cache_size=400,
         respect_robots_txt=True,
+        ttl=None,
+        store=None,
     ):
         """
         @note Not API
+        @param ttl time to live of domain information, in seconds
+        @param store RobotsStore. WebConfig store is used by default
         """
+        if ttl is None:
+            ttl = DomainCache.default_ttl
+
         self.cache_size = cache_size
-        self.cache = {}
+        self.cache = LruCache(cache_size, ttl=ttl)
         self.url_builder = url_builder
+        self.respect_robots_txt = respect_robots_txt
+        self.store = store
 
     def get_domain_info(self, input_url):
-        if not input_url in self.cache:
-            self.remove_from_cache()
-            self.cache[input_url] = {
-                "date": DateUtils.get_datetime_now_utc(),
-                "domain": self.read_info(input_url),
-            }
+        return self.cache.get_or_load(input_url, self.read_info)
 
-        return self.cache[input_url]["domain"]
+    def get_store(self):
+        """
+        Returns RobotsStore, see WebConfig.use_robots_store
+        """
+        if self.store:
+            return self.store
+        return WebConfig.robots_store
 
     def get_length(self):
         """
@@ -235,25 +385,22 @@ class DomainCache(object):
         """
         return self.cache_size
 
+    def get_statistics(self):
+        """
+        Returns hits, misses, evictions, expirations, and size of cache
+        """
+        return self.cache.get_statistics()
+
     def read_info(self, domain_url):
         return DomainCacheInfo(
             domain_url,
+            respect_robots_txt=self.respect_robots_txt,
             url_builder=self.url_builder,
+            store=self.get_store(),
         )
 
-    def remove_from_cache(self):
-        if self.get_length() < self.get_max_length():
-            return
-
-        thelist = []
-        for domain in self.cache:
-            info = self.cache[domain]
-            thelist.append([domain, info["date"], info["domain"]])
-
-        thelist.sort(key=lambda x: x[1])
-        thelist = thelist[-self.cache_size : -1]
-
-        self.cache.clear()
-
-        for item in thelist:
-            self.cache[item[0]] = {"date": item[1], "domain": item[2]}
+    def remove_from_cache(self, domain_url):
+        """
+        Removes domain information, it will be read again when needed
+        """
+        self.cache.remove(domain_url)
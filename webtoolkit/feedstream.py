@@ -0,0 +1,247 @@
+"""
+Streaming RSS / Atom reader.
+
+Feed is read with lxml iterparse. Entries are yielded one at a time, as soon as
+their closing tag is read. Processed entries are removed from the tree, so
+memory does not grow with number of entries.
+
+Entries, and channel data are the same brutefeedparser objects, that are
+produced by BruteFeedParser.parse.
+"""
+
+from datetime import datetime
+from io import BytesIO
+import lxml.etree as ET
+from dateutil import parser
+from brutefeedparser import BruteFeedParser
+from brutefeedparser.brutefeedparser import FeedReaderEntry, FeedReaderFeed
+
+from .utils.dateutils import DateUtils
+from .webtools import WebLogger
+
+
+ENTRY_TAGS = ("entry", "item")
+GUID_TAGS = ("guid", "id")
+DATE_TAGS = ("pubDate", "published", "updated", "date", "created")
+DC_NAMESPACE = "http://purl.org/dc/elements/1.1/"
+
+
+class FeedStopCondition(object):
+    """
+    Tells where feed polling can stop.
+
+    Feeds list newest entries first. Once an entry, that was already seen
+    is reached, the remaining entries are not parsed.
+
+    Checks are performed on raw entry elements, before entries are read.
+    """
+
+    def __init__(self, links=None, guid=None, date_published=None):
+        """
+        @param links links of entries that were already seen
+        @param guid GUID, or Atom id of last seen entry
+        @param date_published entries published at, or before this date were seen
+        """
+        self.links = set(links) if links else set()
+        self.guid = guid
+        self.date_published = date_published
+        if date_published and date_published.tzinfo is None:
+            self.date_published = DateUtils.to_utc_date(date_published)
+
+    def is_seen(self, element):
+        """
+        Returns True if entry element was already seen
+        """
+        if self.links:
+            link = FeedStream.get_link(element)
+            if link and link.strip() in self.links:
+                return True
+
+        if self.guid:
+            guid = FeedStream.get_child_text(element, GUID_TAGS)
+            if guid and guid.strip() == self.guid:
+                return True
+
+        if self.date_published:
+            date = FeedStopCondition.get_date(element)
+            if date and date <= self.date_published:
+                return True
+
+        return False
+
+    def is_seen_properties(self, properties):
+        """
+        Returns True if entry property map was already seen
+        """
+        link = properties.get("link")
+        if link and link in self.links:
+            return True
+
+        date = properties.get("date_published")
+        if self.date_published and isinstance(date, datetime):
+            if date.tzinfo is None:
+                date = DateUtils.to_utc_date(date)
+            if date <= self.date_published:
+                return True
+
+        return False
+
+    def get_date(element):
+        text = FeedStream.get_child_text(element, DATE_TAGS)
+        if not text:
+            return
+
+        try:
+            date = parser.parse(text.strip())
+        except Exception as E:
+            WebLogger.debug("FeedStopCondition: invalid date:{}".format(text))
+            return
+
+        if date.tzinfo is None:
+            return DateUtils.to_utc_date(date)
+        return date
+
+
+class FeedStream(object):
+    """
+    Yields feed entries one by one.
+
+    Channel data (title, language, author) is read when the first entry starts,
+    therefore only channel elements placed before entries are visible.
+    """
+
+    def __init__(self, contents):
+        self.contents = contents
+        self.ns = {}
+        self.feed = None
+        self.entries_count = 0
+        self.stopped = False
+
+    def get_entries(self, stop_condition=None):
+        """
+        Yields FeedReaderEntry objects.
+        Entry element is available, via entry.root, until the next entry is requested.
+        @param stop_condition FeedStopCondition. Parsing stops at first seen entry
+        """
+        contents = self.get_feed_contents()
+        if not contents:
+            return
+
+        context = ET.iterparse(
+            BytesIO(contents.encode()),
+            events=("start", "end"),
+            recover=True,
+            strip_cdata=False,
+            huge_tree=True,
+        )
+
+        root = None
+        entry_element = None
+
+        try:
+            for event, element in context:
+                if root is None:
+                    root = element
+                    self.on_root(root)
+
+                if event == "start":
+                    if entry_element is None and FeedStream.is_entry(element):
+                        entry_element = element
+                        if self.feed is None:
+                            self.on_channel(root)
+                    continue
+
+                if element is not entry_element:
+                    continue
+
+                entry_element = None
+
+                if stop_condition and stop_condition.is_seen(element):
+                    self.stopped = True
+                    return
+
+                self.entries_count += 1
+
+                yield FeedReaderEntry(element, self.ns)
+
+                FeedStream.release(element)
+        except ET.XMLSyntaxError as E:
+            WebLogger.exc(E, "FeedStream: cannot parse contents")
+
+        if self.feed is None and root is not None:
+            self.on_channel(root)
+
+    def get_feed_contents(self):
+        """
+        Returns feed part of contents. RSS can be wrapped in HTML.
+        """
+        if not self.contents:
+            return
+
+        return BruteFeedParser(self.contents).contents
+
+    def on_root(self, root):
+        self.ns = dict(root.nsmap)
+        if "dc" not in self.ns:
+            self.ns["dc"] = DC_NAMESPACE
+
+    def on_channel(self, root):
+        self.feed = FeedReaderFeed(root, ns=self.ns, is_atom="atom" in self.ns)
+        self.feed.parse()
+
+    def is_entry(element):
+        return FeedStream.get_local_name(element) in ENTRY_TAGS
+
+    def release(element):
+        """
+        Removes processed element, and its already processed siblings from tree
+        """
+        element.clear(keep_tail=True)
+
+        parent = element.getparent()
+        if parent is None:
+            return
+
+        while element.getprevious() is not None:
+            del parent[0]
+
+    def get_link(element):
+        """
+        Returns link of entry element, in one pass over the element.
+
+        Handles <link>url</link>, <link href="url"/> and <link/>url, where URL
+        is placed after the link element.
+        """
+        for item in element.iter():
+            if item is element or not FeedStream.is_link(item):
+                continue
+
+            if item.text and item.text.strip():
+                return item.text
+            href = item.get("href")
+            if href:
+                return href
+            if item.tail and item.tail.strip():
+                return item.tail
+
+            return ""
+
+    def get_child_text(element, tags):
+        """
+        Returns text of first child element with local name in tags
+        """
+        for child in element:
+            if FeedStream.get_local_name(child) in tags and child.text:
+                return child.text
+
+    def get_local_name(element):
+        tag = element.tag
+        if not isinstance(tag, str):
+            return
+
+        if tag[0] == "{":
+            return tag[tag.find("}") + 1 :]
+        return tag
+
+    def is_link(element):
+        return FeedStream.get_local_name(element) == "link"
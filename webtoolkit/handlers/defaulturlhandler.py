@@ -253,9 +253,9 @@ class DefaultCompoundChannelHandler(DefaultChannelHandler):
 
         return url
 
-    def get_entries(self):
+    def get_entries(self, stop_condition=None):
         for url in self.channel_sources_urls.values():
-            entries = url.get_entries()
+            entries = url.get_entries(stop_condition)
             if entries and len(list(entries)) > 0:
                 return entries
         return []
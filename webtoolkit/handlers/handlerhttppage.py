@@ -56,6 +56,23 @@ class HttpPageHandler(HandlerInterface):
 
         self.get_response_implementation()
 
+        return self.process_response()
+
+    async def get_response_async(self):
+        """
+        Obtains response from event loop, analyzes structure, etc
+        """
+        if self.response:
+            return self.response
+
+        await self.get_response_implementation_async()
+
+        return self.process_response()
+
+    def process_response(self):
+        """
+        Recognizes page type of obtained response
+        """
         self.p = self.get_page_handler()
 
         if self.p and type(self.p) == RssPage:
@@ -81,6 +98,16 @@ class HttpPageHandler(HandlerInterface):
 
             return self.response
 
+    async def get_response_implementation_async(self):
+        url = self.url
+
+        if self.is_handled_by():
+            self.update_request_for_services()
+            builder = CrawlerCaller(url=url, request=self.request)
+            self.response = await builder.get_response_async()
+
+            return self.response
+
     def update_request_for_services(self):
         """
         This could have been split into separate class, right now there is no need to.
@@ -127,7 +154,11 @@ class HttpPageHandler(HandlerInterface):
 
         url = self.url
 
-        self.p = PageFactory.get(self.response, contents)
+        head_only = False
+        if self.request and self.request.settings:
+            head_only = self.request.settings.get("head_only", False)
+
+        self.p = PageFactory.get(self.response, contents, head_only=head_only)
         return self.p
 
     def get_title(self):
@@ -251,15 +282,18 @@ class HttpPageHandler(HandlerInterface):
                 if favs and len(favs) > 0:
                     return list(favs.keys())[0]
 
-    def get_entries(self):
+    def get_entries(self, stop_condition=None):
+        """
+        @param stop_condition FeedStopCondition, entries are returned until seen entry
+        """
         if self.p:
             if type(self.p) is RssPage:
-                return list(self.p.get_entries())
+                return list(self.p.get_entries(stop_condition))
             if type(self.p) is HtmlPage:
                 # There might be RSS in HTML
                 rss = RssPage(self.url, self.p.get_contents())
                 if rss.is_valid():
-                    return list(rss.get_entries())
+                    return list(rss.get_entries(stop_condition))
         return []
 
     def get_feeds(self):
@@ -316,8 +350,54 @@ class CrawlerCaller(object):
 
         return self.response
 
+    async def get_response_async(self):
+        if self.response:
+            return self.response
+
+        WebLogger.debug(f"{self.url}: HTTP request")
+        self.response = await self.run_crawler_async()
+        WebLogger.debug(f"{self.url}: HTTP response:DONE")
+
+        return self.response
+
     def run_crawler(self):
         """ """
+        crawler, response = self.get_crawler()
+        if not crawler:
+            return response
+
+        start_time = time.time()
+        try:
+            crawler.run()
+        except Exception as E:
+            response.add_error(f"Exception when running crawler {E}")
+
+        end_time = time.time()
+
+        return self.get_crawler_response(crawler, end_time - start_time)
+
+    async def run_crawler_async(self):
+        """
+        Runs crawler from event loop
+        """
+        crawler, response = self.get_crawler()
+        if not crawler:
+            return response
+
+        start_time = time.time()
+        try:
+            await crawler.run_async()
+        except Exception as E:
+            response.add_error(f"Exception when running crawler {E}")
+
+        end_time = time.time()
+
+        return self.get_crawler_response(crawler, end_time - start_time)
+
+    def get_crawler(self):
+        """
+        Returns crawler prepared for request, and default response
+        """
         response = PageResponseObject(
             self.url,
             text=None,
@@ -327,28 +407,26 @@ class CrawlerCaller(object):
 
         if not self.request:
             response.add_error("No request")
-            return response
+            return None, response
 
         if not self.request.url:
             response.add_error("No request url")
-            return response
+            return None, response
 
         if not self.request.crawler_type:
             response.add_error("Url:{} No crawler in crawler data".format(self.url))
-            return response
+            return None, response
 
         crawler = self.request.crawler_type
 
         crawler.make_request(self.request)
 
-        start_time = time.time()
-        try:
-            crawler.run()
-        except Exception as E:
-            response.add_error(f"Exception when running crawler {E}")
-
-        end_time = time.time()
+        return crawler, response
 
+    def get_crawler_response(self, crawler, crawl_time_s):
+        """
+        Returns response of finished crawler, closes crawler
+        """
         response = crawler.get_response()
         if response:
             response.set_request(self.request)
@@ -356,7 +434,7 @@ class CrawlerCaller(object):
                 for error in response.errors:
                     self.errors.append(error)
 
-            response.crawl_time_s = end_time - start_time
+            response.crawl_time_s = crawl_time_s
 
         try:
             crawler.close()
@@ -2,6 +2,8 @@
 Handler interface that can be implemented to provide more complex logic for reading meta data.
 """
 
+import asyncio
+
 from webtoolkit import DefaultContentPage, calculate_hash_binary, calculate_hash
 
 
@@ -128,12 +130,19 @@ class HandlerInterface(DefaultContentPage):
 
         return 0
 
-    def get_entries(self):
+    def get_entries(self, stop_condition=None):
         return []
 
     def get_response(self):
         raise NotImplementedError
 
+    async def get_response_async(self):
+        """
+        Obtains response from event loop. Handlers which make several requests
+        are run in a thread.
+        """
+        return await asyncio.to_thread(self.get_response)
+
     def get_channel_name(self):
         pass
 
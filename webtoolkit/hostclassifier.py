@@ -0,0 +1,210 @@
+"""
+Host classification. Tells if host is analytics, link service, mainstream etc.
+
+Each category is compiled into one alternation pattern. All categories of a host
+are computed in one pass, and cached.
+"""
+
+import re
+import threading
+
+from .utils.lrucache import LruCache
+
+
+HOST_CATEGORY_ANALYTICS = "analytics"
+HOST_CATEGORY_LINK_SERVICE = "link_service"
+HOST_CATEGORY_MAINSTREAM = "mainstream"
+HOST_CATEGORY_YOUTUBE = "youtube"
+
+HOST_CATEGORIES_CACHE_SIZE = 10000
+
+YOUTUBE_HOSTS = [
+    "youtube.com",
+    "youtu.be",
+    "www.m.youtube.com",
+    "m.youtube.com",
+    "www.youtube.com",
+]
+
+"""
+category -> rules
+ - contains, host contains text
+ - suffixes, host ends with text
+ - hosts, host is equal to text
+"""
+DEFAULT_HOST_RULES = {
+    # Internet service links that cannot be useful to anyone.
+    # Internet infrastructure links.
+    HOST_CATEGORY_ANALYTICS: {
+        "contains": [
+            "adservice.google.com",
+            ".googleapis.com",
+            "googlesyndication",
+            ".googletagmanager.com",
+            "google-analytics",
+            "googletagservices",
+            "googleusercontent.com",
+            "gstatic.com",
+            "amazon-adsystem.com",
+            "amazonaws.com",
+            "static.ads-twitter.com",
+            "analytics.twitter.com",
+            "doubleverify.com",
+            "g.doubleclick.net",
+            "ad.doubleclick.net",
+            "goatcounter.com",
+            ".cookiebot.com",
+            "cloudfront.net",
+            ".smartadserver.com",
+            "ads.us.e-planning.net",
+            "static.cloudflareinsights.com",
+            "static1.squarespace.com",
+            "redditstatic.com",
+            "cdn.speedcurve.com",
+            "shopifycdn.com",
+        ],
+    },
+    # Url shorteners, which also do not directly lead to any page
+    HOST_CATEGORY_LINK_SERVICE: {
+        "contains": [
+            "lmg.gg",
+            "geni.us",
+            "tinyurl.com",
+            "bit.ly",
+            "ow.ly",
+            "adfoc.us",
+            "mailchi.mp",
+            "dbh.la",
+            "ffm.to",
+            "kit.co",
+            "utm.io",
+            "tiny.pl",
+            "reurl.cc",
+            # shortcuts
+            "amzn.to",
+        ],
+        "suffixes": [
+            "link.to",
+        ],
+    },
+    # wallet gardens which we will not accept
+    HOST_CATEGORY_MAINSTREAM: {
+        "contains": [
+            "www.facebook",
+            "www.rumble",
+            "wikipedia.org",
+            "twitter.com",
+            "www.reddit.com",
+            "stackoverflow.com",
+            "www.quora.com",
+            "www.instagram.com",
+        ],
+        "hosts": YOUTUBE_HOSTS,
+    },
+    HOST_CATEGORY_YOUTUBE: {
+        "hosts": YOUTUBE_HOSTS,
+    },
+}
+
+
+class HostClassifier(object):
+    """
+    HostClassifier.get().get_categories("www.youtube.com")
+    """
+
+    object = None  # singleton
+    lock = threading.Lock()
+
+    def get():
+        """
+        API - Returns shared classifier
+        """
+        if HostClassifier.object is None:
+            with HostClassifier.lock:
+                if HostClassifier.object is None:
+                    HostClassifier.object = HostClassifier()
+
+        return HostClassifier.object
+
+    def __init__(self, rules=None):
+        """
+        @param rules category -> rules. See DEFAULT_HOST_RULES
+        """
+        if rules is None:
+            rules = DEFAULT_HOST_RULES
+
+        self.rules = {}
+        for category, category_rules in rules.items():
+            self.rules[category] = {
+                "contains": list(category_rules.get("contains", [])),
+                "suffixes": list(category_rules.get("suffixes", [])),
+                "hosts": list(category_rules.get("hosts", [])),
+            }
+
+        self.cache = LruCache(HOST_CATEGORIES_CACHE_SIZE)
+        self.compile()
+
+    def add_rules(self, category, contains=None, suffixes=None, hosts=None):
+        """
+        API - Extends category rules. Category is created if it does not exist
+        """
+        category_rules = self.rules.setdefault(
+            category, {"contains": [], "suffixes": [], "hosts": []}
+        )
+        category_rules["contains"].extend(contains or [])
+        category_rules["suffixes"].extend(suffixes or [])
+        category_rules["hosts"].extend(hosts or [])
+
+        self.compile()
+
+    def compile(self):
+        """
+        Builds matchers for all categories, drops cached results
+        """
+        matchers = []
+        for category, category_rules in self.rules.items():
+            pattern = None
+            if category_rules["contains"]:
+                pattern = re.compile(
+                    "|".join(re.escape(text) for text in category_rules["contains"])
+                )
+            matchers.append(
+                (
+                    category,
+                    pattern,
+                    tuple(category_rules["suffixes"]),
+                    frozenset(category_rules["hosts"]),
+                )
+            )
+
+        self.matchers = matchers
+        self.cache.clear()
+
+    def get_categories(self, host):
+        """
+        Returns frozenset of categories of host
+        """
+        if not host:
+            return frozenset()
+
+        categories = self.cache.get(host)
+        if categories is None:
+            categories = self.get_categories_implementation(host)
+            self.cache.set(host, categories)
+
+        return categories
+
+    def get_categories_implementation(self, host):
+        categories = set()
+        for category, pattern, suffixes, hosts in self.matchers:
+            if host in hosts:
+                categories.add(category)
+            elif suffixes and host.endswith(suffixes):
+                categories.add(category)
+            elif pattern is not None and pattern.search(host):
+                categories.add(category)
+
+        return frozenset(categories)
+
+    def is_category(self, host, category):
+        return category in self.get_categories(host)
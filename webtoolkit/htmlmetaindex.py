@@ -0,0 +1,266 @@
+"""
+Single pass HTML metadata index.
+
+The document is tokenized once by lxml. Parser events are used to fill
+lookup tables for <meta>, <link>, <title>, <html lang>, itemprop and og:* values.
+No tree is built.
+
+In head only mode only bytes up to </head> are tokenized.
+
+libxml2 drops CDATA sections, so they are replaced by escaped text before
+tokenizing, the way BeautifulSoup returns their text.
+"""
+
+import html
+import re
+import lxml.etree as ET
+
+from .webtools import WebLogger
+
+
+HEAD_END_PATTERN = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+# scripts are raw text for the parser, CDATA inside them is left as is
+CDATA_PATTERN = re.compile(
+    r"(<script\b.*?</script\s*>)|<!\[CDATA\[(.*?)\]\]>", re.IGNORECASE | re.DOTALL
+)
+
+
+class HtmlMetaIndex(object):
+    """
+    lxml parser target, that collects page metadata.
+
+    Lookups mimic BeautifulSoup 'find' semantics - first element in document
+    order wins.
+    """
+
+    def __init__(self):
+        self.language = None
+        self.charset = None
+
+        # attributes of all <meta> elements, in document order
+        self.metas = []
+        # (attribute name, attribute value) -> attributes of first <meta>
+        self.meta_index = {}
+
+        # attributes of all <link> elements, in document order
+        self.links = []
+        # rel token -> list of <link> attributes
+        self.links_by_rel = {}
+
+        # tag name -> string of first element with that tag
+        self.strings = {}
+
+        # itemprop -> value of first element with that itemprop
+        self.schema = {}
+        # (itemtype, itemprop) -> attributes of first nested itemprop element
+        self.schema_scoped = {}
+
+        self.stack = []
+        self.text_collectors = []
+
+    def parse(contents, head_only=False):
+        """
+        Returns index for contents
+        @param head_only if true, only <head> is indexed
+        """
+        if head_only:
+            contents = HtmlMetaIndex.get_head(contents)
+
+        index = HtmlMetaIndex()
+        index.feed(contents)
+        index.close()
+        return index
+
+    def get_head(contents):
+        """
+        Returns contents up to, and including </head>.
+        If there is no </head>, contents before <body> are returned.
+        """
+        if not contents:
+            return contents
+
+        match = HEAD_END_PATTERN.search(contents)
+        if not match:
+            return contents
+
+        if match.group(0)[1] == "/":
+            return contents[: match.end()]
+        return contents[: match.start()]
+
+    def feed(self, contents):
+        if not contents:
+            return
+
+        contents = HtmlMetaIndex.replace_cdata(contents)
+
+        if not hasattr(self, "parser"):
+            self.parser = ET.HTMLParser(
+                target=self, recover=True, no_network=True, huge_tree=True
+            )
+
+        try:
+            self.parser.feed(contents)
+        except Exception as E:
+            WebLogger.exc(E, "HtmlMetaIndex: cannot parse contents")
+
+    def replace_cdata(contents):
+        """
+        Returns contents with CDATA sections replaced by escaped text
+        """
+        if not isinstance(contents, str) or contents.find("<![CDATA[") == -1:
+            return contents
+
+        return CDATA_PATTERN.sub(HtmlMetaIndex.replace_cdata_match, contents)
+
+    def replace_cdata_match(match):
+        if match.group(1) is not None:
+            return match.group(1)
+        return html.escape(match.group(2), quote=False)
+
+    def close(self):
+        """
+        Called by us, and by lxml, when parser is closed
+        """
+        parser = self.__dict__.pop("parser", None)
+        if parser is not None:
+            try:
+                parser.close()
+            except Exception as E:
+                WebLogger.exc(E, "HtmlMetaIndex: cannot close parser")
+
+        while self.stack:
+            self.end(self.stack[-1][0])
+
+    def start(self, tag, attrib):
+        attrs = dict(attrib)
+
+        # first child element means element has no simple string
+        if self.stack:
+            parent = self.stack[-1]
+            if parent[2] is not None:
+                parent[2] = None
+                self.strings[parent[0]] = None
+
+        string_parts = None
+        if tag not in self.strings:
+            self.strings[tag] = None
+            string_parts = []
+
+        text_parts = None
+
+        itemprop = attrs.get("itemprop")
+        if itemprop is not None:
+            self.on_itemprop(tag, attrs, itemprop)
+
+            if itemprop not in self.schema and tag != "link" and tag != "meta":
+                self.schema[itemprop] = None
+                text_parts = []
+                self.text_collectors.append(text_parts)
+
+        if tag == "meta":
+            self.on_meta(attrs)
+        elif tag == "link":
+            self.on_link(attrs)
+        elif tag == "html":
+            if self.language is None and "lang" in attrs:
+                self.language = attrs["lang"]
+
+        self.stack.append([tag, attrs, string_parts, text_parts, itemprop])
+
+    def end(self, tag):
+        if not self.stack:
+            return
+
+        tag, attrs, string_parts, text_parts, itemprop = self.stack.pop()
+
+        if string_parts is not None:
+            value = "".join(string_parts)
+            if value != "":
+                self.strings[tag] = value
+
+        if text_parts is not None:
+            self.text_collectors.remove(text_parts)
+            text = "".join(text_parts)
+            self.schema[itemprop] = text.strip() if text else None
+
+    def data(self, data):
+        if self.stack:
+            string_parts = self.stack[-1][2]
+            if string_parts is not None:
+                string_parts.append(data)
+
+        for text_parts in self.text_collectors:
+            text_parts.append(data)
+
+    def on_meta(self, attrs):
+        self.metas.append(attrs)
+
+        for key, value in attrs.items():
+            if key != "content":
+                self.meta_index.setdefault((key, value), attrs)
+
+        if self.charset is None:
+            self.charset = HtmlMetaIndex.get_meta_charset(attrs)
+
+    def on_link(self, attrs):
+        self.links.append(attrs)
+
+        rel = attrs.get("rel")
+        if rel:
+            rels = set(rel.split())
+            rels.add(rel)
+            for item in rels:
+                self.links_by_rel.setdefault(item, []).append(attrs)
+
+    def on_itemprop(self, tag, attrs, itemprop):
+        if itemprop not in self.schema:
+            if tag == "link":
+                self.schema[itemprop] = attrs.get("href")
+            elif tag == "meta":
+                self.schema[itemprop] = attrs.get("content")
+
+        for item in self.stack:
+            itemtype = item[1].get("itemtype")
+            if itemtype is not None:
+                self.schema_scoped.setdefault((itemtype, itemprop), attrs)
+
+    def get_meta_charset(attrs):
+        for attr in attrs:
+            if attr.lower() == "charset":
+                return attrs[attr]
+            if attr.lower() == "http-equiv":
+                if "content" in attrs:
+                    text = attrs["content"].lower()
+                    wh = text.find("charset")
+                    if wh >= 0:
+                        wh2 = text.find("=", wh)
+                        if wh2 >= 0:
+                            return text[wh2 + 1 :].strip()
+
+    def get_string(self, tag):
+        return self.strings.get(tag)
+
+    def get_meta(self, field_type, field):
+        """
+        Returns attributes of first <meta> with field_type=field
+        """
+        return self.meta_index.get((field_type, field))
+
+    def get_metas(self, field_type, field):
+        result = []
+        for attrs in self.metas:
+            if attrs.get(field_type) == field:
+                result.append(attrs)
+        return result
+
+    def get_links(self, rel):
+        """
+        Returns attributes of all <link> elements with rel
+        """
+        return self.links_by_rel.get(rel, [])
+
+    def get_schema(self, itemprop):
+        return self.schema.get(itemprop)
+
+    def get_schema_scoped(self, itemtype, itemprop):
+        return self.schema_scoped.get((itemtype, itemprop))
@@ -0,0 +1,295 @@
+"""
+Columnar link set, for bulk link filtering.
+
+Links are parsed once, into columns of scheme, extension and host key.
+Values that depend only on the host (web link check, host categories, domain) are
+computed once per host. Filters are column operations.
+"""
+
+import re
+
+from .urllocation import (
+    UrlLocation,
+    BINARY_EXTENSIONS,
+    EXT_TYPE_MAPPING,
+    guess_mime_type,
+)
+from .hostclassifier import HOST_CATEGORY_ANALYTICS, HOST_CATEGORY_LINK_SERVICE
+from .webtools import URL_TYPE_HTML, URL_TYPE_FILE, URL_TYPE_UNKNOWN
+
+
+LOCATION_END_PATTERN = re.compile(r"[/\\?#]")
+ARGUMENT_PATTERN = re.compile(r"[?#]")
+
+HTML_EXTENSIONS = ("html", "htm", "php", "aspx")
+# extensions with known type, that is not HTML
+NOT_HTML_EXTENSIONS = ("css", "js", "woff2", "tff", "mobi", "zip")
+
+
+class LinkTable(object):
+    """
+    Link set parsed into columns.
+
+    Results are the same as UrlLocation checks performed on each link.
+    """
+
+    def __init__(self, links):
+        self.links = []
+        self.schemes = []
+        self.exts = []
+
+        # link prefix, up to the end of host, None for links without protocol
+        self.host_keys = []
+        # host key -> (is web link, host categories, domain)
+        self.host_info = {}
+
+        for link in links:
+            self.add(link)
+
+    def add(self, link):
+        scheme, host_key = LinkTable.parse_link(link)
+
+        self.links.append(link)
+        self.schemes.append(scheme)
+        self.exts.append(LinkTable.get_ext(link))
+        self.host_keys.append(host_key)
+
+    def parse_link(link):
+        """
+        Splits link the way UrlLocation.parse_url does.
+        @returns (scheme, host key)
+        """
+        protocol_pos = link.find("://")
+        if protocol_pos >= 0:
+            scheme = link[:protocol_pos].lower()
+            start = protocol_pos + 3
+        elif link.startswith("//") or link.startswith("\\\\"):
+            scheme = ""
+            start = 2
+        else:
+            return None, None
+
+        location_end = LOCATION_END_PATTERN.search(link, start)
+        end = location_end.start() if location_end else len(link)
+
+        return scheme, link[:end]
+
+    def get_ext(link):
+        """
+        The same as UrlLocation.get_page_ext, for links that are not domains
+        """
+        argument = ARGUMENT_PATTERN.search(link)
+        if argument:
+            link = link[: argument.start()]
+
+        if link.endswith("/"):
+            link = link[:-1]
+
+        wh = link.rfind(".")
+        if wh >= 0:
+            ext = link[wh + 1 :]
+            if len(ext) < 5:
+                return ext
+
+    def get_host_info(self, index):
+        host_key = self.host_keys[index]
+        if host_key is None:
+            location = UrlLocation(self.links[index])
+            return (
+                location.is_web_link(),
+                location.get_host_categories(),
+                location.get_domain().url,
+            )
+
+        info = self.host_info.get(host_key)
+        if info is None:
+            location = UrlLocation(host_key)
+            info = (
+                location.is_web_link(),
+                location.get_host_categories(),
+                location.get_domain().url,
+            )
+            self.host_info[host_key] = info
+
+        return info
+
+    def is_web_link(self, index):
+        return self.get_host_info(index)[0]
+
+    def is_analytics(self, index):
+        return HOST_CATEGORY_ANALYTICS in self.get_host_info(index)[1]
+
+    def is_link_service(self, index):
+        return HOST_CATEGORY_LINK_SERVICE in self.get_host_info(index)[1]
+
+    def is_domain(self, index):
+        """
+        The same as UrlLocation.is_domain
+        """
+        link = self.links[index]
+        if not link:
+            return False
+
+        domain = self.get_domain(index)
+        if domain and domain.endswith(".onion"):
+            return False
+
+        full_url = link
+        if link.lower().find("http") == -1:
+            full_url = "https://" + link
+        return full_url == domain
+
+    def is_webpage_link(self, index):
+        """
+        The same as UrlLocation.is_webpage_link
+        """
+        is_web_link, categories, domain = self.get_host_info(index)
+        if not is_web_link or HOST_CATEGORY_ANALYTICS in categories:
+            return False
+
+        link = self.links[index]
+        if link.endswith("/"):
+            return True
+
+        ext = self.exts[index]
+        if ext is None or ext in HTML_EXTENSIONS:
+            return True
+
+        if domain and domain.endswith(".onion"):
+            return True
+
+        full_url = link
+        if link.lower().find("http") == -1:
+            full_url = "https://" + link
+        if full_url == domain:
+            return True
+
+        if ext in NOT_HTML_EXTENSIONS:
+            return False
+
+        mime_type = guess_mime_type(link)
+        if mime_type is None:
+            return False
+        return mime_type.lower().find("html") >= 0
+
+    def get_domain(self, index):
+        return self.get_host_info(index)[2]
+
+    def get_scheme(self, index):
+        """
+        The same as UrlLocation.get_scheme
+        """
+        scheme = self.schemes[index]
+        if scheme is None:
+            return UrlLocation(self.links[index]).get_scheme()
+        return scheme
+
+    def get_mime_type(self, index):
+        """
+        The same as UrlLocation.guess_type
+        """
+        if self.is_domain(index) or self.is_analytics(index):
+            return ""
+
+        mime_type = guess_mime_type(self.links[index])
+        if mime_type is None:
+            return ""
+        return mime_type.lower()
+
+    def get_media_kind(self, index):
+        """
+        Returns "image", "audio", "video", or None
+        """
+        if self.is_domain(index) or not self.exts[index]:
+            return
+
+        mime_type = self.get_mime_type(index)
+        for kind in ("image", "audio", "video"):
+            if mime_type.find(kind) >= 0:
+                return kind
+
+    def get_type(self, index):
+        """
+        The same as UrlLocation.get_type
+        """
+        if self.is_domain(index):
+            return URL_TYPE_HTML
+
+        domain = self.get_domain(index)
+        if domain and domain.endswith(".onion"):
+            return URL_TYPE_HTML
+
+        ext = self.exts[index]
+        if not ext:
+            return URL_TYPE_HTML
+
+        is_analytics = self.is_analytics(index)
+        if not is_analytics and ext in EXT_TYPE_MAPPING:
+            return EXT_TYPE_MAPPING[ext]
+
+        if self.get_mime_type(index).find("html") >= 0:
+            return URL_TYPE_HTML
+
+        if self.get_media_kind(index):
+            return URL_TYPE_FILE
+        if not is_analytics and ext in BINARY_EXTENSIONS:
+            return URL_TYPE_FILE
+
+        return URL_TYPE_UNKNOWN
+
+    def classify(self):
+        """
+        Returns list of maps, one for each link, in links order
+        """
+        result = []
+        for index, link in enumerate(self.links):
+            result.append(
+                {
+                    "link": link,
+                    "domain": self.get_domain(index),
+                    "scheme": self.get_scheme(index),
+                    "type": self.get_type(index),
+                    "is_web_link": self.is_web_link(index),
+                    "is_webpage_link": self.is_webpage_link(index),
+                    "media": self.get_media_kind(index),
+                    "is_analytics": self.is_analytics(index),
+                    "is_link_service": self.is_link_service(index),
+                }
+            )
+        return result
+
+    def classify_many(urls):
+        """
+        API - Returns classification maps of URLs, see classify
+        """
+        return LinkTable(urls).classify()
+
+    def filter_html(self):
+        """
+        Returns links that are potentially webpages
+        """
+        result = set()
+        for index, link in enumerate(self.links):
+            if self.is_webpage_link(index):
+                result.add(link)
+        return result
+
+    def get_domains(self):
+        """
+        Returns domains of web links
+        """
+        result = set()
+        for index in range(len(self.links)):
+            is_web_link, categories, domain = self.get_host_info(index)
+            if not is_web_link:
+                continue
+            if domain is None or domain == "":
+                continue
+            if domain == "http://" or domain == "https://":
+                continue
+            if domain == "ftp://" or domain == "smb://":
+                continue
+
+            result.add(domain)
+
+        return result
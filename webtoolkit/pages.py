@@ -7,6 +7,7 @@ import json
 from dateutil import parser
 from brutefeedparser import BruteFeedParser
 import html
+import re
 import lxml.etree as ET
 
 from .utils.dateutils import DateUtils
@@ -17,8 +18,21 @@ from .webtools import (
     date_str_to_date,
 )
 from .urllocation import UrlLocation
-from .contentinterface import ContentInterface
+from .contentinterface import ContentInterface, memoized
 from .contentlinkparser import ContentLinkParser
+from .htmlmetaindex import HtmlMetaIndex
+from .feedstream import FeedStream
+
+
+PAGE_TYPE_HTML = "html"
+PAGE_TYPE_RSS = "rss"
+PAGE_TYPE_OPML = "opml"
+PAGE_TYPE_JSON = "json"
+PAGE_TYPE_TEXT = "text"
+
+# how many characters are checked, when recognizing page type
+SNIFF_SIZE = 8192
+SNIFF_TAG_PATTERN = re.compile(r"<(!--.*?-->|![^>]*>|\?.*?\?>|[a-z][\w:.-]*)", re.S)
 
 
 class DefaultContentPage(ContentInterface):
@@ -174,10 +188,14 @@ class RssPageEntry(ContentInterface):
         feedparser provide empty links
         Trying to work around that issue.
 
-        RSS can have <entry, or <item things inside
+        RSS can have <entry, or <item things inside.
 
-        TODO this should be parsed using beautiful soup
+        Entry element is checked, if available. Raw contents are scanned otherwise.
         """
+        element = getattr(self.feed_entry, "root", None)
+        if element is not None:
+            return FeedStream.get_link(element)
+
         contents = self.contents
 
         item_search_wh = contents.find("<item", 0)
@@ -213,15 +231,18 @@ class RssPageEntry(ContentInterface):
 
         return text
 
+    @memoized
     def get_title(self) -> str | None:
         return self.feed_entry.title
 
+    @memoized
     def get_description(self) -> str | None:
         if hasattr(self.feed_entry, "description"):
             return self.feed_entry.description
         else:
             return ""
 
+    @memoized
     def get_thumbnail(self) -> str | None:
         if hasattr(self.feed_entry, "media_thumbnail"):
             if len(self.feed_entry.media_thumbnail) > 0:
@@ -247,10 +268,12 @@ class RssPageEntry(ContentInterface):
 
         return None
 
+    @memoized
     def get_language(self) -> str | None:
         if "language" in self.page_object_properties:
             return self.page_object_properties["language"]
 
+    @memoized
     def get_date_published(self):
         date = self.get_date_published_implementation()
 
@@ -284,6 +307,7 @@ class RssPageEntry(ContentInterface):
                     )
                 return DateUtils.get_datetime_now_utc()
 
+    @memoized
     def get_author(self) -> str | None:
         author = None
         if not author and hasattr(self.feed_entry, "author"):
@@ -297,6 +321,7 @@ class RssPageEntry(ContentInterface):
     def get_album(self) -> str | None:
         return ""
 
+    @memoized
     def get_tags(self):
         if "tags" in self.feed_entry:
             return self.feed_entry.tags
@@ -310,16 +335,39 @@ class RssPage(ContentInterface):
     """
 
     def __init__(self, url, contents):
-        """Constructor"""
-        self.feed = None
+        """
+        Constructor.
+        Feed is parsed when it is needed. Entries are streamed, see get_entries.
+        """
+        self.feed_data = None
+        self.feed_parsed = False
 
         """
         Workaround for https://warhammer-community.com/feed
         """
         super().__init__(url=url, contents=contents)
 
-        if self.contents and not self.feed:
-            self.process_contents()
+    @property
+    def feed(self):
+        """
+        Fully parsed feed
+        """
+        if not self.feed_parsed:
+            self.feed_parsed = True
+            if self.contents:
+                self.process_contents()
+
+        return self.feed_data
+
+    @feed.setter
+    def feed(self, feed):
+        self.feed_data = feed
+        self.feed_parsed = True
+
+    def clear_cache(self):
+        super().clear_cache()
+        self.feed_data = None
+        self.feed_parsed = False
 
     def process_contents(self):
         self.try_to_parse()
@@ -357,25 +405,63 @@ class RssPage(ContentInterface):
 
         self.try_to_parse()
 
-    def get_entries(self):
-        if self.feed is None:
+    def get_entries(self, stop_condition=None):
+        """
+        Yields entry property maps.
+        @param stop_condition FeedStopCondition. Stops at first already seen entry
+        """
+        if not self.contents:
             return
 
         try:
-            for item in self.get_container_elements_maps():
+            for item in self.get_container_elements_maps(stop_condition):
                 yield item
 
         except Exception as E:
             WebLogger.exc(E, "Url:{}. RSS parsing error".format(self.url))
 
-    def get_container_elements_maps(self):
-        parent_properties = {}
+    def get_feed_entries(self, parent_properties, stop_condition=None):
+        """
+        Yields feed entries.
+
+        If feed has not been parsed yet, entries are streamed, one at a time.
+        Otherwise already parsed entries are used.
+        @param parent_properties filled with channel properties before first entry
+        @param stop_condition FeedStopCondition
+        """
+        if not self.feed_parsed:
+            stream = FeedStream(self.contents)
+            for feed_entry in stream.get_entries(stop_condition):
+                if not parent_properties:
+                    parent_properties["language"] = stream.feed.language
+                    parent_properties["author"] = stream.feed.author
+
+                yield feed_entry
+
+            if stream.entries_count > 0 or stream.stopped:
+                return
+
+        # falls back to full parse, which handles escaped RSS in HTML
+        if self.feed is None:
+            return
+
         parent_properties["language"] = self.get_language()
         parent_properties["author"] = self.get_author()
 
+        for feed_entry in self.feed.entries:
+            if stop_condition and stop_condition.is_seen(feed_entry.root):
+                return
+
+            yield feed_entry
+
+    def get_container_elements_maps(self, stop_condition=None):
+        parent_properties = {}
+
         contents = self.get_contents()
 
-        for feed_index, feed_entry in enumerate(self.feed.entries):
+        for feed_index, feed_entry in enumerate(
+            self.get_feed_entries(parent_properties, stop_condition)
+        ):
             rss_entry = RssPageEntry(
                 feed_index,
                 feed_entry,
@@ -421,6 +507,7 @@ class RssPage(ContentInterface):
         if entries:
             return calculate_hash(entries)
 
+    @memoized
     def get_title(self) -> str | None:
         if self.feed is None:
             return
@@ -428,6 +515,7 @@ class RssPage(ContentInterface):
         if "title" in self.feed.feed:
             return self.feed.feed.title
 
+    @memoized
     def get_description(self) -> str | None:
         if self.feed is None:
             return
@@ -442,6 +530,7 @@ class RssPage(ContentInterface):
         if "link" in self.feed.feed:
             return self.feed.feed.link
 
+    @memoized
     def get_language(self) -> str | None:
         if self.feed is None:
             return
@@ -449,6 +538,7 @@ class RssPage(ContentInterface):
         if "language" in self.feed.feed:
             return self.feed.feed.language
 
+    @memoized
     def get_thumbnail(self) -> str | None:
         if self.feed is None:
             return
@@ -492,6 +582,7 @@ class RssPage(ContentInterface):
 
         return image
 
+    @memoized
     def get_author(self) -> str | None:
         if self.feed is None:
             return
@@ -505,6 +596,7 @@ class RssPage(ContentInterface):
 
         return None
 
+    @memoized
     def get_date_published(self):
         if self.feed is None:
             return
@@ -512,6 +604,7 @@ class RssPage(ContentInterface):
         if "published" in self.feed.feed:
             return date_str_to_date(self.feed.feed.published)
 
+    @memoized
     def get_tags(self):
         if self.feed is None:
             return
@@ -527,14 +620,15 @@ class RssPage(ContentInterface):
         return props
 
     def is_valid(self) -> bool:
-        if self.feed and len(self.feed.entries) > 0:
-            return True
-
+        # cheap checks first, they do not require parsing
         if self.get_contents().find("<feed") >= 0:
             return True
         if self.get_contents().find("<rss") >= 0:
             return True
 
+        if self.feed and len(self.feed.entries) > 0:
+            return True
+
         # if not self.is_contents_rss():
         #     return False
 
@@ -712,79 +806,79 @@ class HtmlPage(ContentInterface):
     href="/images/facebook.png"
     href="//images/facebook.png"
     href="https://images/facebook.png"
+
+    In head only mode metadata is read only from <head>. Body is parsed
+    only when needed, by get_body_text, get_body_hash, get_links.
     """
 
-    def __init__(self, url, contents):
+    def __init__(self, url, contents, head_only=False):
         """Constructor"""
         super().__init__(url=url, contents=contents)
 
-        if self.contents:
+        self.head_only = head_only
+
+    def clear_cache(self):
+        super().clear_cache()
+        self.index = None
+        self.soup = None
+
+    def get_index(self):
+        """
+        Returns metadata index. Document is scanned only once, on first use.
+        """
+        if self.index is None:
+            self.index = HtmlMetaIndex.parse(self.contents, head_only=self.head_only)
+
+        return self.index
+
+    def get_soup(self):
+        """
+        Returns full document tree. Built only if page body is needed.
+        """
+        if self.soup is None and self.contents:
             try:
                 self.soup = BeautifulSoup(self.contents, "html.parser")
             except Exception as E:
                 WebLogger.exc(E, "Contents type:{}".format(type(self.contents)))
                 self.contents = None
                 self.soup = None
-        else:
-            self.soup = None
+
+        return self.soup
 
     def get_head_field(self, field):
         if not self.contents:
             return None
 
-        found_element = self.soup.find(field)
-        if found_element:
-            value = found_element.string
-            if value != "":
-                return value
+        return self.get_index().get_string(field)
 
     def get_meta_custom_field(self, field_type, field):
         if not self.contents:
             return None
 
-        find_element = self.soup.find("meta", attrs={field_type: field})
-        if find_element and find_element.has_attr("content"):
-            return find_element["content"]
+        attrs = self.get_index().get_meta(field_type, field)
+        if attrs and "content" in attrs:
+            return attrs["content"]
 
     def get_schema_field(self, itemprop):
         """
         @param itemprop can be "url" or similar
         """
-        elements_with_itemprop = self.soup.find_all(attrs={"itemprop": True})
-        for element in elements_with_itemprop:
-            itemprop_v = element.get("itemprop")
-            if itemprop_v != itemprop:
-                continue
-
-            if element.name == "link":
-                value = element.get("href")
-            elif element.name == "meta":
-                value = element.get("content")
-            else:
-                value = element.text.strip() if element.text else None
+        if not self.contents:
+            return None
 
-            return value
+        return self.get_index().get_schema(itemprop)
 
     def get_schema_field_ex(self, itemtype, itemprop, field):
         """
         @param itemtype example "http://schema.org/VideoObject"
         @param itemprop can be "url" or similar
         """
-        # Find elements with itemtype
-        print("searching")
-        soup_objects = self.soup.find_all(attrs={"itemtype": itemtype})
-        for soup_object in soup_objects:
-            # Extract itemprop from elements inside soup_object
-            elements_with_itemprop = soup_object.find_all(attrs={"itemprop": True})
-            for element in elements_with_itemprop:
-                itemprop_v = element.get("itemprop")
-
-                if itemprop_v != itemprop:
-                    continue
-
-                value = element.get(field)
+        if not self.contents:
+            return None
 
-                return value
+        attrs = self.get_index().get_schema_scoped(itemtype, itemprop)
+        if attrs:
+            return attrs.get(field)
 
     def get_meta_field(self, field):
         if not self.contents:
@@ -796,9 +890,7 @@ class HtmlPage(ContentInterface):
         if not self.contents:
             return None
 
-        field_find = self.soup.find("meta", property="{}".format(name))
-        if field_find and field_find.has_attr("content"):
-            return field_find["content"]
+        return self.get_meta_custom_field("property", name)
 
     def get_og_field(self, name):
         """
@@ -809,6 +901,7 @@ class HtmlPage(ContentInterface):
 
         return self.get_property_field("og:{}".format(name))
 
+    @memoized
     def get_title(self):
         if not self.contents:
             return None
@@ -833,6 +926,7 @@ class HtmlPage(ContentInterface):
         return title
         # title = html.unescape(title)
 
+    @memoized
     def get_date_published(self):
         """
         There could be multiple places to read published time.
@@ -865,6 +959,7 @@ class HtmlPage(ContentInterface):
 
         return self.get_meta_field("title")
 
+    @memoized
     def get_description(self):
         if not self.contents:
             return None
@@ -903,6 +998,7 @@ class HtmlPage(ContentInterface):
 
         return self.get_meta_field("description")
 
+    @memoized
     def get_thumbnail(self):
         if not self.contents:
             return None
@@ -923,13 +1019,14 @@ class HtmlPage(ContentInterface):
 
         return image
 
+    @memoized
     def get_language(self):
         if not self.contents:
             return ""
 
-        html = self.soup.find("html")
-        if html and html.has_attr("lang"):
-            return html["lang"]
+        language = self.get_index().language
+        if language:
+            return language
 
         locale = self.get_og_locale()
         if locale:
@@ -937,27 +1034,14 @@ class HtmlPage(ContentInterface):
 
         return ""
 
+    @memoized
     def get_charset(self):
         if not self.contents:
             return None
 
-        charset = None
-
-        allmeta = self.soup.findAll("meta")
-        for meta in allmeta:
-            for attr in meta.attrs:
-                if attr.lower() == "charset":
-                    return meta.attrs[attr]
-                if attr.lower() == "http-equiv":
-                    if "content" in meta.attrs:
-                        text = meta.attrs["content"].lower()
-                        wh = text.find("charset")
-                        if wh >= 0:
-                            wh2 = text.find("=", wh)
-                            if wh2 >= 0:
-                                charset = text[wh2 + 1 :].strip()
-                                return charset
+        return self.get_index().charset
 
+    @memoized
     def get_author(self):
         """
         <head><author>Something</author></head>
@@ -974,37 +1058,24 @@ class HtmlPage(ContentInterface):
     def get_album(self):
         return None
 
+    @memoized
     def get_favicons(self, recursive=False):
         if not self.contents:
             return {}
 
         favicons = {}
 
-        link_finds = self.soup.find_all("link", attrs={"rel": "icon"})
-
-        for link_find in link_finds:
-            if link_find and link_find.has_attr("href"):
-                full_favicon = link_find["href"]
-                if full_favicon.strip() == "":
-                    continue
-                full_favicon = UrlLocation.get_url_for_domain(self.url, full_favicon)
-                if "sizes" in link_find:
-                    favicons[full_favicon] = link_find["sizes"]
-                else:
-                    favicons[full_favicon] = ""
-
-        link_finds = self.soup.find_all("link", attrs={"rel": "shortcut icon"})
+        index = self.get_index()
+        link_finds = index.get_links("icon") + index.get_links("shortcut icon")
 
         for link_find in link_finds:
-            if link_find and link_find.has_attr("href"):
+            if "href" in link_find:
                 full_favicon = link_find["href"]
                 if full_favicon.strip() == "":
                     continue
                 full_favicon = UrlLocation.get_url_for_domain(self.url, full_favicon)
-                if "sizes" in link_find:
-                    favicons[full_favicon] = link_find["sizes"]
-                else:
-                    favicons[full_favicon] = ""
+                if full_favicon not in favicons:
+                    favicons[full_favicon] = link_find.get("sizes", "")
 
         return favicons
 
@@ -1013,6 +1084,7 @@ class HtmlPage(ContentInterface):
         for favicon in favicons:
             return favicon
 
+    @memoized
     def get_tags(self):
         if not self.contents:
             return None
@@ -1023,20 +1095,24 @@ class HtmlPage(ContentInterface):
 
         tags = ""
         #tag = self.get_og_field("og:video:tag")
-        elements = self.soup.find_all("meta", property="og:video:tag")
+        elements = self.get_index().get_metas("property", "og:video:tag")
         for element in elements:
-            if element.name == "meta":
-                value = element.get("content")
-                if tags:
-                    tags += f",{value}"
-                else:
-                    tags += str(value)
+            value = element.get("content")
+            if tags:
+                tags += f",{value}"
+            else:
+                tags += str(value)
 
         return tags
 
+    @memoized
     def get_canonical_url(self):
-        canonical_tag = self.soup.find("link", rel="canonical")
-        if canonical_tag:
+        if not self.contents:
+            return None
+
+        canonical_tags = self.get_index().get_links("canonical")
+        if canonical_tags:
+            canonical_tag = canonical_tags[0]
             canonical_link = canonical_tag.get("href")
             if canonical_link and canonical_link.endswith("/"):
                 return canonical_link[:-1]
@@ -1062,6 +1138,7 @@ class HtmlPage(ContentInterface):
         if urls and len(urls) > 0:
             return urls[0]
 
+    @memoized
     def get_feeds(self):
         if not self.contents:
             return []
@@ -1087,12 +1164,12 @@ class HtmlPage(ContentInterface):
     def find_feed_links(self, feed_type):
         result_links = []
 
-        found_elements = self.soup.find_all("link")
+        found_elements = self.get_index().links
         for found_element in found_elements:
-            if found_element.has_attr("type"):
+            if "type" in found_element:
                 link_type = str(found_element["type"])
                 if link_type.find(feed_type) >= 0:
-                    if found_element.has_attr("href"):
+                    if "href" in found_element:
                         result_links.append(found_element["href"])
                     else:
                         WebLogger.error(
@@ -1105,9 +1182,7 @@ class HtmlPage(ContentInterface):
 
     def get_links(self):
         p = ContentLinkParser(self.url, self.contents)
-        links = p.get_links()
-        links = ContentLinkParser.filter_link_html(links)
-        return links
+        return p.get_links_html()
 
     def get_links_inner(self):
         p = ContentLinkParser(self.url, self.contents)
@@ -1253,7 +1328,11 @@ class HtmlPage(ContentInterface):
         if not self.contents:
             return
 
-        body_find = self.soup.find("body")
+        soup = self.get_soup()
+        if not soup:
+            return
+
+        body_find = soup.find("body")
         if not body_find:
             return
 
@@ -1282,10 +1361,13 @@ class HtmlPage(ContentInterface):
             return True
 
     def get_pwa_manifest(self):
-        link_finds = self.soup.find_all("link", attrs={"rel": "manifest"})
+        if not self.contents:
+            return None
+
+        link_finds = self.get_index().get_links("manifest")
 
         for link_find in link_finds:
-            if link_find and link_find.has_attr("href"):
+            if "href" in link_find:
                 manifest_path = link_find["href"]
 
                 return manifest_path
@@ -1330,11 +1412,14 @@ class PageFactory(object):
     Page factory that produces page object from response / contents.
     """
 
-    def get(response, contents):
+    def get(response, contents, head_only=False):
         """
         Note: some servers might return text/html for RSS sources.
               We must manually check what kind of data it is.
-              For speed - we check first what is suggested by content-type
+              For speed - we sniff contents first. If contents type is
+              recognized, only one page object is created.
+
+        @param head_only passed to HtmlPage
         """
         contents = None
         if response and response.get_text():
@@ -1345,91 +1430,127 @@ class PageFactory(object):
 
         url = response.request_url
 
-        if response.is_html():
-            p = HtmlPage(url, contents)
-            if p.is_valid():
-                return p
+        if response.is_content_type("image"):
+            return
+        if response.is_content_type("audio"):
+            return
+        if response.is_content_type("video"):
+            return
+        if response.is_content_type("font"):
+            return
 
-            p = RssPage(url, contents)
-            if p.is_valid():
-                return p
+        page_type = PageFactory.sniff(contents)
 
-            p = OpmlPage(url, contents)
-            if p.is_valid():
-                return p
+        # HTML can wrap feeds. Trust server in that case
+        if page_type == PAGE_TYPE_HTML and response.is_rss():
+            page_type = None
 
-            p = JsonPage(url, contents)
-            if p.is_valid():
-                return p
+        if page_type == PAGE_TYPE_TEXT:
+            return DefaultContentPage(url, contents)
 
-        if response.is_rss():
-            p = RssPage(url, contents)
+        sniffed_type = page_type
+        if sniffed_type:
+            p = PageFactory.get_page(sniffed_type, url, contents, head_only)
             if p.is_valid():
                 return p
 
-            p = OpmlPage(url, contents)
-            if p.is_valid():
-                return p
+        # we do not know what it is, or sniffing was wrong (text starting with '{').
+        # Guess, starting from suggested content-type
 
-            p = HtmlPage(url, contents)
-            if p.is_valid():
-                return p
+        for page_type in PageFactory.get_page_types(response):
+            if page_type == sniffed_type:
+                continue
 
-            p = JsonPage(url, contents)
+            p = PageFactory.get_page(page_type, url, contents, head_only)
             if p.is_valid():
                 return p
 
+        # TODO not really sure it is implemented
+        # p = XmlPage(url, contents)
+        # if p.is_valid():
+        #    return p
+
+        p = DefaultContentPage(url, contents)
+        return p
+
+    def get_page(page_type, url, contents, head_only=False):
+        if page_type == PAGE_TYPE_HTML:
+            return HtmlPage(url, contents, head_only=head_only)
+        if page_type == PAGE_TYPE_RSS:
+            return RssPage(url, contents)
+        if page_type == PAGE_TYPE_OPML:
+            return OpmlPage(url, contents)
+        if page_type == PAGE_TYPE_JSON:
+            return JsonPage(url, contents)
+
+        return DefaultContentPage(url, contents)
+
+    def get_page_types(response):
+        """
+        Returns order in which page types are checked
+        """
+        if response.is_html():
+            return [PAGE_TYPE_HTML, PAGE_TYPE_RSS, PAGE_TYPE_OPML, PAGE_TYPE_JSON]
+
+        if response.is_rss():
+            return [PAGE_TYPE_RSS, PAGE_TYPE_OPML, PAGE_TYPE_HTML, PAGE_TYPE_JSON]
+
         if response.is_json():
-            p = JsonPage(url, contents)
-            if p.is_valid():
-                return p
+            return [PAGE_TYPE_JSON, PAGE_TYPE_RSS, PAGE_TYPE_HTML, PAGE_TYPE_OPML]
 
-            p = RssPage(url, contents)
-            if p.is_valid():
-                return p
+        return [PAGE_TYPE_HTML, PAGE_TYPE_RSS, PAGE_TYPE_OPML, PAGE_TYPE_JSON]
 
-            p = HtmlPage(url, contents)
-            if p.is_valid():
-                return p
+    def sniff(contents):
+        """
+        Recognizes page type by looking only at beginning of contents.
+        Checks BOM, XML prolog, root tag, leading '{' or '['.
 
-        if response.is_content_type("image"):
-            return
-        if response.is_content_type("audio"):
-            return
-        if response.is_content_type("video"):
+        @returns page type, or None if contents are ambiguous
+        """
+        if not contents:
             return
-        if response.is_content_type("font"):
+
+        window = contents[:SNIFF_SIZE]
+        if isinstance(window, bytes):
+            window = window.decode("utf-8", errors="ignore")
+
+        window = window.lstrip("\ufeff \t\r\n")
+        if window == "":
             return
 
-        # we do not know what it is. Guess
+        if window[0] == "{" or window[0] == "[":
+            return PAGE_TYPE_JSON
 
-        p = HtmlPage(url, contents)
-        if p.is_valid():
-            return p
+        if window.find("<") == -1:
+            return PAGE_TYPE_TEXT
 
-        p = RssPage(url, contents)
-        if p.is_valid():
-            return p
+        lower = window.lower()
 
-        p = OpmlPage(url, contents)
-        if p.is_valid():
-            return p
+        root = None
+        for match in SNIFF_TAG_PATTERN.finditer(lower):
+            tag = match.group(1)
+            if tag.startswith("!doctype"):
+                if tag.find("html") >= 0:
+                    root = "html"
+                    break
+                continue
+            if tag.startswith("!") or tag.startswith("?"):
+                continue
 
-        p = JsonPage(url, contents)
-        if p.is_valid():
-            return p
+            root = tag
+            break
 
-        # TODO not really sure it is implemented
-        # p = XmlPage(url, contents)
-        # if p.is_valid():
-        #    return p
+        if root in ("rss", "feed", "rdf:rdf", "rdf"):
+            return PAGE_TYPE_RSS
 
-        if response.is_text():
-            p = DefaultContentPage(url, contents)
-            return p
+        if root == "opml":
+            return PAGE_TYPE_OPML
 
-        p = DefaultContentPage(url, contents)
-        return p
+        if root in ("html", "head", "body"):
+            for rss_tag in ("<rss", "<feed", "<rdf", "&lt;rss"):
+                if lower.find(rss_tag) >= 0:
+                    return
+            return PAGE_TYPE_HTML
 
 
 class YouTubeVideoJson(object):
@@ -16,6 +16,7 @@ from .response import (
     json_to_response,
     response_to_json,
 )
+from .crawlers.sessionpool import SessionPool
 
 
 class RemoteServer(object):
@@ -166,7 +167,8 @@ class RemoteServer(object):
         print(f"Remote server: Calling {link_call}")
 
         try:
-            with requests.get(url=link_call, timeout=timeout_s, verify=False) as result:
+            session = SessionPool.get().get_session(verify=False)
+            with session.get(url=link_call, timeout=timeout_s, verify=False) as result:
                 text = result.text
         except Exception as E:
             print("Remote error. " + str(E))
@@ -199,7 +201,8 @@ class RemoteServer(object):
 
     def is_remote_server_ok(link_call):
         try:
-            with requests.get(url=link_call, timeout=timeout_s, verify=False) as result:
+            session = SessionPool.get().get_session(verify=False)
+            with session.get(url=link_call, timeout=timeout_s, verify=False) as result:
                 return result.status_code == 200
         except Exception as E:
             return False
@@ -282,7 +285,8 @@ class RemoteServer(object):
         timeout_s = 10
 
         try:
-            with requests.get(url=link, timeout=timeout_s, verify=False) as result:
+            session = SessionPool.get().get_session(verify=False)
+            with session.get(url=link, timeout=timeout_s, verify=False) as result:
                 text = result.text
         except Exception as E:
             print("Remote error. " + str(E))
@@ -330,7 +334,8 @@ class RemoteServer(object):
 
         link_call = f"{remote_server}/set"
         try:
-            r = requests.post(url=link_call,
+            session = SessionPool.get().get_session(verify=False)
+            r = session.post(url=link_call,
                           timeout=timeout_s,
                           verify=False,
                           json=response_json,
@@ -361,7 +366,8 @@ class RemoteServer(object):
         if handler_name:
             params["handler_name"] = handler_name
 
-        with requests.get(link_call, params=params) as response:
+        session = SessionPool.get().get_session()
+        with session.get(link_call, params=params) as response:
             if response.status_code == 200:
                 try:
                     data = response.json()
@@ -204,9 +204,10 @@ class RemoteUrl(ContentInterface):
         if response:
             return response.status_code
 
-    def get_entries(self):
+    def get_entries(self, stop_condition=None):
         """
         Retrieves the entries from the URL's properties.
+        :param stop_condition: FeedStopCondition. Entries from the first seen one are dropped.
         :return: A list of entries, or an empty list if not available.
         """
         entries = RemoteServer.read_properties_section("Entries", self.all_properties)
@@ -218,6 +219,9 @@ class RemoteUrl(ContentInterface):
                         entries[index]["date_published"] = date_str_to_date(
                             date_published
                         )
+
+                if stop_condition and stop_condition.is_seen_properties(entry):
+                    return entries[:index]
             return entries
         return []
 
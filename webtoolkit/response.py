@@ -2,8 +2,12 @@
 Response API
 """
 
+import gzip
 import html
 import json
+import re
+import struct
+from io import BytesIO
 from pathlib import Path
 from collections import OrderedDict
 
@@ -22,6 +26,35 @@ from .utils.dateutils import DateUtils
 from .request import request_to_json, json_to_request
 
 
+# encoding has to be declared at the beginning of document
+ENCODING_SNIFF_BYTES = 4096
+BYTE_ORDER_MARKS = (
+    (b"\xef\xbb\xbf", "utf-8"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+XML_ENCODING_PATTERN = re.compile(
+    rb"""\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._:-]+)["']"""
+)
+# <meta charset="utf-8">, <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+META_CHARSET_PATTERN = re.compile(
+    rb"""<meta[^>]*?charset\s*=\s*["']?\s*([A-Za-z0-9._:-]+)""", re.IGNORECASE
+)
+
+
+RESPONSE_FORMAT_JSON = "json"
+RESPONSE_FORMAT_BINARY = "binary"
+
+COMPRESSION_NONE = 0
+COMPRESSION_GZIP = 1
+COMPRESSION_ZSTD = 2
+
+RESPONSE_BINARY_MAGIC = b"WTRESP"
+RESPONSE_BINARY_VERSION = 1
+# magic, version, compression, header length, body length
+RESPONSE_BINARY_PREFIX = struct.Struct("<6sBBIQ")
+
+
 class ResponseHeaders(object):
     """
     Response headers
@@ -203,6 +236,8 @@ class PageResponseObject(object):
         self.status_code = status_code
         self.request = None
         self.crawl_time_s = None
+        # number of body bytes received from network, as sent by server
+        self.bytes_transferred = None
         self.recognized_content_type = None
         self.body_hash = None
         self.is_allowed_internal = True
@@ -211,13 +246,13 @@ class PageResponseObject(object):
         if self.status_code is None:
             self.status_code = 0
 
-        self.binary = None
-        self.text = None
+        self._binary = None
+        self._text = None
 
         if binary:
-            self.binary = binary
+            self._binary = binary
         if text:
-            self.text = text
+            self._text = text
 
         # I read selenium always assume utf8 encoding
 
@@ -241,28 +276,97 @@ class PageResponseObject(object):
             self.encoding = "utf-8"
             self.apparent_encoding = "utf-8"
 
-        if self.binary and not self.text:
-            try:
-                self.text = self.binary.decode(self.encoding)
-            except Exception as E:
-                WebLogger.exc(E, "Cannot properly decode text from {}".format(self.url))
-                try:
-                    self.text = self.binary.decode(self.encoding, errors="ignore")
-                except Exception as E:
-                    WebLogger.exc(
-                        E,
-                        "Cannot properly decode text from {}, even with ignoring errors".format(
-                            self.url
-                        ),
-                    )
-                self.add_error("Cannot properly decode text from {}".format(self.url))
-
-        if self.text and not self.binary:
-            try:
-                self.binary = self.text.encode(self.encoding)
-            except Exception as E:
-                WebLogger.exc(E, "Cannot properly encode text from {}".format(self.url))
-                self.binary = self.text.encode(self.encoding, errors="ignore")
+        # one representation is kept, the other one is made when needed
+        self.decode_pending = bool(self._binary and not self._text)
+        self.encode_pending = bool(self._text and not self._binary)
+        # (loader, body type), body is read on first use
+        self.body_loader = None
+
+    @property
+    def text(self):
+        """
+        Text. Decoded from binary on first use
+        """
+        if self.body_loader:
+            self.load_body()
+
+        if self.decode_pending:
+            self.decode_pending = False
+            self._text = self.decode_binary(self._binary)
+
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        self.decode_pending = False
+        self._text = text
+
+    @property
+    def binary(self):
+        """
+        Binary. Encoded from text on first use
+        """
+        if self.body_loader:
+            self.load_body()
+
+        if self.encode_pending:
+            self.encode_pending = False
+            self._binary = self.encode_text(self._text)
+
+        return self._binary
+
+    @binary.setter
+    def binary(self, binary):
+        self.encode_pending = False
+        self._binary = binary
+
+    def set_body_loader(self, loader, body_type="binary"):
+        """
+        Body is read by loader on first use of text, or binary.
+        @param loader returns bytes-like object, for example memoryview
+        @param body_type "text" if body is UTF-8 text, "binary" otherwise
+        """
+        self.body_loader = (loader, body_type)
+
+    def load_body(self):
+        loader, body_type = self.body_loader
+        self.body_loader = None
+
+        body = loader()
+        if body_type == "text":
+            # decoded directly from buffer, without copy to bytes
+            self.text = str(body, "utf-8")
+            self.encode_pending = bool(self._text)
+        else:
+            self.binary = bytes(body)
+            self.decode_pending = bool(self._binary)
+
+        if isinstance(body, memoryview):
+            body.release()
+
+    def decode_binary(self, binary):
+        """
+        Characters which cannot be decoded are replaced, as requests does. Text is
+        decoded lazily, so decoding does not add errors to response
+        """
+        if not binary:
+            return
+
+        try:
+            return str(binary, self.encoding, errors="replace")
+        except LookupError:
+            # unknown encoding
+            return str(binary, "utf-8", errors="replace")
+
+    def encode_text(self, text):
+        if not text:
+            return
+
+        try:
+            return text.encode(self.encoding)
+        except Exception as E:
+            WebLogger.exc(E, "Cannot properly encode text from {}".format(self.url))
+            return text.encode(self.encoding, errors="ignore")
 
     def set_headers(self, headers):
         self.headers = ResponseHeaders(headers=headers)
@@ -341,6 +445,12 @@ class PageResponseObject(object):
         if content.lower().find("json") >= 0:
             return True
 
+    def get_bytes_transferred(self):
+        """
+        Returns number of body bytes received from network, or None if not known
+        """
+        return self.bytes_transferred
+
     def get_content_length(self):
         length = self.headers.get_content_length()
         if length is not None:
@@ -517,9 +627,32 @@ class PageResponseObject(object):
         return self.page
 
 
-def response_to_json(response, with_streams=False):
+def sniff_encoding(binary):
+    """
+    Returns encoding declared by contents: byte order mark, XML prolog, or HTML
+    meta charset. Only beginning of contents is checked, page is not parsed.
+    """
+    if not binary:
+        return
+
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if binary.startswith(bom):
+            return encoding
+
+    prolog = binary[:ENCODING_SNIFF_BYTES]
+
+    match = XML_ENCODING_PATTERN.match(prolog)
+    if not match:
+        match = META_CHARSET_PATTERN.search(prolog)
+
+    if match:
+        return match.group(1).decode("ascii").lower()
+
+
+def response_to_json(response, with_streams=False, with_body=True):
     """
     Converts response to JSON
+    @param with_body if False, text and binary are not included
     """
     response_data = OrderedDict()
 
@@ -538,6 +671,7 @@ def response_to_json(response, with_streams=False):
         )
 
         response_data["crawl_time_s"] = response.crawl_time_s
+        response_data["bytes_transferred"] = response.bytes_transferred
         response_data["Content-Type"] = response.get_content_type()
         response_data["Recognized-Content-Type"] = (
             response.get_recognized_content_type()
@@ -564,8 +698,9 @@ def response_to_json(response, with_streams=False):
             for error in response.errors:
                 response_data["errors"].append(error)
 
-        response_data["text"] = response.get_text()
-        response_data["binary"] = json_encode_field(response.get_binary())
+        if with_body:
+            response_data["text"] = response.get_text()
+            response_data["binary"] = json_encode_field(response.get_binary())
 
         if with_streams:
             response_data["streams"] = response.get_streams()
@@ -601,7 +736,7 @@ def json_to_response(json_data, with_streams=False):
     encoding = json_data.get("Charset")
     headers = json_data.get("headers")
 
-    if binary:
+    if binary and isinstance(binary, str):
         binary = json_decode_field(binary)
 
     response = PageResponseObject(
@@ -614,6 +749,8 @@ def json_to_response(json_data, with_streams=False):
         request_url=request_url,
     )
 
+    response.bytes_transferred = json_data.get("bytes_transferred")
+
     errors = json_data.get("errors")
     if errors:
         response.errors = errors
@@ -637,13 +774,129 @@ def json_to_response(json_data, with_streams=False):
     return response
 
 
-def response_to_file(response, file_name):
+def response_to_binary(response, compression=COMPRESSION_GZIP):
+    """
+    Converts response to binary container:
+     - fixed prefix: magic, version, compression, header length, body length
+     - header: JSON of response, without body
+     - body: compressed binary of response
+
+    @param compression COMPRESSION_GZIP, COMPRESSION_ZSTD (requires zstandard), or
+           COMPRESSION_NONE
+    """
+    if not response:
+        return
+
+    header = response_to_json(response, with_body=False)
+    header["stored_time"] = DateUtils.get_datetime_now_iso()
+
+    body = response.get_binary()
+    header["body_type"] = "binary"
+    if body is None:
+        text = response.get_text()
+        if text is not None:
+            body = text.encode("utf-8")
+            header["body_type"] = "text"
+        else:
+            header["body_type"] = None
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    body_bytes = compress_body(body or b"", compression)
+
+    prefix = RESPONSE_BINARY_PREFIX.pack(
+        RESPONSE_BINARY_MAGIC,
+        RESPONSE_BINARY_VERSION,
+        compression,
+        len(header_bytes),
+        len(body_bytes),
+    )
+
+    return prefix + header_bytes + body_bytes
+
+
+def binary_to_response(data, with_body=True):
+    """
+    Converts binary container to response object
+    @param with_body if False, body is not decompressed
+    """
+    if not data:
+        return
+
+    return read_binary_response(BytesIO(data), with_body=with_body)
+
+
+def is_binary_response(data):
+    """
+    Returns True if data starts as binary container
+    """
+    return data[: len(RESPONSE_BINARY_MAGIC)] == RESPONSE_BINARY_MAGIC
+
+
+def read_binary_response(fh, with_body=True):
+    """
+    Reads response from binary container file object. Body is read only if needed
+    """
+    prefix = fh.read(RESPONSE_BINARY_PREFIX.size)
+    if len(prefix) < RESPONSE_BINARY_PREFIX.size or not is_binary_response(prefix):
+        raise ValueError("Not a binary response")
+
+    magic, version, compression, header_length, body_length = (
+        RESPONSE_BINARY_PREFIX.unpack(prefix)
+    )
+    if version > RESPONSE_BINARY_VERSION:
+        raise ValueError("Unsupported binary response version:{}".format(version))
+
+    header = json.loads(fh.read(header_length).decode("utf-8"))
+
+    if with_body and header.get("body_type"):
+        body = decompress_body(fh.read(body_length), compression)
+        if header["body_type"] == "text":
+            header["text"] = body.decode("utf-8")
+        else:
+            header["binary"] = body
+
+    return json_to_response(header)
+
+
+def compress_body(body, compression):
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_GZIP:
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if compression == COMPRESSION_ZSTD:
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(body)
+
+    raise ValueError("Unsupported compression:{}".format(compression))
+
+
+def decompress_body(body, compression):
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_GZIP:
+        return gzip.decompress(body)
+    if compression == COMPRESSION_ZSTD:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(body)
+
+    raise ValueError("Unsupported compression:{}".format(compression))
+
+
+def response_to_file(response, file_name, file_format=RESPONSE_FORMAT_JSON):
     """
     Stores response in a file
+    @param file_format RESPONSE_FORMAT_JSON, or RESPONSE_FORMAT_BINARY
     """
     if not response:
         return
 
+    if file_format == RESPONSE_FORMAT_BINARY:
+        with open(file_name, "wb") as fh:
+            fh.write(response_to_binary(response))
+        return
+
     with open(file_name, "w") as fh:
         json_data = response_to_json(response)
         json_text = json.dumps(json_data)
@@ -651,16 +904,22 @@ def response_to_file(response, file_name):
         fh.write(json_text)
 
 
-def file_to_response(file_name):
+def file_to_response(file_name, with_body=True):
     """
-    Reads response from a file
+    Reads response from a file. Format is detected from contents.
+    @param with_body if False, body of binary format is not read
     """
     path = Path(file_name)
     if not path.exists():
         return
 
-    with open(file_name, "r") as fh:
-        json_text = fh.read()
+    with open(file_name, "rb") as fh:
+        if is_binary_response(fh.read(len(RESPONSE_BINARY_MAGIC))):
+            fh.seek(0)
+            return read_binary_response(fh, with_body=with_body)
+
+        fh.seek(0)
+        json_text = fh.read().decode("utf-8")
         json_data = json.loads(json_text)
 
         return json_to_response(json_data)
@@ -0,0 +1,171 @@
+"""
+Replay of responses stored by ResponseStore, for offline reprocessing.
+
+Segment files are memory mapped. Responses are created from index only, bodies are
+read from mapped segments when text, or binary is used.
+
+Only text of uncompressed segments (COMPRESSION_NONE) is decoded directly from
+mapped memory, without a copy. Compressed bodies are decompressed, binary bodies
+are copied to bytes. ResponseStore compresses with gzip by default.
+
+Replay can be sharded across processes.
+"""
+
+import json
+import mmap
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .response import json_to_response, decompress_body, COMPRESSION_NONE
+from .responsestore import ResponseStore
+
+
+class ResponseReplay(object):
+    """
+    replay = ResponseReplay("storage/responses")
+    for response in replay.get_responses():
+        print(response.get_title())
+    """
+
+    def __init__(self, directory):
+        """
+        @param directory directory of ResponseStore
+        """
+        self.directory = directory
+
+        index = ResponseStore.get_index_file_name(directory)
+        self.connection = sqlite3.connect(
+            Path(index).resolve().as_uri() + "?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        # segment -> mmap
+        self.maps = {}
+        self.closed = False
+
+    def get_length(self):
+        return self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get_responses(self, shard=0, shards=1):
+        """
+        Yields responses, in order of segments, so that segments are read sequentially.
+        Responses have to be used before replay is closed.
+
+        @param shard number of shard, from 0 to shards - 1
+        @param shards number of shards, responses are split by their index id
+        """
+        rows = self.connection.execute(
+            "SELECT responses.header, bodies.body_type, bodies.segment, "
+            "bodies.offset, bodies.length, bodies.compression "
+            "FROM responses LEFT JOIN bodies "
+            "ON responses.body_hash = bodies.body_hash "
+            "WHERE responses.id % ? = ? "
+            "ORDER BY bodies.segment, bodies.offset, responses.id",
+            (shards, shard),
+        )
+
+        for header, body_type, segment, offset, length, compression in rows:
+            response = json_to_response(json.loads(header))
+
+            if body_type is not None:
+                response.set_body_loader(
+                    self.get_loader(segment, offset, length, compression), body_type
+                )
+
+            yield response
+
+    def get_loader(self, segment, offset, length, compression):
+        def load():
+            view = self.get_view(segment, offset, length)
+            if compression == COMPRESSION_NONE:
+                return view
+
+            try:
+                return decompress_body(view, compression)
+            finally:
+                view.release()
+
+        return load
+
+    def get_view(self, segment, offset, length):
+        """
+        Returns memoryview of segment data, without copy.
+        Segment is mapped again, if data was appended after it was mapped.
+        @raises ValueError if replay is closed, or segment is shorter than body
+        """
+        if self.closed:
+            raise ValueError("ResponseReplay is closed, response body cannot be read")
+
+        end = offset + length
+
+        segment_map = self.maps.get(segment)
+        if segment_map is None or len(segment_map) < end:
+            segment_map = self.map_segment(segment)
+
+        if len(segment_map) < end:
+            raise ValueError(
+                "Segment {} is shorter than body: {} < {}".format(
+                    segment, len(segment_map), end
+                )
+            )
+
+        return memoryview(segment_map)[offset:end]
+
+    def map_segment(self, segment):
+        """
+        Maps segment file. Previous map is closed, if no view uses it
+        """
+        old_map = self.maps.pop(segment, None)
+        if old_map is not None:
+            try:
+                old_map.close()
+            except BufferError:
+                # view is still used, map is closed when it is released
+                pass
+
+        file_name = ResponseStore.get_segment_file_name(self.directory, segment)
+        with open(file_name, "rb") as fh:
+            segment_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.maps[segment] = segment_map
+        return segment_map
+
+    def map(self, function, processes=None, shards=None):
+        """
+        Calls function for each response, in a pool of processes.
+        Function has to be picklable, for example module level function.
+
+        @returns list of function results, grouped by shard
+        """
+        if shards is None:
+            shards = processes or 1
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = executor.map(
+                replay_shard,
+                [self.directory] * shards,
+                range(shards),
+                [shards] * shards,
+                [function] * shards,
+            )
+
+            return [result for shard_results in results for result in shard_results]
+
+    def close(self):
+        self.closed = True
+        for segment_map in self.maps.values():
+            segment_map.close()
+        self.maps = {}
+        self.connection.close()
+
+
+def replay_shard(directory, shard, shards, function):
+    """
+    Calls function for responses of one shard. Is run by process pool
+    """
+    replay = ResponseReplay(directory)
+    try:
+        return [function(response) for response in replay.get_responses(shard, shards)]
+    finally:
+        replay.close()
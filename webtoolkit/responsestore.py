@@ -0,0 +1,396 @@
+"""
+Content addressed response store.
+
+Bodies are keyed by their hash, identical bodies are stored once. Bodies are
+appended to segment files. An index, in a sqlite database, maps URL, and fetch time
+to response headers, and body hash.
+
+Bodies which are no longer referenced are removed by compaction, which rewrites
+segments.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .webtools import WebLogger, calculate_hash_binary
+from .response import (
+    response_to_json,
+    json_to_response,
+    compress_body,
+    decompress_body,
+    COMPRESSION_GZIP,
+)
+
+
+# new segment is started, when segment reaches this size
+SEGMENT_SIZE = 64 * 1024 * 1024
+# compaction is done when this part of segments data is not referenced
+COMPACTION_RATIO = 0.5
+
+
+class ResponseStore(object):
+    """
+    store = ResponseStore("storage/responses")
+    store.add(response)
+    response = store.get("https://example.com")
+    """
+
+    def __init__(
+        self,
+        directory,
+        segment_size=SEGMENT_SIZE,
+        compaction_ratio=COMPACTION_RATIO,
+        compression=COMPRESSION_GZIP,
+    ):
+        """
+        @param directory place of index, and segments. Is created if needed
+        @param compaction_ratio part of unreferenced data, which triggers compaction
+        """
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.compaction_ratio = compaction_ratio
+        self.compression = compression
+        self.lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(
+            str(ResponseStore.get_index_file_name(self.directory)),
+            check_same_thread=False,
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "id INTEGER PRIMARY KEY, "
+            "url TEXT, "
+            "fetch_time REAL, "
+            "status_code INTEGER, "
+            "body_hash BLOB, "
+            "header TEXT)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_url "
+            "ON responses (url, fetch_time)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            "body_hash BLOB PRIMARY KEY, "
+            "body_type TEXT, "
+            "segment INTEGER, "
+            "offset INTEGER, "
+            "length INTEGER, "
+            "compression INTEGER)"
+        )
+        self.connection.commit()
+
+        self.segment = self.get_last_segment()
+        self.segment_file = None
+
+    def add(self, response, fetch_time=None):
+        """
+        Stores response. Body is written only if it is not already stored.
+        @returns body hash, or None if response has no body
+        """
+        if fetch_time is None:
+            fetch_time = time.time()
+
+        body_hash, body_type, body = ResponseStore.get_body_data(response)
+
+        header = response_to_json(response, with_body=False)
+        header_text = json.dumps(header)
+
+        with self.lock:
+            if body_hash is not None and not self.has_body(body_hash):
+                self.write_body(body_hash, body_type, body)
+
+            self.connection.execute(
+                "INSERT INTO responses (url, fetch_time, status_code, body_hash, header) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    response.request_url or response.url,
+                    fetch_time,
+                    response.get_status_code(),
+                    body_hash,
+                    header_text,
+                ),
+            )
+            self.connection.commit()
+
+        return body_hash
+
+    def get_body_data(response):
+        """
+        Returns (body hash, body type, body).
+
+        Received bytes are stored as they are, binary responses are not decoded.
+        Only responses which have text, and no binary, are stored as UTF-8 text.
+        """
+        if response.body_loader:
+            response.load_body()
+
+        if not response.encode_pending:
+            binary = response.get_binary()
+            if binary:
+                return calculate_hash_binary(binary), "binary", binary
+
+        text = response.get_text()
+        if text:
+            return response.get_hash(), "text", text.encode("utf-8")
+
+        return None, None, None
+
+    def get(self, url, fetch_time=None, with_body=True):
+        """
+        Returns the latest response of URL, fetched at, or before fetch_time
+        """
+        if fetch_time is None:
+            fetch_time = float("inf")
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT header, body_hash FROM responses "
+                "WHERE url = ? AND fetch_time <= ? "
+                "ORDER BY fetch_time DESC, id DESC LIMIT 1",
+                (url, fetch_time),
+            ).fetchone()
+
+        if row is None:
+            return
+
+        header = json.loads(row[0])
+
+        body_hash = row[1]
+        if with_body and body_hash is not None:
+            body_type, body = self.get_body(body_hash)
+            if body_type == "text":
+                header["text"] = body.decode("utf-8")
+            elif body_type == "binary":
+                header["binary"] = body
+
+        return json_to_response(header)
+
+    def get_history(self, url):
+        """
+        Returns list of (fetch_time, status_code, body_hash) of URL, the oldest first
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT fetch_time, status_code, body_hash FROM responses "
+                "WHERE url = ? ORDER BY fetch_time, id",
+                (url,),
+            ).fetchall()
+
+    def has_body(self, body_hash):
+        """
+        Caller holds the lock
+        """
+        row = self.connection.execute(
+            "SELECT 1 FROM bodies WHERE body_hash = ?", (body_hash,)
+        ).fetchone()
+        return row is not None
+
+    def get_body(self, body_hash):
+        """
+        Returns (body type, body), or (None, None)
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT body_type, segment, offset, length, compression FROM bodies "
+                "WHERE body_hash = ?",
+                (body_hash,),
+            ).fetchone()
+
+            if row is None:
+                return None, None
+
+            body_type, segment, offset, length, compression = row
+            if self.segment_file is not None:
+                self.segment_file.flush()
+
+            with open(self.get_segment_path(segment), "rb") as fh:
+                fh.seek(offset)
+                data = fh.read(length)
+
+        return body_type, decompress_body(data, compression)
+
+    def write_body(self, body_hash, body_type, body):
+        """
+        Appends body to current segment. Caller holds the lock
+        """
+        data = compress_body(body or b"", self.compression)
+
+        segment_file = self.get_segment_file()
+        offset = segment_file.tell()
+        segment_file.write(data)
+        # index row may point only to data, which is on disk
+        self.sync_segment_file()
+
+        self.connection.execute(
+            "INSERT INTO bodies (body_hash, body_type, segment, offset, length, "
+            "compression) VALUES (?, ?, ?, ?, ?, ?)",
+            (body_hash, body_type, self.segment, offset, len(data), self.compression),
+        )
+
+    def get_segment_file(self):
+        """
+        Returns file of current segment. Starts new segment when it is full
+        """
+        if self.segment_file is not None and self.segment_file.tell() >= self.segment_size:
+            self.segment_file.close()
+            self.segment_file = None
+            self.segment += 1
+
+        if self.segment_file is None:
+            self.segment_file = open(self.get_segment_path(self.segment), "ab")
+
+        return self.segment_file
+
+    def sync_segment_file(self):
+        """
+        Writes buffered data of current segment to disk. Caller holds the lock
+        """
+        if self.segment_file is not None:
+            self.segment_file.flush()
+            os.fsync(self.segment_file.fileno())
+
+    def get_segment_path(self, segment):
+        return ResponseStore.get_segment_file_name(self.directory, segment)
+
+    def get_segment_file_name(directory, segment):
+        return Path(directory) / "segment-{:06d}.dat".format(segment)
+
+    def get_index_file_name(directory):
+        return Path(directory) / "index.db"
+
+    def get_segments(self):
+        """
+        Returns numbers of segment files
+        """
+        segments = []
+        for path in self.directory.glob("segment-*.dat"):
+            segments.append(int(path.stem.split("-")[1]))
+        return sorted(segments)
+
+    def get_last_segment(self):
+        segments = self.get_segments()
+        if segments:
+            return segments[-1]
+        return 1
+
+    def remove(self, url=None, before=None):
+        """
+        Removes responses of URL, or all responses. Bodies are removed by compaction
+        @param before only responses fetched before this time are removed
+        """
+        query = "DELETE FROM responses WHERE 1 = 1"
+        params = []
+        if url is not None:
+            query += " AND url = ?"
+            params.append(url)
+        if before is not None:
+            query += " AND fetch_time < ?"
+            params.append(before)
+
+        with self.lock:
+            self.connection.execute(query, params)
+            self.connection.commit()
+
+        if self.is_compaction_needed():
+            self.compact()
+
+    def get_statistics(self):
+        """
+        Returns numbers of responses, bodies, and bytes of segments
+        """
+        with self.lock:
+            responses = self.connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+            bodies, live_bytes = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM bodies "
+                "WHERE body_hash IN (SELECT body_hash FROM responses)"
+            ).fetchone()
+            if self.segment_file is not None:
+                self.segment_file.flush()
+
+            total_bytes = 0
+            for segment in self.get_segments():
+                total_bytes += self.get_segment_path(segment).stat().st_size
+
+        return {
+            "responses": responses,
+            "bodies": bodies,
+            "live_bytes": live_bytes,
+            "total_bytes": total_bytes,
+        }
+
+    def is_compaction_needed(self):
+        statistics = self.get_statistics()
+        total_bytes = statistics["total_bytes"]
+        if total_bytes == 0:
+            return False
+
+        dead_bytes = total_bytes - statistics["live_bytes"]
+        return dead_bytes / total_bytes >= self.compaction_ratio
+
+    def compact(self):
+        """
+        Rewrites referenced bodies into new segments, removes old segments
+        """
+        with self.lock:
+            if self.segment_file is not None:
+                self.segment_file.close()
+                self.segment_file = None
+
+            old_segments = self.get_segments()
+
+            rows = self.connection.execute(
+                "SELECT body_hash, segment, offset, length FROM bodies "
+                "WHERE body_hash IN (SELECT body_hash FROM responses) "
+                "ORDER BY segment, offset"
+            ).fetchall()
+
+            self.segment = self.get_last_segment() + 1
+
+            locations = []
+            for body_hash, segment, offset, length in rows:
+                with open(self.get_segment_path(segment), "rb") as fh:
+                    fh.seek(offset)
+                    data = fh.read(length)
+
+                segment_file = self.get_segment_file()
+                locations.append((self.segment, segment_file.tell(), body_hash))
+                segment_file.write(data)
+                if segment_file.tell() >= self.segment_size:
+                    self.sync_segment_file()
+
+            if self.segment_file is not None:
+                self.sync_segment_file()
+                self.segment_file.close()
+                self.segment_file = None
+
+            self.connection.execute(
+                "DELETE FROM bodies WHERE body_hash NOT IN "
+                "(SELECT body_hash FROM responses WHERE body_hash IS NOT NULL)"
+            )
+            self.connection.executemany(
+                "UPDATE bodies SET segment = ?, offset = ? WHERE body_hash = ?",
+                locations,
+            )
+            self.connection.commit()
+
+            for segment in old_segments:
+                try:
+                    self.get_segment_path(segment).unlink()
+                except OSError as E:
+                    WebLogger.exc(E, "ResponseStore: cannot remove segment")
+
+    def close(self):
+        with self.lock:
+            if self.segment_file is not None:
+                self.segment_file.close()
+                self.segment_file = None
+            self.connection.close()
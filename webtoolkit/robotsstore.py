@@ -0,0 +1,177 @@
+"""
+Persistent robots.txt store.
+
+Keeps robots.txt contents, fetch time, HTTP validators (ETag, Last-Modified) and
+sitemap URLs of domains in a sqlite database, so that they survive process restarts.
+
+Expired entries are still returned. They are revalidated in background threads.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .webtools import WebLogger
+
+
+ROBOTS_STORE_TTL = 24 * 60 * 60
+
+
+class RobotsStore(object):
+    """
+    store = RobotsStore("storage/robots.db")
+    entry = store.get("https://example.com")
+    """
+
+    def __init__(self, file_name, ttl=None):
+        """
+        @param file_name database file. Parent directories are created
+        @param ttl time after which entries are revalidated, in seconds
+        """
+        if ttl is None:
+            ttl = ROBOTS_STORE_TTL
+
+        self.file_name = file_name
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # domain -> revalidation thread
+        self.revalidations = {}
+
+        if str(file_name) != ":memory:":
+            Path(file_name).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(str(file_name), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS robots ("
+            "domain TEXT PRIMARY KEY, "
+            "contents TEXT, "
+            "status_code INTEGER, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "sitemaps TEXT, "
+            "fetch_time REAL)"
+        )
+        self.connection.commit()
+
+    def get(self, domain):
+        """
+        Returns entry map, or None.
+        Entry: domain, contents, status_code, etag, last_modified, sitemaps, fetch_time
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT domain, contents, status_code, etag, last_modified, sitemaps, "
+                "fetch_time FROM robots WHERE domain = ?",
+                (domain,),
+            ).fetchone()
+
+        if row is None:
+            return
+
+        sitemaps = None
+        if row[5] is not None:
+            sitemaps = json.loads(row[5])
+
+        return {
+            "domain": row[0],
+            "contents": row[1],
+            "status_code": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "sitemaps": sitemaps,
+            "fetch_time": row[6],
+        }
+
+    def set(
+        self,
+        domain,
+        contents,
+        status_code=None,
+        etag=None,
+        last_modified=None,
+        sitemaps=None,
+    ):
+        """
+        Stores robots.txt of domain. Fetch time is set to now
+        """
+        if sitemaps is not None:
+            sitemaps = json.dumps(list(sitemaps))
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO robots (domain, contents, status_code, etag, "
+                "last_modified, sitemaps, fetch_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    domain,
+                    contents,
+                    status_code,
+                    etag,
+                    last_modified,
+                    sitemaps,
+                    time.time(),
+                ),
+            )
+            self.connection.commit()
+
+    def touch(self, domain):
+        """
+        Marks entry as fetched now, for example when server returned 304 Not Modified
+        """
+        with self.lock:
+            self.connection.execute(
+                "UPDATE robots SET fetch_time = ? WHERE domain = ?",
+                (time.time(), domain),
+            )
+            self.connection.commit()
+
+    def remove(self, domain):
+        with self.lock:
+            self.connection.execute("DELETE FROM robots WHERE domain = ?", (domain,))
+            self.connection.commit()
+
+    def get_length(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM robots").fetchone()[0]
+
+    def is_expired(self, entry):
+        fetch_time = entry.get("fetch_time")
+        if fetch_time is None:
+            return True
+
+        return time.time() - fetch_time >= self.ttl
+
+    def revalidate(self, domain, function):
+        """
+        Calls function in a background thread. One revalidation per domain at a time.
+        @returns thread, or None if domain is already revalidated
+        """
+        with self.lock:
+            thread = self.revalidations.get(domain)
+            if thread is not None and thread.is_alive():
+                return
+
+            thread = threading.Thread(
+                target=self.revalidate_implementation,
+                args=(domain, function),
+                daemon=True,
+            )
+            self.revalidations[domain] = thread
+            thread.start()
+
+        return thread
+
+    def revalidate_implementation(self, domain, function):
+        try:
+            function()
+        except Exception as E:
+            WebLogger.exc(E, "RobotsStore: cannot revalidate {}".format(domain))
+        finally:
+            with self.lock:
+                if self.revalidations.get(domain) is threading.current_thread():
+                    del self.revalidations[domain]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
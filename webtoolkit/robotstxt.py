@@ -0,0 +1,272 @@
+"""
+robots.txt parser, and matcher.
+
+Implements https://www.rfc-editor.org/rfc/rfc9309 rules:
+ - "*" matches any sequence of characters, "$" matches end of path
+ - the longest matching rule wins, Allow wins a tie
+ - groups of the same user agent are merged
+
+Each group is compiled once, into one regular expression. A path is checked
+with one match call.
+
+Has the same API as urllib.robotparser.RobotFileParser: can_fetch, crawl_delay,
+request_rate, site_maps.
+"""
+
+import re
+from collections import namedtuple
+from urllib.parse import quote, unquote
+
+
+RequestRate = namedtuple("RequestRate", "requests seconds")
+
+# characters that do not need to be normalized in paths
+UNSAFE_PATH_PATTERN = re.compile(r"[^A-Za-z0-9\-._~/?=&*$:@!,;+'()]")
+REQUEST_RATE_PATTERN = re.compile(r"(\d+)\s*/\s*(\d+(?:\.\d+)?)\s*([smhd]?)")
+RATE_UNITS = {"": 1, "s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+class RobotsTxtGroup(object):
+    """
+    Rules of user agent group
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.crawl_delay = None
+        self.request_rate = None
+
+        # alternation of rules, the most important rule first
+        self.pattern = None
+        # allow of each alternative
+        self.allows = []
+
+    def add_rule(self, path, allow):
+        path = RobotsTxt.normalize_path(path)
+        if path:
+            self.rules.append((path, allow))
+
+    def compile(self):
+        """
+        Rules are ordered by length, Allow first. The first alternative that matches
+        is the rule that decides.
+        """
+        rules = sorted(set(self.rules), key=lambda rule: (-len(rule[0]), not rule[1]))
+
+        self.allows = [allow for path, allow in rules]
+        self.pattern = None
+        if rules:
+            self.pattern = re.compile(
+                "|".join(
+                    "({})".format(RobotsTxtGroup.get_expression(path))
+                    for path, allow in rules
+                )
+            )
+
+    def get_expression(path):
+        end = ""
+        if path.endswith("$"):
+            path = path[:-1]
+            end = "$"
+
+        parts = [re.escape(part) for part in path.split("*")]
+        return ".*".join(parts) + end
+
+    def is_allowed(self, path):
+        """
+        Returns True, False, or None if no rule matches
+        """
+        if self.pattern is None:
+            return
+
+        match = self.pattern.match(path)
+        if match:
+            return self.allows[match.lastindex - 1]
+
+
+class RobotsTxt(object):
+    """
+    robots = RobotsTxt(contents)
+    robots.can_fetch("*", "https://example.com/admin/")
+    """
+
+    def __init__(self, contents=None, url=None):
+        self.url = url
+        # user agent -> group
+        self.groups = {}
+        self.default_group = None
+        self.sitemaps = []
+        # user agent -> group
+        self.agent_groups = {}
+
+        if contents:
+            self.parse(contents.splitlines())
+
+    def set_url(self, url):
+        self.url = url
+
+    def parse(self, lines):
+        """
+        Reads robots.txt lines, compiles rules
+        """
+        groups = []
+        in_agents = False
+
+        for line in lines:
+            wh = line.find("#")
+            if wh >= 0:
+                line = line[:wh]
+
+            wh = line.find(":")
+            if wh == -1:
+                continue
+
+            field = line[:wh].strip().lower()
+            value = line[wh + 1 :].strip()
+
+            if field == "user-agent":
+                if not in_agents:
+                    groups = []
+                    in_agents = True
+
+                agent = value.split("/")[0].lower()
+                if agent:
+                    group = self.groups.get(agent)
+                    if group is None:
+                        group = RobotsTxtGroup()
+                        self.groups[agent] = group
+                    groups.append(group)
+                continue
+
+            if field == "sitemap":
+                if value:
+                    self.sitemaps.append(value)
+                continue
+
+            in_agents = False
+
+            for group in groups:
+                if field == "allow":
+                    group.add_rule(value, True)
+                elif field == "disallow":
+                    group.add_rule(value, False)
+                elif field == "crawl-delay":
+                    group.crawl_delay = RobotsTxt.parse_number(value)
+                elif field == "request-rate":
+                    group.request_rate = RobotsTxt.parse_request_rate(value)
+
+        for group in self.groups.values():
+            group.compile()
+
+        self.default_group = self.groups.get("*")
+        self.agent_groups = {}
+
+    def parse_number(value):
+        try:
+            number = float(value)
+        except ValueError:
+            return
+
+        if number.is_integer():
+            return int(number)
+        return number
+
+    def parse_request_rate(value):
+        match = REQUEST_RATE_PATTERN.match(value)
+        if not match:
+            return
+
+        requests = int(match.group(1))
+        seconds = float(match.group(2)) * RATE_UNITS[match.group(3)]
+        if seconds.is_integer():
+            seconds = int(seconds)
+
+        return RequestRate(requests, seconds)
+
+    def normalize_path(path):
+        """
+        Percent-encodes path the same way, whether it was encoded or not
+        """
+        if UNSAFE_PATH_PATTERN.search(path):
+            return quote(unquote(path), safe="/?=&*$:@!,;+'()~")
+        return path
+
+    def get_path(url):
+        """
+        Returns path, with query, of URL
+        """
+        wh = url.find("://")
+        if wh >= 0:
+            start = url.find("/", wh + 3)
+            query = url.find("?", wh + 3)
+            if query >= 0 and (start == -1 or query < start):
+                url = "/" + url[query:]
+            elif start >= 0:
+                url = url[start:]
+            else:
+                return "/"
+
+        wh = url.find("#")
+        if wh >= 0:
+            url = url[:wh]
+
+        if not url:
+            return "/"
+
+        return RobotsTxt.normalize_path(url)
+
+    def get_group(self, user_agent):
+        """
+        Returns group of user agent, the most specific one
+        """
+        group = self.agent_groups.get(user_agent)
+        if group is not None or user_agent in self.agent_groups:
+            return group
+
+        agent = user_agent.split("/")[0].lower()
+
+        group = self.groups.get(agent)
+        if group is None:
+            found = None
+            for name, candidate in self.groups.items():
+                if name != "*" and agent.find(name) >= 0:
+                    if found is None or len(name) > len(found):
+                        found = name
+                        group = candidate
+
+        if group is None:
+            group = self.default_group
+
+        self.agent_groups[user_agent] = group
+        return group
+
+    def can_fetch(self, user_agent, url):
+        path = RobotsTxt.get_path(url)
+        if path == "/robots.txt":
+            return True
+
+        group = self.get_group(user_agent)
+        if group is None:
+            return True
+
+        return group.is_allowed(path) is not False
+
+    def crawl_delay(self, user_agent):
+        """
+        Returns crawl delay in seconds, or None
+        """
+        group = self.get_group(user_agent)
+        if group is not None:
+            return group.crawl_delay
+
+    def request_rate(self, user_agent):
+        """
+        Returns RequestRate(requests, seconds), or None
+        """
+        group = self.get_group(user_agent)
+        if group is not None:
+            return group.request_rate
+
+    def site_maps(self):
+        if self.sitemaps:
+            return list(self.sitemaps)
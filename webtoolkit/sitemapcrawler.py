@@ -0,0 +1,183 @@
+"""
+Sitemap crawler.
+
+Walks sitemap indexes, https://www.sitemaps.org/protocol.html. Child sitemaps are
+fetched concurrently, by a bounded pool of threads. Sitemaps are parsed with a
+streaming XML parser, compressed (.xml.gz) sitemaps are supported.
+"""
+
+import gzip
+import zlib
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import lxml.etree as ET
+
+from .webtools import WebLogger
+from .feedstream import FeedStream
+from .request import copy_request
+
+
+SITEMAP_WORKERS = 8
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapCrawler(object):
+    """
+    crawler = SitemapCrawler(["https://example.com/sitemap.xml"], url_builder=BaseUrl)
+    for loc, lastmod in crawler.get_urls():
+        print(loc)
+    """
+
+    def __init__(
+        self,
+        sitemaps,
+        url_builder,
+        request=None,
+        max_workers=SITEMAP_WORKERS,
+        max_sitemaps=None,
+    ):
+        """
+        @param sitemaps URLs of sitemaps, or sitemap indexes
+        @param max_sitemaps maximum number of sitemaps to read. None - no limit
+        """
+        self.sitemaps = list(sitemaps)
+        self.url_builder = url_builder
+        self.request = request
+        self.max_workers = max_workers
+        self.max_sitemaps = max_sitemaps
+
+        # sitemaps which were, or are being read
+        self.visited = set()
+
+    def get_urls(self):
+        """
+        Yields (loc, lastmod) pairs of all pages. lastmod is text, or None
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = set()
+
+        try:
+            for sitemap in self.sitemaps:
+                self.submit(executor, futures, sitemap)
+
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    try:
+                        urls, children = future.result()
+                    except Exception as E:
+                        WebLogger.exc(E, "SitemapCrawler: cannot read sitemap")
+                        continue
+
+                    for child in children:
+                        self.submit(executor, futures, child)
+
+                    for url in urls:
+                        yield url
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, executor, futures, sitemap):
+        if not sitemap or sitemap in self.visited:
+            return
+        if self.max_sitemaps is not None and len(self.visited) >= self.max_sitemaps:
+            return
+
+        self.visited.add(sitemap)
+        futures.add(executor.submit(self.read_sitemap, sitemap))
+
+    def read_sitemap(self, sitemap):
+        """
+        Returns (urls, children), list of (loc, lastmod) pairs, and list of sitemaps
+        """
+        u = self.url_builder(sitemap, request=self.get_request(sitemap))
+        response = u.get_response()
+        if not response or not response.is_valid():
+            return [], []
+
+        contents = response.get_binary()
+        if not contents:
+            text = response.get_text()
+            if not text:
+                return [], []
+            contents = text.encode("utf-8")
+
+        return SitemapCrawler.parse(SitemapCrawler.decompress(contents))
+
+    def get_request(self, sitemap):
+        """
+        Returns request for sitemap. Request is not shared between threads
+        """
+        if not self.request:
+            return
+
+        request = copy_request(self.request)
+        request.url = sitemap
+        return request
+
+    def decompress(contents):
+        """
+        Returns uncompressed contents. Compression is recognized by contents,
+        servers often decompress .xml.gz files themselves
+        """
+        if not contents.startswith(GZIP_MAGIC):
+            return contents
+
+        try:
+            return gzip.decompress(contents)
+        except (OSError, EOFError, zlib.error) as E:
+            WebLogger.debug("SitemapCrawler: cannot decompress sitemap")
+            return b""
+
+    def parse(contents):
+        """
+        Returns (urls, children) of sitemap, or sitemap index contents
+        """
+        urls = []
+        children = []
+
+        if not contents:
+            return urls, children
+
+        context = ET.iterparse(
+            BytesIO(contents),
+            events=("end",),
+            recover=True,
+            huge_tree=True,
+        )
+
+        try:
+            for event, element in context:
+                name = FeedStream.get_local_name(element)
+                if name == "url":
+                    loc, lastmod = SitemapCrawler.get_entry(element)
+                    if loc:
+                        urls.append((loc, lastmod))
+                elif name == "sitemap":
+                    loc, lastmod = SitemapCrawler.get_entry(element)
+                    if loc:
+                        children.append(loc)
+                else:
+                    continue
+
+                FeedStream.release(element)
+        except ET.XMLSyntaxError as E:
+            WebLogger.debug("SitemapCrawler: cannot parse sitemap")
+
+        return urls, children
+
+    def get_entry(element):
+        """
+        Returns (loc, lastmod) of url, or sitemap element
+        """
+        loc = None
+        lastmod = None
+        for child in element:
+            name = FeedStream.get_local_name(child)
+            if name == "loc" and child.text:
+                loc = child.text.strip()
+            elif name == "lastmod" and child.text:
+                lastmod = child.text.strip()
+
+        return loc, lastmod
@@ -97,6 +97,18 @@ youtube_sitemap_sitemaps = """<?xml version='1.0' encoding='UTF-8'?>
 </sitemapindex>
 """
 
+youtube_sitemap_product_files = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url>
+        <loc>https://www.youtube.com/product/page-1</loc>
+        <lastmod>2024-04-03</lastmod>
+    </url>
+    <url>
+        <loc>https://www.youtube.com/product/page-2</loc>
+    </url>
+</urlset>
+"""
+
 youtube_sitemap_product = """<?xml version="1.0" encoding="UTF-8"?>
 <sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
     <sitemap>
@@ -2,6 +2,7 @@
 This module provides responses, fakes, mocks.
 """
 
+import gzip
 import logging
 import unittest
 import traceback
@@ -41,6 +42,7 @@ from webtoolkit.tests.fake.youtube import (
     youtube_robots_txt,
     youtube_sitemap_sitemaps,
     youtube_sitemap_product,
+    youtube_sitemap_product_files,
     webpage_youtube_airpano_feed,
     webpage_samtime_odysee,
     webpage_samtime_youtube_rss,
@@ -179,11 +181,20 @@ class TestResponseObject(PageResponseObject):
         self.set_text(url)
         self.set_binary(url)
 
+        if headers and headers.get("If-None-Match"):
+            if headers.get("If-None-Match") == self.headers.get("ETag"):
+                self.status_code = 304
+                self.text = None
+                self.binary = None
+
     def set_headers(self, url):
         headers = {}
         if url == "https://page-with-last-modified-header.com":
             headers["Last-Modified"] = "Wed, 03 Apr 2024 09:39:30 GMT"
 
+        elif url == "https://robots-txt.com/robots.txt":
+            headers["ETag"] = '"robots-txt-1"'
+
         elif url == "https://page-with-rss-link.com/feed":
             headers["Content-Type"] = "application/+rss"
 
@@ -576,6 +587,9 @@ class TestResponseObject(PageResponseObject):
         elif url.startswith("https://video"):
             text = url
             self.binary = text.encode("utf-8")
+        elif url.startswith("https://www.youtube.com/product/sitemap-files/"):
+            self.text = None
+            self.binary = gzip.compress(youtube_sitemap_product_files.encode("utf-8"))
 
     def get_contents_youtube_channel(self, url):
         if url.startswith("https://www.youtube.com/channel"):
@@ -0,0 +1,132 @@
+"""
+Removes tracking arguments from URLs.
+
+Uses url_cleaner rules. Rules are loaded once, per process. Host rules
+are indexed, only rules that can match a host are evaluated.
+"""
+
+import re
+import threading
+
+from url_cleaner import UrlCleaner, Url, Filter
+
+from .utils.lrucache import LruCache
+
+
+HOST_ANCHOR_PATTERN = re.compile(r"[a-zA-Z0-9\-]+")
+# host patterns, for which literal parts are known, like "google.com" or "google.*"
+SIMPLE_HOST_PATTERN = re.compile(r"[a-zA-Z0-9.\-]+(\.\*)?")
+HOST_RULES_CACHE_SIZE = 2000
+
+
+class TrackerCleaner(object):
+    """
+    TrackerCleaner.get().clean("https://example.com/?utm_source=x")
+
+    Results are the same as url_cleaner.UrlCleaner.clean.
+    """
+
+    object = None  # singleton
+    lock = threading.Lock()
+
+    def get():
+        """
+        API - Returns shared cleaner, rules are loaded when it is first used
+        """
+        if TrackerCleaner.object is None:
+            with TrackerCleaner.lock:
+                if TrackerCleaner.object is None:
+                    TrackerCleaner.object = TrackerCleaner()
+
+        return TrackerCleaner.object
+
+    def __init__(self, rules=None):
+        """
+        @param rules url_cleaner rules, host pattern -> rules. Package rules by default
+        """
+        if rules is None:
+            rules = UrlCleaner().ruler.rules
+
+        self.general_rules = list(rules.get("GENERAL", []))
+
+        # host patterns, in rules order
+        self.host_patterns = []
+        # anchor -> indexes of host patterns
+        self.anchors = {}
+        self.anchor_lengths = set()
+        # patterns without anchor, checked for every host
+        self.unanchored = []
+
+        for host_pattern, host_rules in rules.items():
+            if host_pattern == "GENERAL":
+                continue
+            self.add_host_pattern(host_pattern, host_rules)
+
+        self.host_rules_cache = LruCache(HOST_RULES_CACHE_SIZE)
+
+    def add_host_pattern(self, host_pattern, host_rules):
+        index = len(self.host_patterns)
+        self.host_patterns.append((re.compile(host_pattern), list(host_rules)))
+
+        # every literal part of pattern has to be in host, the longest is used as anchor
+        anchor = None
+        if SIMPLE_HOST_PATTERN.fullmatch(host_pattern):
+            for match in HOST_ANCHOR_PATTERN.finditer(host_pattern):
+                text = match.group(0)
+                if anchor is None or len(text) > len(anchor):
+                    anchor = text
+
+        if anchor:
+            self.anchors.setdefault(anchor, []).append(index)
+            self.anchor_lengths.add(len(anchor))
+        else:
+            self.unanchored.append(index)
+
+    def get_candidates(self, host):
+        """
+        Returns indexes of host patterns, which anchors are in host
+        """
+        candidates = set(self.unanchored)
+        host_length = len(host)
+
+        for length in self.anchor_lengths:
+            for start in range(0, host_length - length + 1):
+                indexes = self.anchors.get(host[start : start + length])
+                if indexes:
+                    candidates.update(indexes)
+
+        return sorted(candidates)
+
+    def get_host_rules(self, host):
+        """
+        Returns rules for host, in rules order
+        """
+        if not host:
+            return []
+
+        host_rules = self.host_rules_cache.get(host)
+        if host_rules is None:
+            host_rules = []
+            for index in self.get_candidates(host):
+                pattern, rules = self.host_patterns[index]
+                if pattern.search(host):
+                    host_rules.extend(rules)
+            self.host_rules_cache.set(host, host_rules)
+
+        return host_rules
+
+    def clean(self, url):
+        url_parsed = Url(url)
+
+        # only arguments are removed
+        if not url_parsed.query_dict:
+            return url_parsed.get_url()
+
+        rules = self.general_rules + self.get_host_rules(url_parsed.host)
+        return Filter(rules).filter_url(url_parsed)
+
+    def clean_many(self, urls):
+        """
+        Returns list of cleaned urls
+        """
+        return [self.clean(url) for url in urls]
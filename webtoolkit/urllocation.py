@@ -3,12 +3,20 @@ Internet location parsing and processing.
 """
 
 from urllib.parse import unquote, urlparse, parse_qs
+from functools import lru_cache
 import base64
 import mimetypes
 import ipaddress
 
-from url_cleaner import UrlCleaner
-
+from .utils.lrucache import LruCache
+from .trackercleaner import TrackerCleaner
+from .hostclassifier import (
+    HostClassifier,
+    HOST_CATEGORY_ANALYTICS,
+    HOST_CATEGORY_LINK_SERVICE,
+    HOST_CATEGORY_MAINSTREAM,
+    HOST_CATEGORY_YOUTUBE,
+)
 from .webtools import (
     URL_TYPE_RSS,
     URL_TYPE_CSS,
@@ -45,14 +53,143 @@ BINARY_EXTENSIONS = {
 }
 
 
+PROTOCOLLED_PREFIXES = (
+    "http://",
+    "https://",
+    "smb://",
+    "ftp://",
+    "email://",
+    "//",
+    "\\\\",
+)
+
+
+EXT_TYPE_MAPPING = {
+    "css": URL_TYPE_CSS,
+    "js": URL_TYPE_JAVASCRIPT,
+    "html": URL_TYPE_HTML,
+    "htm": URL_TYPE_HTML,
+    "php": URL_TYPE_HTML,
+    "aspx": URL_TYPE_HTML,
+    "woff2": URL_TYPE_FONT,
+    "tff": URL_TYPE_FONT,
+    "mobi": URL_TYPE_FILE,
+    "zip": URL_TYPE_FILE,
+}
+
+
+def guess_mime_type(url):
+    """
+    Returns mime type guessed by mimetypes, or None.
+
+    mimetypes uses only the end of the url, results are memoized by it.
+    """
+    if url.startswith("data:"):
+        return mimetypes.guess_type(url)[0]
+
+    return guess_mime_type_by_name(url[url.rfind("/") + 1 :])
+
+
+@lru_cache(maxsize=4096)
+def guess_mime_type_by_name(name):
+    if name.find(".") == -1:
+        return None
+
+    return mimetypes.guess_type(name)[0]
+
+
+# cleaned link cache
+CLEANED_LINK_CACHE_SIZE = 10000
+NOT_CACHED = object()
+
+# redirect fixers are used only for links that contain these
+REDIRECT_MARKERS = (
+    "https://www.google.com/url",
+    "https://www.google.com/amp/s",
+    "https://www.youtube.com/redirect",
+    "https://www.linkedin.com",
+    # bing, u= argument
+    "u=",
+)
+
+
+class UrlParts(object):
+    """
+    URL parsed by UrlLocation. URL is parsed once, accessors read parts.
+    """
+
+    __slots__ = (
+        "scheme",
+        "separator",
+        "netloc",
+        "host",
+        "segments",
+        "query",
+        "fragment",
+        "parts",
+        "domain",
+    )
+
+    def __init__(self, url, parts):
+        """
+        @param parts list returned by UrlLocation.parse_url
+        """
+        self.parts = tuple(parts)
+        self.scheme = parts[0]
+        self.separator = parts[1]
+        self.netloc = parts[2]
+        self.host = parts[2].lower()
+
+        wh = url.find("#")
+        self.fragment = url[wh + 1 :] if wh >= 0 else ""
+        no_fragment = url[:wh] if wh >= 0 else url
+
+        wh = no_fragment.find("?")
+        self.query = no_fragment[wh + 1 :] if wh >= 0 else ""
+
+        path = ""
+        if len(parts) > 3 and not parts[3].startswith("?") and not parts[3].startswith("#"):
+            path = parts[3]
+        self.segments = tuple(
+            segment for segment in path.replace("\\", "/").split("/") if segment
+        )
+
+        # domain url, computed when needed
+        self.domain = None
+
+
 class UrlLocation(object):
     """
     Internet location parsing and processing class.
+
+    URL is parsed once, when needed. Parse result is dropped if url changes.
     """
 
+    __slots__ = ("_url", "_parsed")
+
+    # process wide cache of cleaned links
+    cleaned_link_cache = LruCache(CLEANED_LINK_CACHE_SIZE)
+
     def __init__(self, url):
         self.url = url
 
+    @property
+    def url(self):
+        return self._url
+
+    @url.setter
+    def url(self, url):
+        self._url = url
+        self._parsed = None
+
+    def get_parsed(self):
+        """
+        Returns UrlParts, or None if there is no URL
+        """
+        if self._parsed is None and self._url:
+            self._parsed = UrlParts(self._url, self.parse_url_implementation())
+        return self._parsed
+
     def up(self, skip_internal=False):
         """
         Returns UrlLocation
@@ -146,22 +283,12 @@ class UrlLocation(object):
         """
         Returns information if link has a protocol indication
         """
-        if (
-            self.url.startswith("http://")
-            or self.url.startswith("https://")
-            or self.url.startswith("smb://")
-            or self.url.startswith("ftp://")
-            or self.url.startswith("email://")
-            or self.url.startswith("//")
-            or self.url.startswith("\\\\")
-        ):
-            return True
-        return False
+        return self.url.startswith(PROTOCOLLED_PREFIXES)
 
     def is_onion(self):
-        domain = self.get_domain()
-        if domain.url:
-            return domain.url.endswith(".onion")
+        domain = self.get_domain_url()
+        if domain:
+            return domain.endswith(".onion")
 
     def is_ipv4(self):
         try:
@@ -198,7 +325,7 @@ class UrlLocation(object):
             return False
 
         url = self.get_full_url()
-        if url == self.get_domain().url:
+        if url == self.get_domain_url():
             return True
 
         return False
@@ -264,7 +391,7 @@ class UrlLocation(object):
         if self.is_domain():
             return ""
 
-        mime_type, encoding = mimetypes.guess_type(self.url)
+        mime_type = guess_mime_type(self.url)
         if mime_type is None:
             return ""
 
@@ -313,8 +440,13 @@ class UrlLocation(object):
     def parse_url(self):
         """
         We cannot use urlparse, as it does not work with ftp:// or smb:// or win location
-        returns tuple [protocol, separator, url]
+        returns list [protocol, separator, url, ...]
         """
+        parsed = self.get_parsed()
+        if parsed:
+            return list(parsed.parts)
+
+    def parse_url_implementation(self):
         if not self.url:
             return
 
@@ -411,35 +543,49 @@ class UrlLocation(object):
 
         Returns UrlLocation
         """
-        if not self.url:
-            return UrlLocation(url=None)
+        return UrlLocation(self.get_domain_url(no_www))
 
-        parts = self.parse_url()
+    def get_domain_url(self, no_www=False):
+        """
+        for https://domain.com/test
+
+        @return https://domain.com, or None
+        """
+        parsed = self.get_parsed()
+        if not parsed:
+            return
+
+        if no_www:
+            return UrlLocation.get_domain_url_implementation(parsed, no_www)
+
+        if parsed.domain is None:
+            # empty string marks, that there is no domain
+            parsed.domain = UrlLocation.get_domain_url_implementation(parsed) or ""
+        return parsed.domain or None
 
-        wh = parts[2].find(":")
+    def get_domain_url_implementation(parsed, no_www=False):
+        domain_part = parsed.host
+        wh = domain_part.find(":")
         if wh >= 0:
-            parts[2] = parts[2][:wh]
+            domain_part = domain_part[:wh]
 
-        domain_part = parts[2].lower()
         if no_www and domain_part.find("www.") >= 0:
             domain_part = domain_part.replace("www.", "")
 
-        text = parts[0] + parts[1] + domain_part
+        text = parsed.scheme + parsed.separator + domain_part
 
-        x = UrlLocation(text)
-        if self.url and not x.is_protocolled_link():
-            return UrlLocation(url=None)
+        if not text.startswith(PROTOCOLLED_PREFIXES):
+            return
 
         if text.strip() == "http://" or text.strip() == "https://":
-            return UrlLocation(url=None)
+            return
 
         # if passed email, with user
         wh = text.find("@")
         if wh >= 0:
-            url = parts[0] + parts[1] + text[wh + 1 :]
-            return UrlLocation(url)
+            return parsed.scheme + parsed.separator + text[wh + 1 :]
 
-        return UrlLocation(text)
+        return text
 
     def get_domain_only(self, no_www=False):
         """
@@ -447,12 +593,9 @@ class UrlLocation(object):
 
         @return domain.com
         """
-        if not self.url:
-            return
-
-        parts = self.parse_url()
-        if parts:
-            domain_part = parts[2].lower()
+        parsed = self.get_parsed()
+        if parsed:
+            domain_part = parsed.host
             if no_www and domain_part.find("www.") >= 0:
                 domain_part = domain_part.replace("www.", "")
             return domain_part
@@ -461,26 +604,25 @@ class UrlLocation(object):
         """
         Returns scheme. For example "https"
         """
-        parts = self.parse_url()
-        if parts:
-            return parts[0]
+        parsed = self.get_parsed()
+        if parsed:
+            return parsed.scheme
 
     def get_page_ext(self):
         """
         @return extension, or none
         """
-        location = self.get_no_arg_link()
-
         # domain level does not say anything if it is HTML page, or not
         if self.is_domain():
             return
 
-        if location.url.endswith("/"):
-            location.url = location.url[:-1]
+        url = self.get_no_arg_url()
+        if url.endswith("/"):
+            url = url[:-1]
 
-        sp = location.url.split(".")
-        if len(sp) > 1:
-            ext = sp[-1]
+        wh = url.rfind(".")
+        if wh >= 0:
+            ext = url[wh + 1 :]
             if len(ext) < 5:
                 return ext
 
@@ -490,19 +632,25 @@ class UrlLocation(object):
 
         Returns UrlLocation
         """
-        if not self.url:
-            return UrlLocation(url=None)
+        return UrlLocation(self.get_no_arg_url())
 
+    def get_no_arg_url(self):
+        """
+        Returns url without arguments, and fragment
+        """
         url = self.url
-        if url.find("?") >= 0:
-            wh = url.find("?")
+        if not url:
+            return url
+
+        wh = url.find("?")
+        if wh >= 0:
             url = url[:wh]
 
-        if url.find("#") >= 0:
-            wh = url.find("#")
+        wh = url.find("#")
+        if wh >= 0:
             url = url[:wh]
 
-        return UrlLocation(url)
+        return url
 
     def get_clean(self):
         """
@@ -513,11 +661,32 @@ class UrlLocation(object):
 
     def get_cleaned_link(url):
         """
-        TODO remove?
+        Returns cleaned link. Results are cached.
         """
         if not url:
             return
 
+        cache = UrlLocation.cleaned_link_cache
+        link = cache.get(url, NOT_CACHED)
+        if link is NOT_CACHED:
+            link = UrlLocation.get_cleaned_link_implementation(url)
+            cache.set(url, link)
+
+        return link
+
+    def set_cleaned_link_cache_size(cache_size):
+        UrlLocation.cleaned_link_cache.set_size(cache_size)
+
+    def get_cleaned_link_statistics():
+        """
+        Returns hits, misses, hit rate, size of the cleaned link cache
+        """
+        return UrlLocation.cleaned_link_cache.get_statistics()
+
+    def get_cleaned_link_implementation(url):
+        if not url:
+            return
+
         url = url.strip()
 
         if url.endswith("/"):
@@ -542,15 +711,38 @@ class UrlLocation(object):
         if not url:
             return
 
-        url = UrlLocation.get_google_redirect_fix(url)
-        url = UrlLocation.get_google_redirect_fix2(url)
-        url = UrlLocation.get_youtube_redirect_fix(url)
-        url = UrlLocation.get_linkedin_redirect_fix(url)
-        url = UrlLocation.get_bing_redirect_fix(url)
+        if UrlLocation.is_redirect_candidate(url):
+            url = UrlLocation.get_google_redirect_fix(url)
+            url = UrlLocation.get_google_redirect_fix2(url)
+            url = UrlLocation.get_youtube_redirect_fix(url)
+            url = UrlLocation.get_linkedin_redirect_fix(url)
+            url = UrlLocation.get_bing_redirect_fix(url)
+
         url = UrlLocation.get_trackless_url(url)
 
         return url.url
 
+    def is_redirect_candidate(url):
+        """
+        Returns False if none of redirect fixers can change url
+        """
+        for marker in REDIRECT_MARKERS:
+            if url.find(marker) >= 0:
+                return True
+        return False
+
+    def classify_many(urls):
+        """
+        Returns list of maps, one for each URL: domain, scheme, type, is_web_link,
+        is_webpage_link, media, is_analytics, is_link_service.
+
+        Work is shared by URLs with the same host, see LinkTable.
+        """
+        # imported here, LinkTable uses UrlLocation
+        from .linktable import LinkTable
+
+        return LinkTable(urls).classify()
+
     def get_google_redirect_fix(url):
         stupid_google_string = "https://www.google.com/url"
         if url.find(stupid_google_string) >= 0:
@@ -669,8 +861,7 @@ class UrlLocation(object):
 
         scheme = UrlLocation(url).get_scheme()
         if scheme == "http" or scheme == "https":
-            c = UrlCleaner()
-            cleaned = c.clean(url)
+            cleaned = TrackerCleaner.get().clean(url)
 
             # cleaned = cleanurl.cleanurl(cleaned)
             # cleaned = cleaned.url
@@ -766,23 +957,10 @@ class UrlLocation(object):
         if self.is_analytics():
             return
 
-        ext_mapping = {
-            "css": URL_TYPE_CSS,
-            "js": URL_TYPE_JAVASCRIPT,
-            "html": URL_TYPE_HTML,
-            "htm": URL_TYPE_HTML,
-            "php": URL_TYPE_HTML,
-            "aspx": URL_TYPE_HTML,
-            "woff2": URL_TYPE_FONT,
-            "tff": URL_TYPE_FONT,
-            "mobi": URL_TYPE_FILE,
-            "zip": URL_TYPE_FILE,
-        }
-
         ext = self.get_page_ext()
         if ext:
-            if ext in ext_mapping:
-                return ext_mapping[ext]
+            if ext in EXT_TYPE_MAPPING:
+                return EXT_TYPE_MAPPING[ext]
 
     def get_robots_txt_url(self):
         if self.is_onion():
@@ -857,152 +1035,35 @@ class UrlLocation(object):
         return params
 
     def is_mainstream(self):
-        dom = self.get_domain_only()
-
-        # wallet gardens which we will not accept
-
-        mainstream = [
-            "www.facebook",
-            "www.rumble",
-            "wikipedia.org",
-            "twitter.com",
-            "www.reddit.com",
-            "stackoverflow.com",
-            "www.quora.com",
-            "www.instagram.com",
-        ]
-
-        for item in mainstream:
-            if dom.find(item) >= 0:
-                return True
-
-        if self.is_youtube():
-            return True
-
-        return False
+        """
+        Wallet gardens which we will not accept
+        """
+        return self.is_host_category(HOST_CATEGORY_MAINSTREAM)
 
     def is_youtube(self):
-        dom = self.get_domain_only()
-        if (
-            dom == "youtube.com"
-            or dom == "youtu.be"
-            or dom == "www.m.youtube.com"
-            or dom == "m.youtube.com"
-            or dom == "www.youtube.com"
-        ):
-            return True
-        return False
+        return self.is_host_category(HOST_CATEGORY_YOUTUBE)
 
     def is_analytics(self):
         """
         Internet service links that cannot be useful to anyone.
         Internet infrastructure links.
         """
-        url = self.get_domain_only()
-
-        if not url:
-            return False
-
-        if url.find("adservice.google.com") >= 0:
-            return True
-        if url.find(".googleapis.com") >= 0:
-            return True
-        if url.find("googlesyndication") >= 0:
-            return True
-        if url.find(".googletagmanager.com") >= 0:
-            return True
-        if url.find("google-analytics") >= 0:
-            return True
-        if url.find("googletagservices") >= 0:
-            return True
-        if url.find("googleusercontent.com") >= 0:
-            return True
-        if url.find("gstatic.com") >= 0:
-            return True
-
-        if url.find("amazon-adsystem.com") >= 0:
-            return True
-        if url.find("amazonaws.com") >= 0:
-            return True
-
-        if url.find("static.ads-twitter.com") >= 0:
-            return True
-        if url.find("analytics.twitter.com") >= 0:
-            return True
-
-        if url.find("doubleverify.com") >= 0:
-            return True
-        if url.find("g.doubleclick.net") >= 0:
-            return True
-        if url.find("ad.doubleclick.net") >= 0:
-            return True
-        if url.find("goatcounter.com") >= 0:
-            return True
-        if url.find(".cookiebot.com") >= 0:
-            return True
-        if url.find("cloudfront.net") >= 0:
-            return True
-        if url.find(".smartadserver.com") >= 0:
-            return True
-        if url.find("ads.us.e-planning.net") >= 0:
-            return True
-
-        if url.find("static.cloudflareinsights.com") >= 0:
-            return True
-
-        if url.find("static1.squarespace.com") >= 0:
-            return True
-        if url.find("redditstatic.com") >= 0:
-            return True
-
-        if url.find("cdn.speedcurve.com") >= 0:
-            return True
-        if url.find("shopifycdn.com") >= 0:
-            return True
+        return self.is_host_category(HOST_CATEGORY_ANALYTICS)
 
     def is_link_service(self):
         """
         Url shorteners, which also do not directly lead to any page
         """
-        url = self.get_domain_only()
-
-        if not url:
-            return False
+        return self.is_host_category(HOST_CATEGORY_LINK_SERVICE)
 
-        if url.find("lmg.gg") >= 0:
-            return True
-        if url.find("geni.us") >= 0:
-            return True
-        if url.find("tinyurl.com") >= 0:
-            return True
-        if url.find("bit.ly") >= 0:
-            return True
-        if url.find("ow.ly") >= 0:
-            return True
-        if url.find("adfoc.us") >= 0:
-            return True
-        if url.endswith("link.to"):
-            return True
-        if url.find("mailchi.mp") >= 0:
-            return True
-        if url.find("dbh.la") >= 0:
-            return True
-        if url.find("ffm.to") >= 0:
-            return True
-        if url.find("kit.co") >= 0:
-            return True
-        if url.find("utm.io") >= 0:
-            return True
-        if url.find("tiny.pl") >= 0:
-            return True
-        if url.find("reurl.cc") >= 0:
-            return True
-
-        # shortcuts
-        if url.find("amzn.to") >= 0:
-            return True
+    def get_host_categories(self):
+        """
+        Returns categories of host, see HostClassifier
+        """
+        return HostClassifier.get().get_categories(self.get_domain_only())
 
-        return False
+    def is_host_category(self, category):
+        return category in self.get_host_categories()
 
     def _up_domain(self):
         """
@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """
+    Bounded, thread safe, least recently used cache.
+
+    Entries can have time to live. Expired entries are removed when they are read.
+
+    Keeps hit, miss, eviction and expiration counters.
+    """
+
+    def __init__(self, cache_size=1000, ttl=None):
+        """
+        @param ttl default time to live of entries, in seconds. None - entries do not expire
+        """
+        self.cache_size = cache_size
+        self.ttl = ttl
+        # key -> (value, expiration time or None)
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        # key -> lock of thread that loads the key
+        self.loading = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """
+        Returns cached value, or default
+        """
+        with self.lock:
+            found, value = self.lookup(key)
+            if found:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            return default
+
+    def get_or_load(self, key, load, ttl=None):
+        """
+        Returns cached value, or value returned by load(key), which is then cached.
+
+        Only one thread loads a key, other threads that need it wait for the result.
+        """
+        with self.lock:
+            found, value = self.lookup(key)
+            if found:
+                self.hits += 1
+                return value
+
+            key_lock = self.loading.get(key)
+            if key_lock is None:
+                key_lock = threading.Lock()
+                self.loading[key] = key_lock
+
+        with key_lock:
+            try:
+                with self.lock:
+                    found, value = self.lookup(key)
+                    if found:
+                        self.hits += 1
+                        return value
+
+                    self.misses += 1
+
+                value = load(key)
+                self.set(key, value, ttl)
+                return value
+            finally:
+                with self.lock:
+                    if self.loading.get(key) is key_lock:
+                        del self.loading[key]
+
+    def lookup(self, key):
+        """
+        Returns (found, value). Caller holds the lock
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return False, None
+
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self.cache[key]
+            self.expirations += 1
+            return False, None
+
+        self.cache.move_to_end(key)
+        return True, value
+
+    def set(self, key, value, ttl=None):
+        """
+        @param ttl time to live of entry, in seconds. Cache ttl by default
+        """
+        if ttl is None:
+            ttl = self.ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+
+        with self.lock:
+            self.cache[key] = (value, expires)
+            self.cache.move_to_end(key)
+
+            self.evict()
+
+    def evict(self):
+        """
+        Removes least recently used entries above size. Caller holds the lock
+        """
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def remove(self, key):
+        with self.lock:
+            self.cache.pop(key, None)
+
+    def __contains__(self, key):
+        with self.lock:
+            found, value = self.lookup(key)
+            return found
+
+    def __len__(self):
+        """
+        Returns number of entries, expired entries which were not read yet are included
+        """
+        return len(self.cache)
+
+    def set_size(self, cache_size):
+        with self.lock:
+            self.cache_size = cache_size
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def get_hit_rate(self):
+        """
+        Returns ratio of hits to all lookups, 0 if there was no lookup
+        """
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def get_statistics(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.get_hit_rate(),
+            "size": len(self.cache),
+            "max_size": self.cache_size,
+        }
@@ -11,6 +11,9 @@ from urllib3 import disable_warnings
 
 from .utils.logger import PrintLogger
 from .webtools import WebLogger
+from .hostclassifier import HostClassifier
+from .robotsstore import RobotsStore
+from .responsestore import ResponseStore
 
 
 class WebConfig(object):
@@ -22,6 +25,8 @@ class WebConfig(object):
     script_responses_directory = Path("storage")
     display = None
     browser_mapping = {}
+    robots_store = None
+    response_store = None
 
     def init():
         pass
@@ -125,5 +130,43 @@ class WebConfig(object):
             WebLogger.error(f"Problems with creating display")
             return
 
+    def add_host_rules(category, contains=None, suffixes=None, hosts=None):
+        """
+        Extends host classification, for example analytics hosts
+        """
+        HostClassifier.get().add_rules(
+            category, contains=contains, suffixes=suffixes, hosts=hosts
+        )
+
+    def use_robots_store(file_name=None, ttl=None):
+        """
+        Keeps robots.txt on disk, in sqlite database, between restarts.
+        By default database is placed in script_responses_directory
+        """
+        if file_name is None:
+            file_name = Path(WebConfig.script_responses_directory) / "robots.db"
+
+        WebConfig.robots_store = RobotsStore(file_name, ttl=ttl)
+
+    def use_response_store(directory=None):
+        """
+        Keeps responses on disk, bodies are deduplicated.
+        By default store is placed in script_responses_directory
+        """
+        if directory is None:
+            directory = Path(WebConfig.script_responses_directory) / "responses"
+
+        WebConfig.response_store = ResponseStore(directory)
+
+    def set_session_pool_size(pool_connections=None, pool_maxsize=None):
+        """
+        Sets size of HTTP connection pools
+        @param pool_connections number of hosts, for which connections are kept
+        @param pool_maxsize number of connections kept for one host
+        """
+        from .crawlers.sessionpool import SessionPool
+
+        SessionPool.get().set_pool_size(pool_connections, pool_maxsize)
+
     def get_bytes_limit():
         return 5000000  # 5 MB. There are some RSS more than 1MB